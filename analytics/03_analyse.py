@@ -40,6 +40,7 @@ from plotly.subplots import make_subplots
 from scipy.stats import kurtosis, skew
 
 from utils import (
+    Catalog,
     DataSummary,
     cmap_cornflower,
     cmap_lavender,
@@ -52,8 +53,10 @@ from utils import (
     describe_num,
     get_my_palette,
     load_files,
+    load_crm_bundle,
     log_section,
     plot_change,
+    run_stage,
     save_clean_data,
     save_plot,
     save_styler_as_png,
@@ -81,17 +84,27 @@ logging.info(f'Downloaded {len(download)} files successfully.')
 
 log_section('=== Reading Excel files ===')
 
-df_calls = pd.read_excel(os.path.join(CLEAN_DIR, 'calls_clean.xlsx'),
-                         dtype={'Id': str, 'CONTACTID':str}, engine='openpyxl')
-df_contacts = pd.read_excel(os.path.join(CLEAN_DIR, 'contacts_clean.xlsx'),
-                         dtype={'Id': str}, engine='openpyxl')
-df_deals = pd.read_excel(os.path.join(CLEAN_DIR, 'deals_clean.xlsx'),
-                         dtype={'Id': str, 'Contact Name':str}, engine='openpyxl')
-df_spend = pd.read_excel(os.path.join(CLEAN_DIR, 'spend_clean.xlsx'),
-                         engine='openpyxl')
+crm = run_stage(
+    'load_clean',
+    load_crm_bundle,
+    inputs=[os.path.join(CLEAN_DIR, f) for f in FILES],
+    params={'folder': CLEAN_DIR}
+)
+
+df_calls, df_contacts, df_deals, df_spend = (
+    crm['calls'], crm['contacts'], crm['deals'], crm['spend']
+)
 
 logging.info('All files successfully loaded into DataFrames.')
 
+# few-column sections read only their columns from the Parquet files saved by 01_data_cleaning
+catalog = Catalog(CLEAN_DIR, fmt='parquet')
+for name, df in crm.items():
+    if not os.path.exists(os.path.join(CLEAN_DIR, f'{name}_clean.parquet')):
+        catalog.register(name, df)
+
+PAYMENT_COLUMNS = ['Id', 'Created Time', 'Product', 'Education Type', 'Payment Type', 'Stage']
+
 log_section('=== Timeseries analysis ===')
 start_time = time.time()
 
@@ -1523,44 +1536,56 @@ start_time = time.time()
 
 df_deals['Is Successful'] = df_deals['Stage'].str.lower().eq('payment done')
 
-deals_total = (
-    df_deals.groupby('Source')
-    .agg({
-        'Contact Name': 'count',
-        'Campaign': 'nunique',
-        'Offer Total Amount': 'sum',
-        'Initial Amount Paid': 'sum'
-    })
-    .rename(columns={
-        'Contact Name': 'Deals Count',
-        'Campaign': 'Campaigns Count',
-        'Offer Total Amount': 'Total Offer Amount',
-        'Initial Amount Paid': 'Total Paid'
-    })
-)
-
-deals_success = (
-    df_deals[df_deals['Is Successful']]
-    .groupby('Source')
-    .agg({
-        'Contact Name': 'count',
-        'Offer Total Amount': 'sum',
-        'Initial Amount Paid': 'sum'
-    })
-    .rename(columns={
-        'Contact Name': 'Successful Deals',
-        'Offer Total Amount': 'Total Offer Amount (Success)',
-        'Initial Amount Paid': 'Total Paid (Success)'
-    })
-)
-
-spend_grouped = (
-    df_spend.groupby('Source')
-    .agg({
-        'Impressions': 'sum',
-        'Clicks': 'sum',
-        'Spend': 'sum'
-    })
+deals_total = run_stage(
+    'deals_total',
+    lambda: (
+        df_deals.groupby('Source')
+        .agg({
+            'Contact Name': 'count',
+            'Campaign': 'nunique',
+            'Offer Total Amount': 'sum',
+            'Initial Amount Paid': 'sum'
+        })
+        .rename(columns={
+            'Contact Name': 'Deals Count',
+            'Campaign': 'Campaigns Count',
+            'Offer Total Amount': 'Total Offer Amount',
+            'Initial Amount Paid': 'Total Paid'
+        })
+    ),
+    inputs=[df_deals]
+)
+
+deals_success = run_stage(
+    'deals_success',
+    lambda: (
+        df_deals[df_deals['Is Successful']]
+        .groupby('Source')
+        .agg({
+            'Contact Name': 'count',
+            'Offer Total Amount': 'sum',
+            'Initial Amount Paid': 'sum'
+        })
+        .rename(columns={
+            'Contact Name': 'Successful Deals',
+            'Offer Total Amount': 'Total Offer Amount (Success)',
+            'Initial Amount Paid': 'Total Paid (Success)'
+        })
+    ),
+    inputs=[df_deals]
+)
+
+spend_grouped = run_stage(
+    'spend_by_source',
+    lambda: (
+        df_spend.groupby('Source')
+        .agg({
+            'Impressions': 'sum',
+            'Clicks': 'sum',
+            'Spend': 'sum'
+        })
+    ),
+    inputs=[df_spend]
 )
 
 campaign_summary = (
@@ -2076,16 +2101,20 @@ content quality (CTR), precise targeting, and consistent lead follow-up processe
 
 df_deals['Is Successful'] = df_deals['Stage'].str.lower().eq('payment done')
 
-deal_owner_agg = (
-    df_deals
-    .groupby("Deal Owner Name")
-    .agg(
-        total_deals=('Id', 'count'),
-        success_count=('Is Successful', 'sum'),
-        total_amount=('Offer Total Amount', 'sum'),
-        avg_sla_h=('SLA Hours', 'mean')
-    )
-    .reset_index()
+deal_owner_agg = run_stage(
+    'deal_owner_agg',
+    lambda: (
+        df_deals
+        .groupby("Deal Owner Name")
+        .agg(
+            total_deals=('Id', 'count'),
+            success_count=('Is Successful', 'sum'),
+            total_amount=('Offer Total Amount', 'sum'),
+            avg_sla_h=('SLA Hours', 'mean')
+        )
+        .reset_index()
+    ),
+    inputs=[df_deals]
 )
 colors = get_my_palette(as_dict=True)
 tomato = colors['Tomato']
@@ -2173,13 +2202,17 @@ Lower efficiency strongly correlates with long avg SLA hours — the slower the
 df_deals['Is Successful'] = df_deals['Stage'].str.lower().eq('payment done')
 df = df_deals[df_deals['Campaign'].notna() & (df_deals['Campaign'] != 'Unknown')].copy()
 
-manager_campaign_conv = (
-    df.groupby(['Deal Owner Name', 'Campaign'])
-    .agg(
-        total_deals=('Id', 'count'),
-        success_count=('Is Successful', 'sum')
-    )
-    .reset_index()
+manager_campaign_conv = run_stage(
+    'manager_campaign_conv',
+    lambda: (
+        df.groupby(['Deal Owner Name', 'Campaign'])
+        .agg(
+            total_deals=('Id', 'count'),
+            success_count=('Is Successful', 'sum')
+        )
+        .reset_index()
+    ),
+    inputs=[df]
 )
 
 manager_campaign_conv['conversion'] = (
@@ -2271,12 +2304,16 @@ fig_deals.show()
 
 df = df_deals[df_deals['Campaign'].notna() & (df_deals['Campaign'] != 'Unknown')].copy()
 
-manager_campaign = (
-    df.groupby(['Deal Owner Name', 'Campaign'])
-    .agg(
-        total_deals=('Id', 'count')
-    )
-    .reset_index()
+manager_campaign = run_stage(
+    'manager_campaign',
+    lambda: (
+        df.groupby(['Deal Owner Name', 'Campaign'])
+        .agg(
+            total_deals=('Id', 'count')
+        )
+        .reset_index()
+    ),
+    inputs=[df]
 )
 
 top10_campaigns = (
@@ -2349,7 +2386,7 @@ fig.show()
 # Analysis of Payments and Products
 """
 
-df = df_deals.copy()
+df = catalog['deals'].select(['Product', 'Payment Type', 'Stage'])
 
 for col in ['Product', 'Payment Type', 'Stage']:
     df[col] = df[col].astype(str).str.strip().fillna('Unknown')
@@ -2458,7 +2495,7 @@ or lack of structured follow-ups.
 **UX/UI and Web Developer** show similar patterns, though on a smaller scale.
 """
 
-df = df_deals.copy()
+df = catalog['deals'].select(PAYMENT_COLUMNS)
 
 df['Payment Type'] = df['Payment Type'].astype(str).str.strip().fillna('Unknown')
 df['Stage'] = df['Stage'].astype(str).str.strip().str.lower()
@@ -2591,7 +2628,7 @@ for product in agg['Product'].unique():
 **Conclusion:** Test alternative messaging—portfolio proof, learning outcomes, job support, project-based training—to stabilize conversion.
 """
 
-df = df_deals.copy()
+df = catalog['deals'].select(PAYMENT_COLUMNS)
 
 df['Payment Type'] = df['Payment Type'].astype(str).str.strip().fillna('Unknown')
 df['Stage'] = df['Stage'].astype(str).str.strip().str.lower()
@@ -2707,7 +2744,7 @@ This suggests that evening leads are more qualified, possibly due to more active
 In both cohorts, conversion drops in the most recent months, indicating either lower lead quality, seasonality, or less effective follow-up.
 """
 
-df = df_deals.copy()
+df = catalog['deals'].select(['Source', 'Product', 'Stage'])
 
 for col in ['Source', 'Product', 'Stage']:
     df[col] = df[col].astype(str).str.strip().fillna('Unknown')
@@ -3046,10 +3083,15 @@ Evening leads likely show higher intent (warmer audience / self-directed search
 ### 1. Deals for city
 """
 
-city_counts = (
-    df_deals.groupby(['City', 'Latitude', 'Longitude'], as_index=False)
-    .size()
-    .rename(columns={'size': 'Deal Count'}))
+city_counts = run_stage(
+    'city_counts',
+    lambda: (
+        df_deals.groupby(['City', 'Latitude', 'Longitude'], as_index=False)
+        .size()
+        .rename(columns={'size': 'Deal Count'})
+    ),
+    inputs=[df_deals]
+)
 
 df_heat = city_counts.dropna(subset=['Latitude', 'Longitude']).copy()
 
@@ -3124,10 +3166,14 @@ m
 ### 2. Deutsch level in each city
 """
 
-df_map = (
-    df_deals.groupby(['City', 'German Level', 'Latitude', 'Longitude'])
-    .size()
-    .reset_index(name='Deal Count')
+df_map = run_stage(
+    'city_level_counts',
+    lambda: (
+        df_deals.groupby(['City', 'German Level', 'Latitude', 'Longitude'])
+        .size()
+        .reset_index(name='Deal Count')
+    ),
+    inputs=[df_deals]
 )
 
 color_groups = get_my_palette(as_dict=True)
@@ -3193,10 +3239,14 @@ In the north (Hamburg, Schleswig-Holstein) and the east (Mecklenburg, Brandenbur
 
 df_success = df_deals[df_deals['Stage'] == 'Payment Done']
 
-df_map = (
-    df_success.groupby(['City', 'German Level', 'Latitude', 'Longitude'])
-    .size()
-    .reset_index(name='Deal Count')
+df_map = run_stage(
+    'city_level_success_counts',
+    lambda: (
+        df_success.groupby(['City', 'German Level', 'Latitude', 'Longitude'])
+        .size()
+        .reset_index(name='Deal Count')
+    ),
+    inputs=[df_success]
 )
 
 color_groups = get_my_palette(as_dict=True)
@@ -3261,11 +3311,15 @@ Interestingly, in major cities (e.g., **Munich**), successful deals are made acr
 ### 4. Deutsch level without Unknown
 """
 
-df_grouped = (
-    df_deals[df_deals['German Level'].notna()]
-    .groupby(['City', 'German Level', 'Latitude', 'Longitude'])
-    .size()
-    .reset_index(name='Deal Count')
+df_grouped = run_stage(
+    'city_known_level_counts',
+    lambda: (
+        df_deals[df_deals['German Level'].notna()]
+        .groupby(['City', 'German Level', 'Latitude', 'Longitude'])
+        .size()
+        .reset_index(name='Deal Count')
+    ),
+    inputs=[df_deals]
 )
 
 color_groups = get_my_palette(as_dict=True)
@@ -3394,11 +3448,15 @@ df_success = df_deals[
     (df_deals['City'].notna())
 ]
 
-df_grouped = (
-    df_success
-    .groupby(['City', 'German Level', 'Latitude', 'Longitude'])
-    .size()
-    .reset_index(name='Deal Count')
+df_grouped = run_stage(
+    'city_known_level_success_counts',
+    lambda: (
+        df_success
+        .groupby(['City', 'German Level', 'Latitude', 'Longitude'])
+        .size()
+        .reset_index(name='Deal Count')
+    ),
+    inputs=[df_success]
 )
 
 color_groups = get_my_palette(as_dict=True)
@@ -6,10 +6,9 @@ import dash_bootstrap_components as dbc
 
 from utils.my_palette import get_my_palette
 from .charts import build_sankey_chart, build_success_sunburst
-from .data_prep import load_data, prepare_data, compute_kpi
+from .data_prep import load_shared_deals, compute_kpi
 
-deals, calls, contacts, spend = load_data()
-deals = prepare_data(deals)
+deals = load_shared_deals()
 
 colors = get_my_palette(as_dict=True)
 
@@ -76,7 +75,7 @@ app.layout = dbc.Container([
     ]
 )
 def update_dashboard(selected_product, selected_edu):
-    df = deals.copy()
+    df = deals
 
     if selected_edu != "Total":
         df = df[df["Education Type"] == selected_edu]
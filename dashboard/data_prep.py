@@ -1,16 +1,21 @@
 import os
+import json
 import pandas as pd
 
+from utils.schema import apply_schema
+from utils.shared_store import write_shared_table, read_shared_metadata, attach_shared_table
+from utils.snapshot import read_excel_cached, workbook_fingerprint
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_PATH = os.path.join(BASE_DIR, '..', 'data', 'clean', 'data_all.xlsx')
+CACHE_DIR = os.path.join(BASE_DIR, '..', 'data', 'cache')
+SHEETS = ['deals', 'calls', 'contacts', 'spend']
+DEALS_STORE = os.path.join(CACHE_DIR, 'deals_prepared.arrow')
 
-def load_data(path=DATA_PATH):
-    deals = pd.read_excel(path, sheet_name='deals')
-    calls = pd.read_excel(path, sheet_name='calls')
-    contacts = pd.read_excel(path, sheet_name='contacts')
-    spend = pd.read_excel(path, sheet_name='spend')
+def load_data(path=DATA_PATH, cache_dir=CACHE_DIR):
+    frames = read_excel_cached(path, SHEETS, cache_dir=cache_dir)
 
-    return deals, calls, contacts, spend
+    return tuple(apply_schema(frames[sheet], sheet) for sheet in SHEETS)
 
 
 def prepare_data(df_deals):
@@ -35,6 +40,21 @@ def prepare_data(df_deals):
     return df
 
 
+def load_shared_deals(path=DATA_PATH, store_path=DEALS_STORE, cache_dir=CACHE_DIR):
+    """
+    Return the prepared deals table memory-mapped from a shared Arrow file.
+    The first worker after a data change prepares and writes it, the others attach to the same pages.
+    The store is keyed on the workbook size, mtime and content hash, like the snapshot cache.
+    """
+    key = json.dumps(workbook_fingerprint(path), sort_keys=True)
+
+    if read_shared_metadata(store_path).get('source_fingerprint') != key:
+        deals = prepare_data(load_data(path, cache_dir=cache_dir)[0])
+        write_shared_table(deals, store_path, metadata={'source_fingerprint': key})
+
+    return attach_shared_table(store_path)
+
+
 def compute_kpi(df):
     total_deals = len(df)
     success_deals = (df['Stage'].str.lower().str.strip() == 'payment done').sum()
@@ -32,16 +32,17 @@ from utils import (
     show_df,
     log_section,
     DataSummary,
-    find_duplicates,
-    clean_duplicates,
-    convert_columns,
-    frequent_non_null,
-    clean_amount,
-    normalize_german_level,
-    convert_to_seconds,
-    convert_to_minutes,
-    convert_to_hours,
     load_files,
+    load_crm_bundle,
+    excel_to_parquet,
+    iter_parquet_chunks,
+    describe_num_chunks,
+    clean_crm_bundle,
+    load_city_table,
+    enrich_cities,
+    resolve_entities,
+    check_quality,
+    pipeline_cache,
     save_table_as_png,
     save_plot,
     save_clean_data,
@@ -55,6 +56,10 @@ logging.info('Repository successfully loaded and ready')
 PROJECT_ROOT = '/content/it-school-analytics'
 RAW_DIR = os.path.join(PROJECT_ROOT, 'data', 'raw')
 CLEAN_DIR = os.path.join(PROJECT_ROOT, 'data', 'clean')
+STATE_DIR = os.path.join(PROJECT_ROOT, 'data', 'state')
+
+# 'fast' samples the raw overviews; the published clean tables are always exact
+RAW_SUMMARY_MODE = 'fast'
 
 log_section('=== Downloading source Excel files ===')
 
@@ -66,440 +71,37 @@ logging.info(f'Downloaded {len(download)} files successfully.')
 
 log_section('=== Reading Excel files ===')
 
-df_calls = pd.read_excel(os.path.join(RAW_DIR, 'calls.xlsx'),
-                         dtype={'Id': str, 'CONTACTID':str}, engine='openpyxl')
-df_contacts = pd.read_excel(os.path.join(RAW_DIR, 'contacts.xlsx'),
-                         dtype={'Id': str}, engine='openpyxl')
-df_deals = pd.read_excel(os.path.join(RAW_DIR, 'deals.xlsx'),
-                         dtype={'Id': str, 'Contact Name':str}, engine='openpyxl')
-df_spend = pd.read_excel(os.path.join(RAW_DIR, 'spend.xlsx'), engine='openpyxl')
-
-logging.info('All files successfully loaded into DataFrames.')
-
-"""# === Calls ==="""
-
-log_section('=== Analyzing Calls dataset ===')
-start_time = time.time()
-
-calls_info = DataSummary('calls_info_raw', df_calls)
-summary_calls_info = calls_info.summary_info()
-
-display(summary_calls_info)
-
-"""#### Remove irrelevant columns"""
-
-df_calls.drop(['Dialled Number', 'Tag'], axis=1, inplace=True)
-logging.info('Dropped irrelevant columns: Dialled Number, Tag.')
-
-"""#### Search and remove dublicates"""
-
-duplicates = find_duplicates(df_calls, 'calls_raw')
-
-clean_calls = clean_duplicates(df_calls, 'calls_clean')
-
-"""#### Convert columns to datetime"""
-
-clean_calls = convert_columns(clean_calls, datetime_cols=['Call Start Time'])
-
-"""#### Analyze calls with missing CONTACTID"""
-
-calls_nan_contactid = clean_calls[clean_calls['CONTACTID'].isna()]
-clean_calls['CONTACTID'] = clean_calls['CONTACTID'].astype(str)
-
-logging.info(f'Missing CONTACTID rows: {calls_nan_contactid.shape[0]}')
-show_df(calls_nan_contactid.head(5))
-
-condition = (
-    (clean_calls['CONTACTID'].isna() | clean_calls['CONTACTID'].isin(['nan', 'None', '']))
-    & (clean_calls['Call Duration (in seconds)'] == 0)
-)
-
-count_removed = condition.sum()
-logging.info(f'Removed {count_removed} rows with missing CONTACTID and Call duration = 0')
-
-clean_calls = clean_calls[~condition]
-
-"""#### Fill missing Call duration with 0 and add flag"""
-
-clean_calls.loc[
-    clean_calls['Call Duration (in seconds)'].isna(),
-    'Call Type'
-].unique()
-
-clean_calls.loc[
-    clean_calls['Call Duration (in seconds)'].isna(),
-    'Outgoing Call Status'
-].unique()
-
-clean_calls['Is_duration_missing'] = (
-    clean_calls['Call Duration (in seconds)']
-    .isna()
+# the largest exports are streamed to Parquet once; cleaning and profiling read the Parquet files
+STREAMED = ['calls', 'deals']
+for name in STREAMED:
+    excel_to_parquet(os.path.join(RAW_DIR, f'{name}.xlsx'), os.path.join(RAW_DIR, f'{name}.parquet'), name)
+
+crm = dict(sorted({
+    **load_crm_bundle(RAW_DIR, datasets=['contacts', 'spend'], suffix='', categorize=False),
+    **load_crm_bundle(RAW_DIR, datasets=STREAMED, suffix='', fmt='parquet', categorize=False),
+}.items()))
+df_calls, df_contacts, df_deals, df_spend = (
+    crm['calls'], crm['contacts'], crm['deals'], crm['spend']
 )
 
-clean_calls['Call Duration (in seconds)'] = (
-    clean_calls['Call Duration (in seconds)']
-    .fillna(0)
-    .astype('Int64')
-)
-logging.info('Filled missing Call Duration values with 0 and added Is_duration_missing flag.')
-
-"""#### Checking missing values in 'Outgoing Call Status'"""
-
-calls_nan_status = clean_calls[clean_calls['Outgoing Call Status'].isna()]
-logging.info(f'Missing Outgoing Call Status: {calls_nan_status.shape[0]} rows')
-
-clean_calls['Outgoing Call Status'] = (
-    clean_calls['Outgoing Call Status']
-    .fillna('Unknown')
-)
-logging.info('Filled missing Outgoing Call Status with Unknown.')
-
-"""#### Fill missing 'Scheduled in CRM' with 0 and add flag"""
-
-clean_calls['Is_schedule_missing'] = (
-    clean_calls['Scheduled in CRM']
-    .isna()
-)
-
-clean_calls['Scheduled in CRM'] = (
-    clean_calls['Scheduled in CRM']
-    .fillna(0)
-    .astype('float')
-)
-logging.info('Filled missing Scheduled in CRM with 0.0 and added boolean flag Is_schedule_missing.')
-
-"""####Convert columns to category types"""
-
-categorical_cols = [
-    'Call Type',
-    'Call Status',
-    'Outgoing Call Status'
-]
-
-clean_calls = convert_columns(clean_calls, category_cols=categorical_cols)
-
-info_calls = DataSummary('calls_info_clean', clean_calls)
-summary_info_calls = info_calls.summary_info()
-
-display(summary_info_calls)
-logging.info(f'Calls cleaning completed in {time.time() - start_time:.2f} sec.')
-
-"""# === Contacts ==="""
-
-log_section('=== Analyzing Contacts dataset ===')
-start_time = time.time()
-
-contacts_info = DataSummary('contacts_info_raw', df_contacts)
-summary_contacts_info = contacts_info.summary_info()
-
-display(summary_contacts_info)
-
-"""#### Search and remove dublicates"""
-
-duplicates = find_duplicates(df_contacts, 'contacts_raw')
-
-clean_contacts = clean_duplicates(df_contacts, 'contacts_clean')
-
-bool_rows = clean_contacts[clean_contacts['Contact Owner Name'].isin([True, False])]
-
-logging.info(f'Rows with True/False in Contact Owner Name: {bool_rows.shape[0]}')
-show_df(bool_rows.head(5))
-
-clean_contacts = clean_contacts[clean_contacts['Contact Owner Name'] != False]
-logging.info(f'Removed invalid True/False Contact Owner Name values.')
-
-"""#### Convert columns to datetime"""
-
-datetime_cols = ['Created Time', 'Modified Time']
-clean_contacts = convert_columns(clean_contacts, datetime_cols=datetime_cols)
-
-"""#### Find rows where Created Time is later than Modified Time"""
-
-condition = clean_contacts['Created Time'] > clean_contacts['Modified Time']
-
-if condition.any():
-    logging.info(f'Rows where Created Time > Modified Time: {condition.sum()}')
-else:
-    logging.info('No rows where Created Time > Modified Time.')
-
-info_contacts = DataSummary('contacts_info_clean', clean_contacts)
-summary_info_contacts = info_contacts.summary_info()
-
-display(summary_info_contacts)
-logging.info(f'Contacts cleaning completed in {time.time() - start_time:.2f} sec.')
-
-"""# === Spend ==="""
-
-log_section('=== Analyzing Spend dataset ===')
-start_time = time.time()
-
-spend_info = DataSummary('spend_info_raw', df_spend)
-summary_spend_info = spend_info.summary_info()
-
-display(summary_spend_info)
-
-"""#### Search and remove duplicates"""
-
-duplicates = find_duplicates(df_spend, 'spend_raw', ignore_first_col=False)
-
-clean_spend = clean_duplicates(df_spend, 'spend_clean', ignore_first_col=False)
-
-"""#### Search and remove test rows
-
-
-"""
-
-test_rows = clean_spend[clean_spend['Source'] == 'Test']
-logging.info(f'Found {test_rows.shape[0]} test rows.')
-
-clean_spend = clean_spend.drop(test_rows.index)
-logging.info(f'Rows after removing test data: {clean_spend.shape[0]}')
-
-"""#### Search and remove 0 rows"""
-
-zero_rows = clean_spend[
-    (clean_spend['Impressions'] == 0) &
-    (clean_spend['Spend'] == 0) &
-    (clean_spend['Clicks'] == 0)
-]
-logging.info(f'Rows where 3 columns have 0: {len(zero_rows)}')
-
-clean_spend = clean_spend.drop(zero_rows.index)
-logging.info(f'Rows after removing zero rows: {clean_spend.shape[0]}')
-
-"""#### Replace missing fields with Unknown"""
-
-cols = ['Campaign', 'AdGroup', 'Ad']
-
-for col in cols:
-    if col in clean_spend.columns:
-        clean_spend[col] = clean_spend[col].fillna('Unknown')
-logging.info(f'Filled missing values in {cols} with Unknown.')
-
-"""#### Cleaning and correcting amount values in spend"""
-
-before_clean = clean_spend['Spend'].copy()
-clean_spend['Spend'] = clean_spend['Spend'].apply(clean_amount)
-changed = (before_clean != clean_spend['Spend']).sum()
-
-logging.info(f'Cleaned and converted {col} — {changed} values changed.')
-
-"""####  Convert to category types"""
-
-clean_spend = convert_columns(clean_spend, category_cols=['Source'])
-
-info_spend = DataSummary('spend_info_clean', clean_spend)
-summary_info_spend = info_spend.summary_info()
-
-display(summary_info_spend)
-logging.info(f'Spend cleaning completed in {time.time() - start_time:.2f} sec.')
-
-"""# === Deals ==="""
-
-log_section('=== Analyzing Deals dataset ===')
-start_time = time.time()
-
-deals_info = DataSummary('deals_info_raw', df_deals)
-summary_deals_info = deals_info.summary_info()
-
-display(summary_deals_info)
-
-"""#### Detecting duplicate Contact names and filling missing Cities, Level of Deutsch and Deal Owner Name"""
-
-cols_to_fill = ['City', 'Level of Deutsch', 'Deal Owner Name']
-
-for col in cols_to_fill:
-    before_missing = df_deals[col].isna().sum()
-
-    df_deals[col] = (
-        df_deals
-        .groupby('Contact Name')[col]
-        .transform(frequent_non_null)
-        .combine_first(df_deals[col])
-    )
-
-    after_missing = df_deals[col].isna().sum()
-    filled = before_missing - after_missing
-    logging.info(f'Filled {filled} missing values in {col}')
-
-col = 'Course duration'
-before_missing = df_deals[col].isna().sum()
-
-df_deals[col] = (
-    df_deals
-    .groupby(['Contact Name', 'Product'])['Course duration']
-    .transform(frequent_non_null)
-    .combine_first(df_deals[col])
-)
-
-after_missing = df_deals[col].isna().sum()
-filled = before_missing - after_missing
-logging.info(f'Filled {filled} missing values in {col}')
-
-"""#### Search and remove duplicates"""
-
-duplicates = find_duplicates(df_deals, 'deals_raw')
-
-clean_deals = clean_duplicates(df_deals, 'deals_clean')
-
-duplicates = clean_deals[clean_deals['Lost Reason'] == 'Duplicate']
-logging.info(f'Rows with Lost Reason = Duplicate: {duplicates.shape[0]}')
-
-clean_deals = clean_deals[clean_deals['Lost Reason'] != 'Duplicate']
-logging.info(f'Rows after removing Duplicate deals: {clean_deals.shape[0]}')
-
-"""#### Identify and remove rows marked as test data"""
-
-test_rows = clean_deals[clean_deals['Source'] == 'Test']
-logging.info(f'Test rows found: {test_rows.shape[0]}')
-
-clean_deals = clean_deals.drop(test_rows.index)
-logging.info(f'Rows after removing test rows: {clean_deals.shape[0]}')
-
-missing_id_rows = clean_deals[clean_deals['Id'].isna()]
-
-logging.info(f'Found {len(missing_id_rows)} rows with missing Id.')
-show_df(missing_id_rows, name='Rows with missing Id')
-
-clean_deals = clean_deals.dropna(subset=['Id'])
-logging.info(f'Rows after removing rows with missing Id: {clean_deals.shape[0]}')
-
-"""#### Find and remove products Data Analytics, Find Yourself in IT"""
-
-target_products = ['Data Analytics', 'Find yourself in IT']
-rows_to_remove = clean_deals[clean_deals['Product'].isin(target_products)]
-
-logging.info(f'Rows with target products: {rows_to_remove.shape[0]}')
-
-clean_deals = clean_deals.drop(rows_to_remove.index)
-logging.info(f'Removed rows with products: {target_products}. Remaining rows: {clean_deals.shape[0]}')
-
-"""#### Find duplicates in Contact Name"""
-
-duplicates = clean_deals[clean_deals['Contact Name'].duplicated(keep=False)]
-
-duplicate_names_count = clean_deals['Contact Name'].duplicated(keep=False).sum()
-unique_duplicate_names = clean_deals.loc[
-    clean_deals['Contact Name'].duplicated(keep=False), 'Contact Name'
-].nunique()
-
-logging.info(f'Found {len(duplicates)} duplicate rows for {unique_duplicate_names} Contact Names.')
-show_df(duplicates.sort_values(by='Contact Name'), name='Duplicate Contact Names')
-
-important_cols = [
-    'Months of study',
-    'Initial Amount Paid',
-    'Offer Total Amount',
-    'Course duration'
-]
-
-clean_deals['is_empty'] = clean_deals[important_cols].isna().all(axis=1)
-
-group_has_data = clean_deals.groupby('Contact Name')['is_empty'].transform(lambda x: not x.all())
-
-to_remove = clean_deals['is_empty'] & group_has_data
-
-logging.info(f'Removed {to_remove.sum()} empty duplicate rows where group has non-empty data.')
-
-clean_deals = clean_deals[~to_remove].copy()
-
-clean_deals.drop(columns='is_empty', inplace=True)
-
-important_cols = [
-    'Course duration',
-    'Months of study',
-    'Initial Amount Paid',
-    'Offer Total Amount',
-    'Education Type',
-    'Product',
-    'Payment Type',
-    'Campaign'
-]
-
-empty_cols = clean_deals[important_cols].isna().all(axis=1)
-duplicates_cols = clean_deals['Contact Name'].duplicated(keep=False)
-
-before = len(clean_deals)
-clean_deals = clean_deals[~(duplicates_cols & empty_cols)].copy()
-after = len(clean_deals)
-removed = before - after
-
-logging.info(f'Removed {removed} duplicate rows with empty key fields.')
-
-"""#### Convert columns to datetime"""
-
-clean_deals = convert_columns(
-    clean_deals,
-    datetime_cols=['Created Time', 'Closing Date']
-)
-
-"""#### Find rows where Created Time is later than Closing Date"""
-
-condition = clean_deals['Created Time'] > clean_deals['Closing Date']
-logging.info(f'Rows where Created Time > Closing Date: {condition.sum()}')
-
-temp = clean_deals.loc[condition, 'Created Time'].copy()
-clean_deals.loc[condition, 'Created Time'] = clean_deals.loc[condition, 'Closing Date']
-clean_deals.loc[condition, 'Closing Date'] = temp
-
-logging.info(f'Swapped {condition.sum()} rows where Created Time was later than Closing Date.')
-
-"""#### Fill Closing Date"""
-
-clean_deals['Product'] = clean_deals['Product'].fillna('Unknown')
-
-clean_deals['Days_Diff'] = (
-    clean_deals['Closing Date'] - clean_deals['Created Time']
-).dt.days
-
-negative_count = (clean_deals['Days_Diff'] < 0).sum()
-logging.info(f'Found {negative_count} negative Days_Diff values.')
-
-mode_diff = (
-    clean_deals
-    .groupby('Product')['Days_Diff']
-    .agg(lambda x: x.mode()[0] if not x.mode().empty else np.nan)
-)
-
-fill = (
-    clean_deals['Closing Date'].isna()
-    & (clean_deals['Months of study'] == clean_deals['Course duration'])
-    & (clean_deals['Stage'] == 'Payment Done')
-)
-
-clean_deals.loc[fill, 'Closing Date'] = (
-    clean_deals.loc[fill, 'Created Time']
-    + clean_deals.loc[fill, 'Product']
-    .map(mode_diff)
-    .apply(lambda x: pd.Timedelta(days=x) if pd.notna(x) else pd.NaT)
-)
-
-logging.info(f'Filled {fill.sum()} missing Closing Date values.')
-
-clean_deals.drop(columns=['Days_Diff'], inplace=True)
-logging.info('Temporary column Days_Diff removed after filling.')
-
-"""#### Identify and remove an outlier date in Created Time (October 2022)"""
-
-earliest_dates = (
-    clean_deals['Created Time']
-    .dropna()
-    .sort_values()
-    .unique()[:5]
-)
+logging.info('All files successfully loaded into DataFrames.')
 
-logging.info(f'Earliest 5 unique Created Time values:\n{earliest_dates}')
-show_df(pd.DataFrame(earliest_dates, columns=['Earliest Created Time']))
+log_section('=== Checking data quality ===')
 
-earliest_date = earliest_dates[0]
+quality_report = pd.concat(
+    {name: check_quality(df, name)[1] for name, df in crm.items()}, names=['Dataset']
+).reset_index(level='Dataset').reset_index(drop=True)
+show_df(quality_report, name='Data quality violations', max_rows=len(quality_report))
 
-earliest_rows = clean_deals[clean_deals['Created Time'] == earliest_date]
-clean_deals = clean_deals[clean_deals['Created Time'] != earliest_date]
+log_section('=== Profiling raw numeric columns ===')
 
-logging.info(f'Removed {earliest_rows.shape[0]} rows with Created Time = {earliest_date}')
-show_df(earliest_rows, name='Removed Earliest Created Time Rows')
+# profiled one row group at a time
+raw_num_profiles = {
+    name: describe_num_chunks(iter_parquet_chunks(os.path.join(RAW_DIR, f'{name}.parquet')), df_name=f'{name}_raw')
+    for name in STREAMED
+}
 
-"""#### Correction of city values"""
+"""#### Prepare city reference data"""
 
 json_path = os.path.join(RAW_DIR, 'city_data_google_en.json')
 with open(json_path, 'r', encoding='utf-8') as f:
@@ -542,214 +144,114 @@ with open(json_output_path, 'w', encoding='utf-8') as f:
 
 logging.info('File JSON updated and saved')
 
-clean_deals['City'] = (
-    clean_deals['City']
-    .astype(str)
-    .str.replace(r'[\u2010\u2011\u2012\u2013\u2014\u2212]', '-', regex=True)
-)
-
-city_correction = {
-    'Karl-Liebknecht str. 24, Hildburghausen, Thüringen': 'Thüringen',
-    'Vor Ebersbach 1, 77761 Schiltach': 'Schiltach',
-    'Poland , Gdansk , Al. Grunwaldzka 7, ap. 1a': 'Gdańsk'
-}
-clean_deals['City'] = clean_deals['City'].replace(city_correction)
-
-logging.info(f'Normalized City names and applied {len(city_correction)} manual corrections.')
-
-clean_deals['Federal state'] = clean_deals['City'].map(
-    lambda x: normalized_json.get(x, {}).get('federal_state')
-)
-clean_deals['Country'] = clean_deals['City'].map(
-    lambda x: normalized_json.get(x, {}).get('country')
-)
-clean_deals['Latitude'] = clean_deals['City'].map(
-    lambda x: normalized_json.get(x, {}).get('latitude')
-)
-clean_deals['Longitude'] = clean_deals['City'].map(
-    lambda x: normalized_json.get(x, {}).get('longitude')
-)
-logging.info('Added new columns (Federal state, Country, Latitude, Longitude)')
-
-"""#### Cleaning and correcting amount values in deals"""
-
-cols_to_clean = ['Initial Amount Paid', 'Offer Total Amount']
-
-for col in cols_to_clean:
-    before_clean = clean_deals[col].copy()
-    clean_deals[col] = clean_deals[col].apply(clean_amount)
+log_section('=== Cleaning datasets ===')
 
-    changed = (before_clean != clean_deals[col]).sum()
-    logging.info(f'Cleaned and converted {col} — {changed} values changed.')
+cache = pipeline_cache()
 
-check_time = (
-    (clean_deals['Offer Total Amount'] < clean_deals['Initial Amount Paid']) |
-    (clean_deals['Offer Total Amount'].isna() & clean_deals['Initial Amount Paid'].notna())
+# intermediates for the diagnostics below are captured in the same run
+cleaned, cleaning_metrics, captured = clean_crm_bundle(
+    crm,
+    params={'deals': {'add_city_geo': {'cities_path': json_output_path}}},
+    cache=cache,
+    state_folder=STATE_DIR,
+    capture={'deals': ['remove_test_rows', 'fill_closing_date', 'remove_earliest_created']}
 )
-temp_columns = clean_deals.loc[check_time, 'Offer Total Amount']
+show_df(cleaning_metrics, name='Cleaning steps', max_rows=len(cleaning_metrics))
 
-clean_deals.loc[check_time, 'Offer Total Amount'] = clean_deals.loc[check_time, 'Initial Amount Paid']
-clean_deals.loc[check_time, 'Initial Amount Paid'] = temp_columns
+clean_quality = pd.concat(
+    {name: check_quality(df, name)[1] for name, df in cleaned.items()}, names=['Dataset']
+).reset_index(level='Dataset').reset_index(drop=True)
+show_df(clean_quality, name='Data quality violations after cleaning', max_rows=len(clean_quality))
 
-logging.info(f'Swapped {check_time.sum()} rows where Offer Total Amount < Initial Amount Paid.')
-
-"""#### Fill missing payment type"""
-
-fill = clean_deals['Payment Type'].isna()
-
-no_pay = (
-    ((clean_deals['Offer Total Amount'] == 0) & (clean_deals['Initial Amount Paid'] == 0)) |
-    (clean_deals['Initial Amount Paid'] == 0)
-)
-
-one_payment = (
-    (clean_deals['Initial Amount Paid'] > 0) &
-    (abs(clean_deals['Offer Total Amount'] - clean_deals['Initial Amount Paid']) <= 400)
-)
+"""# === Calls ==="""
 
-reservation = (
-    (clean_deals['Initial Amount Paid'] > 0) &
-    (clean_deals['Initial Amount Paid'] <= 200)
-)
+log_section('=== Analyzing Calls dataset ===')
 
-recurring = ~(no_pay | one_payment | reservation)
+calls_info = DataSummary('calls_info_raw', df_calls)
+summary_calls_info = calls_info.summary_info(mode=RAW_SUMMARY_MODE)
 
-clean_deals.loc[fill & no_pay, 'Payment Type'] = 'No Payments'
-clean_deals.loc[fill & one_payment, 'Payment Type'] = 'One Payment'
-clean_deals.loc[fill & reservation, 'Payment Type'] = 'Reservation'
-clean_deals.loc[fill & recurring, 'Payment Type'] = 'Recurring Payments'
+display(summary_calls_info)
 
-clean_deals.loc[fill & clean_deals['Payment Type'].isna(), 'Payment Type'] = 'Unknown'
+clean_calls = cleaned['calls']
 
-payment_counts = (
-    clean_deals.loc[fill, 'Payment Type']
-    .value_counts(dropna=False)
-    .rename_axis('Payment Type')
-    .reset_index(name='Count')
-)
+info_calls = DataSummary('calls_info_clean', clean_calls)
+summary_info_calls = info_calls.summary_info()
 
-logging.info('Payment Type counts after filling:\n%s', payment_counts)
-logging.info(f'Filled {fill.sum()} missing Payment Type values.')
-show_df(payment_counts.reset_index().rename(columns={'index': 'Payment Type', 'Payment Type': 'Count'}))
+display(summary_info_calls)
 
-"""#### Normalize Level of Deutsch"""
+"""# === Contacts ==="""
 
-clean_deals['German Level'] = clean_deals['Level of Deutsch'].apply(normalize_german_level)
-logging.info('Created new column German Level with normalized values.')
+log_section('=== Analyzing Contacts dataset ===')
 
-level_counts = clean_deals['German Level'].value_counts(dropna=False)
-logging.info(f'German Level distribution:\n{level_counts}')
+contacts_info = DataSummary('contacts_info_raw', df_contacts)
+summary_contacts_info = contacts_info.summary_info(mode=RAW_SUMMARY_MODE)
 
-clean_deals.drop(columns=['Level of Deutsch'], inplace=True)
-logging.info('Removed original column Level of Deutsch.')
+display(summary_contacts_info)
 
-"""#### Column Quality transformation"""
+"""#### Cleaning diagnostics"""
 
-clean_deals.loc[
-    clean_deals['Quality'].str.fullmatch(r'F', case=False, na=False),
-    'Quality'
-] = 'Special'
+bool_owner_ids = quality_report.query("Dataset == 'contacts' and Rule == 'bool_owner'")['Sample Ids'].iloc[0]
+bool_rows = df_contacts[df_contacts['Id'].isin(bool_owner_ids)]
+show_df(bool_rows)
 
-clean_deals['Quality'] = clean_deals['Quality'].str.replace('–', '-', regex=False)
-clean_deals['Quality'] = clean_deals['Quality'].str.extract(r'-\s*(.*)')[0].str.strip()
-clean_deals['Quality'] = clean_deals['Quality'].fillna('Unknown')
+clean_contacts = cleaned['contacts']
 
-logging.info(f'Unique values after transformation: {clean_deals["Quality"].unique()}')
+info_contacts = DataSummary('contacts_info_clean', clean_contacts)
+summary_info_contacts = info_contacts.summary_info()
 
-"""#### Standardize column SLA"""
+display(summary_info_contacts)
 
-clean_deals['SLA'] = clean_deals['SLA'].apply(
-    lambda x: x.strftime("%H:%M:%S") if isinstance(x, datetime.time) else x
-)
-clean_deals['SLA'] = pd.to_timedelta(clean_deals['SLA'], errors='coerce')
+"""# === Spend ==="""
 
-show_df(clean_deals['SLA'].value_counts(dropna=False))
+log_section('=== Analyzing Spend dataset ===')
 
-clean_deals['SLA Seconds'] = clean_deals['SLA'].apply(convert_to_seconds)
+spend_info = DataSummary('spend_info_raw', df_spend)
+summary_spend_info = spend_info.summary_info(mode=RAW_SUMMARY_MODE)
 
-total = len(clean_deals)
-missing = clean_deals['SLA Seconds'].isna().sum()
+display(summary_spend_info)
 
-logging.info(f'Failed to convert: {missing} ({missing / total:.2%})')
-logging.info(f'Converted successfully: {total - missing} rows ({(total - missing) / total:.2%})')
-logging.info(f'Min SLA: {clean_deals["SLA Seconds"].min()}, Max SLA: {clean_deals["SLA Seconds"].max()}')
+clean_spend = cleaned['spend']
 
-check_sla = clean_deals[['SLA', 'SLA Seconds']]
-show_df(check_sla, name='SLA vs SLA Seconds', max_rows=len(check_sla))
+info_spend = DataSummary('spend_info_clean', clean_spend)
+summary_info_spend = info_spend.summary_info()
 
-clean_deals['SLA Minutes'] = clean_deals['SLA'].apply(convert_to_minutes)
+display(summary_info_spend)
 
-total = len(clean_deals)
-missing = clean_deals['SLA Minutes'].isna().sum()
+"""# === Deals ==="""
 
-logging.info(f'Failed to convert: {missing} ({missing / total:.2%})')
-logging.info(f'Converted successfully: {total - missing} rows ({(total - missing) / total:.2%})')
-logging.info(f'Min SLA: {clean_deals["SLA Minutes"].min()}, Max SLA: {clean_deals["SLA Minutes"].max()}')
+log_section('=== Analyzing Deals dataset ===')
 
-clean_deals['SLA Hours'] = clean_deals['SLA'].apply(convert_to_hours)
+deals_info = DataSummary('deals_info_raw', df_deals)
+summary_deals_info = deals_info.summary_info(mode=RAW_SUMMARY_MODE)
 
-total = len(clean_deals)
-missing = clean_deals['SLA Hours'].isna().sum()
+display(summary_deals_info)
 
-logging.info(f'Failed to convert: {missing} ({missing / total:.2%})')
-logging.info(f'Converted successfully: {total - missing} rows ({(total - missing) / total:.2%})')
-logging.info(f'Min SLA: {clean_deals["SLA Hours"].min()}, Max SLA: {clean_deals["SLA Hours"].max()}')
+"""#### Cleaning diagnostics"""
 
-clean_deals.drop(columns=['SLA'], inplace=True)
+# local steps are captured for the re-cleaned rows only; rows without an Id are always among them
+before_id_check = captured['deals'].get('remove_test_rows', df_deals.iloc[:0])
+missing_id_rows = before_id_check[before_id_check['Id'].isna()]
+show_df(missing_id_rows, name='Rows with missing Id')
 
-"""#### Fill empty as Unknown"""
+before_earliest = captured['deals']['fill_closing_date']
+earliest_rows = before_earliest[before_earliest['Created Time'] == before_earliest['Created Time'].min()]
+show_df(earliest_rows, name='Removed Earliest Created Time Rows')
 
-cols = [
-    'Lost Reason',
-    'Education Type',
-    'Deal Owner Name',
-    'Content',
-    'Term',
-    'Campaign',
-    'Contact Name',
-    'Federal state',
-    'Country'
-]
+_, unmatched_cities = enrich_cities(captured['deals']['remove_earliest_created'], load_city_table(json_output_path))
+show_df(unmatched_cities, name='Cities without geo data', max_rows=20)
 
-clean_deals[cols] = clean_deals[cols].fillna('Unknown')
-logging.info(f'Filled missing values with Unknown.')
+clean_deals = cleaned['deals']
 
-clean_deals['City'] = (
-    clean_deals['City']
-    .replace(['-', '', ' ', 'nan', 'NaN', 'None'], 'Unknown')
+deal_entities = resolve_entities(clean_deals, 'deals')
+entity_sizes = (
+    deal_entities
+    .value_counts()
+    .value_counts()
+    .sort_index()
+    .rename_axis('Rows per entity')
+    .reset_index(name='Entities')
 )
-logging.info('Filled missing and "-" values in City column with Unknown.')
-
-clean_deals['Term'] = clean_deals['Term'].replace('_', 'Unknown')
-
-logging.info(f'Filled "_" values in Term column with Unknown.')
-
-"""#### Convert columns to int and category types"""
-
-cols_int = [
-    'Course duration',
-    'Months of study',
-    'Initial Amount Paid',
-    'Offer Total Amount'
-]
-
-for col in cols_int:
-    clean_deals[col] = clean_deals[col].astype('Int64')
-    filled = clean_deals[col].notna().sum()
-    logging.info(f'Converted {filled} non-null values.')
-
-categ_cols = [
-    'Stage',
-    'Quality',
-    'Source',
-    'Product',
-    'Lost Reason',
-    'Education Type',
-    'German Level',
-    'Payment Type'
-]
-
-clean_deals = convert_columns(clean_deals, category_cols=categ_cols)
+show_df(entity_sizes, name='Deal entity sizes', max_rows=len(entity_sizes))
 
 info_deals = DataSummary('deals_info_clean', clean_deals)
 summary_info_deals = info_deals.summary_info()
@@ -759,10 +261,12 @@ display(summary_info_deals)
 log_section('=== Saving results ===')
 start_time = time.time()
 
-save_clean_data(clean_calls, 'calls_clean')
-save_clean_data(clean_contacts, 'contacts_clean')
-save_clean_data(clean_deals, 'deals_clean')
-save_clean_data(clean_spend, 'spend_clean')
+save_clean_data(clean_calls, 'calls_clean', formats=['xlsx', 'parquet'], dataset='calls')
+save_clean_data(clean_contacts, 'contacts_clean', formats=['xlsx', 'parquet'], dataset='contacts')
+save_clean_data(clean_deals, 'deals_clean', formats=['xlsx', 'parquet'], dataset='deals')
+save_clean_data(clean_spend, 'spend_clean', formats=['xlsx', 'parquet'], dataset='spend')
+
+save_clean_data(pd.DataFrame({'Id': clean_deals['Id'], 'Entity Id': deal_entities}), 'deals_entities', formats='parquet')
 
 save_table_as_png(summary_calls_info, 'calls_info_raw', subfolder='notebooks')
 save_table_as_png(summary_info_calls, 'calls_info_clean', subfolder='notebooks')
@@ -44,18 +44,25 @@ from utils import (
     cmap_yellow,
     compare_distributions,
     describe_cat,
+    describe_cat_by,
     describe_num,
+    describe_num_by,
     get_my_palette,
     load_files,
+    load_crm_bundle,
     log_section,
     plot_change,
+    run_stage,
     save_clean_data,
     save_plot,
     save_styler_as_png,
     save_table_as_png,
     setup_logging,
     show_df,
+    style_cat_stats,
+    style_num_stats,
     summarize_category,
+    top_values,
 )
 
 warnings.filterwarnings('ignore')
@@ -76,14 +83,15 @@ logging.info(f'Downloaded {len(download)} files successfully.')
 
 log_section('=== Reading Excel files ===')
 
-df_calls = pd.read_excel(os.path.join(CLEAN_DIR, 'calls_clean.xlsx'),
-                         dtype={'Id': str, 'CONTACTID':str}, engine='openpyxl')
-df_contacts = pd.read_excel(os.path.join(CLEAN_DIR, 'contacts_clean.xlsx'),
-                         dtype={'Id': str}, engine='openpyxl')
-df_deals = pd.read_excel(os.path.join(CLEAN_DIR, 'deals_clean.xlsx'),
-                         dtype={'Id': str, 'Contact Name':str}, engine='openpyxl')
-df_spend = pd.read_excel(os.path.join(CLEAN_DIR, 'spend_clean.xlsx'),
-                         engine='openpyxl')
+crm = run_stage(
+    'load_clean',
+    load_crm_bundle,
+    inputs=[os.path.join(CLEAN_DIR, f) for f in FILES],
+    params={'folder': CLEAN_DIR}
+)
+df_calls, df_contacts, df_deals, df_spend = (
+    crm['calls'], crm['contacts'], crm['deals'], crm['spend']
+)
 
 logging.info('All files successfully loaded into DataFrames.')
 
@@ -95,7 +103,12 @@ start_time = time.time()
 #### Numeric fields
 """
 
-calls = describe_num(df_calls, df_name='calls')
+calls = style_num_stats(run_stage(
+    'calls_num_stats',
+    lambda: describe_num(df_calls, df_name='calls', show=False, style=False),
+    inputs=[df_calls]
+))
+display(calls)
 
 df_calls['Weekday'] = df_calls['Call Start Time'].dt.day_name()
 
@@ -222,7 +235,12 @@ delta_calls = plot_change(compare_calls, name='call_change', subfolder='notebook
 
 """#### Categorical fields"""
 
-calls_new = describe_cat(df_calls, df_name='Calls')
+calls_new = style_cat_stats(run_stage(
+    'calls_cat_stats',
+    lambda: describe_cat(df_calls, df_name='Calls', show=False, style=False),
+    inputs=[df_calls]
+))
+display(calls_new)
 
 contact_owner_count = (
     df_calls.groupby('CONTACTID')['Call Owner Name']
@@ -487,11 +505,17 @@ start_time = time.time()
 #### Numeric fields
 """
 
+# contacts have no numeric columns, so there is no table to cache
 contacts = describe_num(df_contacts, df_name='contacts')
 
 """#### Categorical fields"""
 
-contacts_new = describe_cat(df_contacts, df_name='Contacts')
+contacts_new = style_cat_stats(run_stage(
+    'contacts_cat_stats',
+    lambda: describe_cat(df_contacts, df_name='Contacts', show=False, style=False),
+    inputs=[df_contacts]
+))
+display(contacts_new)
 
 aggregated_data = (
     df_contacts.groupby('Contact Owner Name')
@@ -538,7 +562,17 @@ start_time = time.time()
 #### Numeric fields
 """
 
-spend = describe_num(df_spend, df_name='spend')
+spend = style_num_stats(run_stage(
+    'spend_num_stats',
+    lambda: describe_num(df_spend, df_name='spend', show=False, style=False),
+    inputs=[df_spend]
+))
+display(spend)
+
+spend_by_source = describe_num_by(
+    df_spend, by='Source', columns=['Impressions', 'Clicks', 'Spend'], df_name='spend', quantiles=False, show=False
+)
+show_df(spend_by_source, name='Spend: statistics by Source', max_rows=20)
 
 df_spend['Impressions (log)'] = np.log1p(df_spend['Impressions'])
 
@@ -677,7 +711,15 @@ delta_spend = plot_change(compare_spend, name='spend_change', subfolder='noteboo
 
 """#### Categorical fields"""
 
-spend_new = describe_cat(df_spend, df_name='Spend')
+spend_new = style_cat_stats(run_stage(
+    'spend_cat_stats',
+    lambda: describe_cat(df_spend, df_name='Spend', show=False, style=False),
+    inputs=[df_spend]
+))
+display(spend_new)
+
+for col in ['Campaign', 'Ad']:
+    show_df(top_values(df_spend[col], k=10), name=f'Spend: top {col} values', max_rows=10)
 
 cols = ['Source', 'Campaign', 'AdGroup','Ad']
 palettes = ['Tomato', 'Cornflower', 'Yellowsoft', 'Lavender']
@@ -756,7 +798,12 @@ start_time = time.time()
 #### Numeric fields
 """
 
-deals = describe_num(df_deals, df_name='deals')
+deals = style_num_stats(run_stage(
+    'deals_num_stats',
+    lambda: describe_num(df_deals, df_name='deals', show=False, style=False),
+    inputs=[df_deals]
+))
+display(deals)
 
 df_deals['Initial Amount Paid (log)'] = np.log1p(df_deals['Initial Amount Paid'])
 
@@ -886,7 +933,18 @@ delta_deals = plot_change(compare_spend, name='sla_change', subfolder='notebooks
 
 """#### Categorical fields"""
 
-deals_new = describe_cat(df_deals, df_name='Deals')
+deals_new = style_cat_stats(run_stage(
+    'deals_cat_stats',
+    lambda: describe_cat(df_deals, df_name='Deals', show=False, style=False),
+    inputs=[df_deals]
+))
+display(deals_new)
+
+for col in ['Lost Reason', 'City']:
+    show_df(top_values(df_deals[col], k=10), name=f'Deals: top {col} values', max_rows=10)
+
+deals_by_product = describe_cat_by(df_deals, by='Product', columns=['Lost Reason', 'City'], df_name='Deals', show=False)
+show_df(deals_by_product, name='Deals: categorical statistics by Product', max_rows=20)
 
 cols = ['Quality', 'Product', 'Source','Stage']
 palettes = ['Tomato', 'Cornflower', 'Yellowsoft', 'Lavender']
@@ -25,9 +25,12 @@ import dataframe_image as dfi
 from utils import (
     get_my_palette,
     load_files,
+    load_crm_bundle,
     log_section,
-    prod_analysis,
+    run_stage,
     setup_logging,
+    style_unit_economics,
+    unit_economics,
 )
 
 setup_logging()
@@ -46,14 +49,15 @@ logging.info(f'Downloaded {len(download)} files successfully.')
 
 log_section('=== Reading Excel files ===')
 
-df_calls = pd.read_excel(os.path.join(CLEAN_DIR, 'calls_clean.xlsx'),
-                         dtype={'Id': str, 'CONTACTID':str}, engine='openpyxl')
-df_contacts = pd.read_excel(os.path.join(CLEAN_DIR, 'contacts_clean.xlsx'),
-                         dtype={'Id': str}, engine='openpyxl')
-df_deals = pd.read_excel(os.path.join(CLEAN_DIR, 'deals_clean.xlsx'),
-                         dtype={'Id': str, 'Contact Name':str}, engine='openpyxl')
-df_spend = pd.read_excel(os.path.join(CLEAN_DIR, 'spend_clean.xlsx'),
-                         engine='openpyxl')
+crm = run_stage(
+    'load_clean',
+    load_crm_bundle,
+    inputs=[os.path.join(CLEAN_DIR, f) for f in FILES],
+    params={'folder': CLEAN_DIR}
+)
+df_calls, df_contacts, df_deals, df_spend = (
+    crm['calls'], crm['contacts'], crm['deals'], crm['spend']
+)
 
 logging.info('All files successfully loaded into DataFrames.')
 
@@ -73,13 +77,24 @@ start_time = time.time()
 </font>
 """
 
-prod_analysis(df_deals, df_contacts, df_spend)
+PRODUCTS = ['Digital Marketing', 'Web Developer', 'UX/UI Design']
+
+unit_tables = run_stage(
+    'unit_economics',
+    lambda: {
+        product or 'Total': unit_economics(df_deals, df_contacts, df_spend, product=product)
+        for product in [None] + PRODUCTS
+    },
+    inputs=[df_deals, df_contacts, df_spend]
+)
+
+style_unit_economics(unit_tables['Total'])
 
-prod_analysis(df_deals, df_contacts, df_spend, product='Digital Marketing')
+style_unit_economics(unit_tables['Digital Marketing'], product='Digital Marketing')
 
-prod_analysis(df_deals, df_contacts, df_spend, product='Web Developer')
+style_unit_economics(unit_tables['Web Developer'], product='Web Developer')
 
-prod_analysis(df_deals, df_contacts, df_spend, product='UX/UI Design')
+style_unit_economics(unit_tables['UX/UI Design'], product='UX/UI Design')
 
 """# 2. Metric Tree
 *(Based on the core datasets used in business performance analysis)*  
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from utils import Catalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    pd.DataFrame({
+        'Id': ['1', '2', '3'],
+        'Source': ['Facebook Ads', 'Google Ads', 'Facebook Ads'],
+        'Product': ['Web Developer', 'UX/UI Design', 'Web Developer'],
+        'Stage': ['Payment Done', 'Lost', 'Lost'],
+        'Contact Name': ['a', 'b', 'c'],
+    }).to_parquet(tmp_path / 'deals_clean.parquet')
+    return Catalog(str(tmp_path), fmt='parquet')
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    read_parquet = pd.read_parquet
+
+    def spy(path, columns=None, **kwargs):
+        calls.append(columns)
+        return read_parquet(path, columns=columns, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_parquet', spy)
+    return calls
+
+
+def test_select_reads_only_requested_columns(catalog, reads):
+    df = catalog['deals'].select(['Source', 'Product', 'Stage'])
+
+    assert list(df.columns) == ['Source', 'Product', 'Stage']
+    assert reads == [['Source', 'Product', 'Stage']]
+    assert df['Source'].tolist() == ['Facebook Ads', 'Google Ads', 'Facebook Ads']
+
+
+def test_select_reuses_loaded_columns(catalog, reads):
+    catalog['deals'].select(['Source', 'Product'])
+    df = catalog['deals'].select(['Product', 'Stage'], where=[('Source', '==', 'Facebook Ads')])
+
+    # only the column not loaded yet is read
+    assert reads == [['Source', 'Product'], ['Stage']]
+    assert df['Stage'].tolist() == ['Payment Done', 'Lost']
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import clean_amount, clean_amount_series, clean_duplicates, row_hashes
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
+
+
+def test_row_hashes_keep_missing_apart_from_empty_text():
+    df = pd.DataFrame({
+        'Id': range(7),
+        'Text': ['', np.nan, 'nan', None, '', 'None', pd.NA],
+        'Number': [1.0, np.nan, 1.0, np.nan, 1.0, 1.0, np.nan],
+    })
+    hashes = row_hashes(df)
+    assert hashes.duplicated().tolist() == df.iloc[:, 1:].duplicated().tolist()
+    assert hashes[0] != hashes[1]
+
+
+def test_clean_duplicates_against_index(tmp_path):
+    index_path = str(tmp_path / 'row_hashes.parquet')
+    first = pd.DataFrame({'Id': [1, 2, 3], 'Name': ['a', 'b', 'a']})
+    assert clean_duplicates(first, 'first', index_path=index_path)['Id'].tolist() == [1, 2]
+
+    # 4 repeats a row kept earlier; 3 (dropped earlier) now leads its own batch and is kept
+    second = pd.DataFrame({'Id': [4, 5, 3], 'Name': ['b', 'c', 'd']})
+    assert clean_duplicates(second, 'second', index_path=index_path)['Id'].tolist() == [5, 3]
+
+    # a re-cleaned key is not checked against its own earlier entry
+    third = pd.DataFrame({'Id': [2], 'Name': ['b']})
+    assert clean_duplicates(third, 'third', index_path=index_path)['Id'].tolist() == [2]
+
+
+AMOUNTS = [
+    '1.234,56', '1,234.56', '€ 1.234,56', '1 234,5 EUR', '1,5', '1.5', '-3', '1.234.567,8', '1,2,3',
+    '--1', '', '   ', 'abc', '12', None, np.nan, 12, 3.5, 0, -7.25,
+]
+
+
+def scalar_amounts(series):
+    return series.apply(clean_amount).astype(float)
+
+
+@pytest.mark.parametrize('dtype', [object, 'string'])
+def test_clean_amount_series_matches_scalar(dtype):
+    values = AMOUNTS if dtype is object else [v for v in AMOUNTS if v is None or isinstance(v, str)]
+    series = pd.Series(values, dtype=dtype)
+    pd.testing.assert_series_equal(clean_amount_series(series), scalar_amounts(series))
+
+
+def test_clean_amount_series_numeric_columns():
+    for series in [pd.Series([1, 2, 3]), pd.Series([1.5, np.nan]), pd.Series(pd.array([1, None], dtype='Int64'))]:
+        pd.testing.assert_series_equal(clean_amount_series(series), scalar_amounts(series))
+
+
+@pytest.mark.parametrize('name, columns', [
+    ('spend', ['Spend']),
+    ('deals', ['Initial Amount Paid', 'Offer Total Amount']),
+])
+def test_clean_amount_series_matches_scalar_on_raw_exports(name, columns):
+    path = os.path.join(RAW_DIR, f'{name}.xlsx')
+    if not os.path.exists(path):
+        pytest.skip(f'{path} not available')
+
+    raw = pd.read_excel(path, usecols=columns, engine='openpyxl')
+    for col in columns:
+        pd.testing.assert_series_equal(clean_amount_series(raw[col]), scalar_amounts(raw[col]))
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import load_files
+
+
+class FileServer:
+    """
+    Local HTTP server for one file, with switches for the behaviours load_files must handle.
+    """
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.honour_range = True
+        self.fail_first = 0
+        self.truncate_at = None
+        self.requests = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if server.fail_first:
+                    server.fail_first -= 1
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                body, status = server.body, 200
+                range_header = self.headers.get('Range')
+                if range_header and server.honour_range and self.headers.get('If-Range') == server.etag:
+                    offset = int(range_header.split('=')[1].rstrip('-'))
+                    body, status = server.body[offset:], 206
+
+                self.send_response(status)
+                self.send_header('ETag', server.etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if server.truncate_at is not None:
+                    body, server.truncate_at = body[:server.truncate_at], None
+                    self.close_connection = True
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+BODY = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def server():
+    server = FileServer(BODY)
+    yield server
+    server.close()
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def write_partial(folder, name, data, part_etag):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f'{name}.part'), 'wb') as f:
+        f.write(data)
+    with open(os.path.join(folder, '.download_manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({name: {'part_etag': part_etag}}, f)
+
+
+def test_download_and_skip_unchanged(server, tmp_path):
+    folder = str(tmp_path)
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+    assert read(path) == BODY
+
+    load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+    assert server.requests[-1]['If-None-Match'] == '"v1"'
+    assert read(path) == BODY
+
+
+def test_range_resume(server, tmp_path):
+    folder = str(tmp_path)
+    write_partial(folder, 'calls.xlsx', BODY[:1000], '"v1"')
+
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    assert server.requests[0]['Range'] == 'bytes=1000-'
+    assert read(path) == BODY
+    assert not os.path.exists(f'{path}.part')
+
+
+def test_interrupted_download_resumes(server, tmp_path):
+    folder = str(tmp_path)
+    server.truncate_at = 150_000
+    with pytest.raises(Exception):
+        load_files(server.url, ['calls.xlsx'], target_folder=folder, retries=0, backoff=0)
+    written = os.path.getsize(os.path.join(folder, 'calls.xlsx.part'))
+    assert 0 < written < len(BODY)
+
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    assert server.requests[-1]['Range'] == f'bytes={written}-'
+    assert read(path) == BODY
+
+
+def test_full_response_to_range_restarts(server, tmp_path):
+    folder = str(tmp_path)
+    server.honour_range = False
+    write_partial(folder, 'calls.xlsx', b'stale bytes', '"v1"')
+
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    assert 'Range' in server.requests[0]
+    assert read(path) == BODY
+
+
+def test_changed_etag_refreshes_file(server, tmp_path):
+    folder = str(tmp_path)
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    server.body, server.etag = BODY[::-1], '"v2"'
+    load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    assert read(path) == BODY[::-1]
+    with open(os.path.join(folder, '.download_manifest.json'), encoding='utf-8') as f:
+        assert json.load(f)['calls.xlsx']['etag'] == '"v2"'
+
+
+def test_changed_etag_discards_partial(server, tmp_path):
+    folder = str(tmp_path)
+    server.etag = '"v2"'
+    write_partial(folder, 'calls.xlsx', b'bytes of the old version', '"v1"')
+
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=folder, backoff=0)
+
+    assert server.requests[0]['If-Range'] == '"v1"'
+    assert read(path) == BODY
+
+
+def test_checksum_mismatch(server, tmp_path):
+    folder = str(tmp_path)
+    with pytest.raises(ValueError, match='Checksum mismatch'):
+        load_files(server.url, ['calls.xlsx'], target_folder=folder, checksums={'calls.xlsx': '0' * 64}, backoff=0)
+
+    assert not os.path.exists(os.path.join(folder, 'calls.xlsx'))
+    assert not os.path.exists(os.path.join(folder, 'calls.xlsx.part'))
+
+
+def test_matching_checksum_skips_request(server, tmp_path):
+    folder = str(tmp_path)
+    sha = hashlib.sha256(BODY).hexdigest()
+    load_files(server.url, ['calls.xlsx'], target_folder=folder, checksums={'calls.xlsx': sha}, backoff=0)
+    load_files(server.url, ['calls.xlsx'], target_folder=folder, checksums={'calls.xlsx': sha}, backoff=0)
+
+    assert len(server.requests) == 1
+
+
+def test_retry_on_server_error(server, tmp_path):
+    server.fail_first = 2
+    [path] = load_files(server.url, ['calls.xlsx'], target_folder=str(tmp_path), retries=3, backoff=0)
+
+    assert len(server.requests) == 3
+    assert read(path) == BODY
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import DataSummary, approx_nunique
+from utils.data_summary import HLL_PRECISION
+
+
+def error_bound(nunique, precision=HLL_PRECISION):
+    # the ±95% bound summary_info reports as nunique_error
+    return int(np.ceil(2 * 1.04 / np.sqrt(1 << precision) * nunique))
+
+
+@pytest.mark.parametrize('distinct', [1_000, 100_000, 1_000_000])
+def test_approx_nunique_within_reported_error(distinct):
+    rng = np.random.default_rng(distinct)
+    values = rng.permutation(distinct).repeat(2)
+    for series in [pd.Series(values), pd.Series(values * 0.5), pd.Series(pd.to_datetime(values, unit='s'))]:
+        assert abs(approx_nunique(series) - distinct) <= error_bound(distinct)
+
+
+def test_approx_nunique_ignores_nulls():
+    series = pd.Series(['a', 'b', None, 'a', np.nan], dtype=object)
+    assert approx_nunique(series) == 2
+    assert approx_nunique(pd.Series([], dtype=float)) == 0
+
+
+def test_fast_summary_estimates_within_reported_error():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Amount': rng.integers(0, 10 ** 9, 200_000).astype(float),
+        'Level': rng.choice(['A1', 'B1', 'C1'], 200_000),
+    })
+    summary = DataSummary('large', df).summary_info(mode='fast', sample_size=10_000)
+
+    exact = df.nunique()
+    assert summary.loc['Amount', 'nunique_error'] > 0
+    assert (summary['nunique'] - exact).abs().le(summary['nunique_error']).all()
+    # low-cardinality columns are counted exactly
+    assert summary.loc['Level', 'nunique'] == 3 and summary.loc['Level', 'nunique_error'] == 0
+
+
+def test_fast_summary_of_small_frame_equals_exact():
+    df = pd.DataFrame({
+        'Id': [str(i) for i in range(100)],
+        'Amount': np.arange(100) * 1.5,
+        'Created Time': pd.date_range('2024-01-01', periods=100, freq='h'),
+        'Mixed': pd.Series([1, 'a', None, 2.5] * 25, dtype=object),
+        'Level': pd.Categorical(['A1', 'B1', None, 'A1'] * 25),
+    })
+    summary = DataSummary('small', df)
+    exact = summary.summary_info(mode='exact')
+    fast = summary.summary_info(mode='fast', sample_size=1_000)
+
+    columns = ['non_nulls', 'nulls', 'null_pct', 'dtype', 'column_type', 'nunique']
+    pd.testing.assert_frame_equal(fast[columns], exact[columns], check_dtype=False)
+    assert all(
+        pd.Series(a).equals(pd.Series(b)) for a, b in zip(fast['sample_values'], exact['sample_values'])
+    )
+    assert fast['nunique_error'].eq(0).all() and fast['type_error_pct'].eq(0).all()
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import apply_schema, describe_cat, describe_cat_by, describe_num, describe_num_by, read_dtypes
+
+CLEAN_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'clean')
+
+BASELINE_DTYPES = {
+    'contacts': {'Id': str},
+    'deals': {'Id': str, 'Contact Name': str},
+    'spend': None,
+}
+
+GROUP_BY = {'contacts': 'Contact Owner Name', 'deals': 'Quality', 'spend': 'Source'}
+
+
+def baseline_num(df):
+    """
+    describe_num table as the notebooks published it before the schema and the stats engine.
+    """
+    num_cols = df.select_dtypes(include=['int', 'float']).columns
+    return pd.DataFrame({
+        'Count': df[num_cols].count(),
+        'Mean': df[num_cols].mean(),
+        'Median': df[num_cols].median(),
+        'Mode': [df[c].mode().iloc[0] if not df[c].mode().empty else np.nan for c in num_cols],
+        'Min': df[num_cols].min(),
+        '5%': df[num_cols].quantile(0.05),
+        '25%': df[num_cols].quantile(0.25),
+        '50%': df[num_cols].quantile(0.5),
+        '75%': df[num_cols].quantile(0.75),
+        '95%': df[num_cols].quantile(0.95),
+        'Max': df[num_cols].max(),
+        'Range': df[num_cols].max() - df[num_cols].min(),
+        'IQR': df[num_cols].quantile(0.75) - df[num_cols].quantile(0.25),
+        'Std Dev': df[num_cols].std(),
+        'CoeffVar (%)': (df[num_cols].std() / df[num_cols].mean()) * 100,
+        'Skewness': df[num_cols].skew(),
+    })
+
+
+def baseline_cat(df):
+    """
+    describe_cat table as the notebooks published it before the schema.
+    """
+    data = []
+    cat_cols = [col for col in df.columns if pd.api.types.is_string_dtype(df[col].dtype)]
+    for col in cat_cols:
+        series = df[col].dropna()
+        count = len(series)
+        freq = series.value_counts().iloc[0] if count else np.nan
+        data.append([
+            count, series.nunique(), series.mode().iloc[0] if count else np.nan, freq,
+            round((freq / count) * 100, 2) if count > 0 else np.nan,
+        ])
+    return pd.DataFrame(data, columns=['Count', 'Unique', 'Mode', 'Frequency', 'Percent'], index=cat_cols)
+
+
+@pytest.fixture(scope='module', params=list(BASELINE_DTYPES))
+def frames(request):
+    name = request.param
+    path = os.path.join(CLEAN_DIR, f'{name}_clean.xlsx')
+    if not os.path.exists(path):
+        pytest.skip(f'{path} not available')
+
+    assert read_dtypes(name) == (BASELINE_DTYPES[name] or {})
+    baseline = pd.read_excel(path, dtype=BASELINE_DTYPES[name], engine='openpyxl')
+    # load_crm_bundle reads with read_dtypes and applies the schema, as done here
+    return name, baseline, apply_schema(baseline, name)
+
+
+def test_describe_num_matches_baseline(frames):
+    name, baseline, schema_df = frames
+    expected = baseline_num(baseline)
+    result = describe_num(schema_df, df_name=name, show=False, style=False)
+
+    if expected.empty:
+        assert result is None
+        return
+    assert list(result.index) == list(expected.index)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(float), expected.to_numpy(float), rtol=1e-9, equal_nan=True)
+
+
+def test_describe_cat_matches_baseline(frames):
+    name, baseline, schema_df = frames
+    expected = baseline_cat(baseline)
+    result = describe_cat(schema_df, df_name=name, show=False).data
+
+    assert list(result.index) == list(expected.index)
+    for col in ['Count', 'Unique', 'Frequency', 'Percent']:
+        np.testing.assert_array_equal(result[col].to_numpy(float), expected[col].to_numpy(float), err_msg=col)
+    assert [str(mode) for mode in result['Mode']] == [str(mode) for mode in expected['Mode']]
+
+
+def test_grouped_tables_match_per_group_tables(frames):
+    name, _, schema_df = frames
+    by = GROUP_BY[name]
+    group = schema_df[by].dropna().iloc[0]
+    subset = schema_df[schema_df[by] == group].drop(columns=by)
+
+    expected = describe_cat(subset, df_name=name, show=False).data
+    grouped = describe_cat_by(schema_df, by, df_name=name, show=False)
+    result = grouped[grouped[by] == group].pivot(index='Column', columns='Statistic', values='Value')
+    assert sorted(result.index) == sorted(expected.index)
+    result = result.reindex(index=expected.index, columns=expected.columns)
+    assert (result.astype(str).to_numpy() == expected.astype(str).to_numpy()).all()
+
+    expected = describe_num(subset, df_name=name, show=False, style=False)
+    grouped = describe_num_by(schema_df, by, df_name=name, show=False)
+    if expected is None:
+        assert grouped is None
+        return
+    result = grouped[grouped[by] == group].pivot(index='Column', columns='Statistic', values='Value')
+    assert sorted(result.index) == sorted(expected.index)
+    result = result.reindex(index=expected.index, columns=expected.columns)
+    np.testing.assert_allclose(result.to_numpy(float), expected.to_numpy(float), rtol=1e-9, equal_nan=True)
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from utils import resolve_entities
+
+
+@pytest.fixture
+def deals():
+    return pd.DataFrame({
+        'Id': ['1', '2', '3', '4', '5', '6'],
+        'Contact Name': ['c1', 'c1 ', 'c2', 'c3', 'c4', 'c5'],
+        'Deal Owner Name': ['Ann', 'Ann', 'Ben', 'Ben', 'Ben', 'Ann'],
+        'Created Time': pd.to_datetime([
+            '2024-01-01 10:05', '2024-02-01 09:00', '2024-03-01 12:10',
+            '2024-03-01 12:40', '2024-03-01 12:50', '2024-03-01 12:20',
+        ]),
+        'Product': ['Web Developer', 'UX/UI Design', 'Digital Marketing', 'digital marketing ', 'Digital Marketing', 'Digital Marketing'],
+        'City': ['Berlin', 'Berlin', 'Munich', 'Munich', 'Hamburg', 'Munich'],
+        'Campaign': ['spring', None, 'spring', 'Spring', 'spring', 'spring'],
+        'Source': ['Facebook Ads'] * 6,
+        'Offer Total Amount': [1000.0, 2000.0, 3000.0, 3000.0, 3000.0, 3000.0],
+    })
+
+
+def test_known_duplicate_cluster(deals):
+    entities = resolve_entities(deals, 'deals')
+
+    # 1 and 2 share a contact; 3 and 4 are one deal entered twice under different contacts
+    assert entities[0] == entities[1]
+    assert entities[2] == entities[3]
+    # 5 differs in City, 6 has another owner
+    assert entities.nunique() == 4
+    assert entities.index.equals(deals.index)
+
+
+def test_min_compared_guards_sparse_rows(deals):
+    sparse = deals.assign(**{col: None for col in ['Product', 'City', 'Campaign']})
+    rule = {'block': ['Deal Owner Name', 'Created Time'], 'bucket': {'Created Time': 'h'},
+            'compare': ['Product', 'City', 'Campaign', 'Source', 'Offer Total Amount'],
+            'min_agreement': 1.0, 'min_compared': 3}
+
+    # only Source and amount are left to compare, too few to call 3, 4 and 5 the same deal
+    assert resolve_entities(sparse, [rule]).nunique() == len(deals)
+
+
+def test_unknown_dataset_raises(deals):
+    with pytest.raises(ValueError, match='Unknown dataset'):
+        resolve_entities(deals, 'contacts')
@@ -0,0 +1,35 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils import city_key, enrich_cities, load_city_table
+
+CITIES = {
+    'München': {'federal_state': 'Bavaria', 'country': 'Germany', 'latitude': 48.14, 'longitude': 11.58},
+    'Gdańsk': {'federal_state': 'Pomerania', 'country': 'Poland', 'latitude': 54.35, 'longitude': 18.65},
+    'Frankfurt am Main': {'federal_state': 'Hesse', 'country': 'Germany', 'latitude': 50.11, 'longitude': 8.68},
+    'Mexico City': {'federal_state': 'CDMX', 'country': 'Mexico', 'latitude': 19.43, 'longitude': -99.13},
+}
+
+
+def test_city_key_normalizes_spellings():
+    keys = city_key(pd.Series(['München', ' muenchen ', 'MÜNCHEN', 'Gdańsk', 'Gdansk', 'Weißenburg', None, 'nan', '']))
+    assert keys[:6].tolist() == ['muenchen', 'muenchen', 'muenchen', 'gdansk', 'gdansk', 'weissenburg']
+    assert keys[6:].isna().all()
+
+
+def test_enrich_cities_joins_on_normalized_key(tmp_path):
+    path = tmp_path / 'cities.json'
+    path.write_text(json.dumps(CITIES, ensure_ascii=False), encoding='utf-8')
+    deals = pd.DataFrame({'City': [
+        'Muenchen', 'münchen', 'Gdansk', 'frankfurt  AM main', 'Mexico', 'Atlantis', None, 'nan',
+    ]})
+
+    enriched, unmatched = enrich_cities(deals, load_city_table(str(path)))
+
+    assert enriched['City'].tolist()[:2] == ['Muenchen', 'münchen']
+    assert enriched['Country'].tolist()[:5] == ['Germany', 'Germany', 'Poland', 'Germany', 'Mexico']
+    assert enriched['Latitude'].iloc[2] == 54.35
+    assert np.isnan(enriched['Latitude'].iloc[5:]).all()
+    assert unmatched.to_dict('records') == [{'City': 'Atlantis', 'Rows': 1}]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import SpaceSaving, top_values
+
+
+@pytest.fixture(scope='module')
+def skewed():
+    rng = np.random.default_rng(0)
+    return pd.Series(rng.zipf(1.3, 300_000)).astype(str).rename('City')
+
+
+def check_bounds(top, exact, total, capacity):
+    true = exact.reindex(top['Value']).fillna(0).to_numpy()
+    # counts are upper bounds that overestimate by at most the reported error, itself at most total / capacity
+    assert (top['Frequency'].to_numpy() >= true).all()
+    assert (top['Frequency'].to_numpy() - true <= top['Max Error'].to_numpy()).all()
+    assert (top['Max Error'] <= total / capacity).all()
+
+
+def test_top_values_match_value_counts(skewed):
+    exact = skewed.value_counts()
+    top = top_values(skewed, k=10, capacity=200, chunk_size=20_000)
+
+    assert set(top['Value']) == set(exact.head(10).index)
+    check_bounds(top, exact, len(skewed), 200)
+
+
+def test_merged_summaries_keep_the_bound(skewed):
+    exact = skewed.value_counts()
+    halves = [SpaceSaving(200).update(part) for part in np.array_split(skewed, 2)]
+    merged = halves[0].merge(halves[1])
+    top = merged.top(10)
+
+    assert merged.total == len(skewed)
+    assert set(top['Value']) == set(exact.head(10).index)
+    check_bounds(top, exact, len(skewed), 200)
+    # the tail counters hold values that were evicted and re-entered, with a non-zero error
+    tail = merged.top(200)
+    assert tail['Max Error'].gt(0).any()
+    check_bounds(tail, exact, len(skewed), 200)
+
+
+def test_exact_when_counters_suffice():
+    series = pd.Series(['a', 'b', 'a', None, 'c', 'a', 'b'] * 1000, dtype='category')
+    top = top_values(series, k=3, chunk_size=500)
+
+    assert top['Value'].tolist() == ['a', 'b', 'c']
+    assert top['Frequency'].tolist() == [3000, 2000, 1000]
+    assert top['Max Error'].eq(0).all()
+    assert top['Percent'].tolist() == [50.0, 33.33, 16.67]
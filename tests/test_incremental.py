@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import incremental
+from utils.cleaners import convert_columns, fill_group_mode
+from utils.cleaning_steps import remove_duplicates, remove_earliest_created, remove_values
+from utils.pipeline import Pipeline
+
+STEPS = [
+    ('fill_group_values', fill_group_mode, {'by': 'Group', 'columns': ['Value']}),
+    ('remove_flagged', remove_values, {'column': 'Flag', 'values': ['drop']}),
+    ('remove_earliest_created', remove_earliest_created),
+    ('convert_categories', convert_columns, {'category_cols': ['Group']}),
+]
+
+
+@pytest.fixture(autouse=True)
+def toy_config(monkeypatch):
+    monkeypatch.setitem(incremental.INCREMENTAL_KEYS, 'toy', {
+        'key': 'Id', 'modified': None, 'groups': ['Group'], 'global_from': 'remove_earliest_created',
+    })
+
+
+def make_raw(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    value = rng.integers(0, 5, n).astype(float)
+    value[rng.random(n) < 0.3] = np.nan
+    return pd.DataFrame({
+        'Id': pd.array(np.arange(1, n + 1), dtype='Int64'),
+        'Group': rng.choice(['a', 'b', 'c', 'd', None], n),
+        'Value': value,
+        'Flag': rng.choice(['keep', 'drop'], n, p=[0.9, 0.1]),
+        'Created Time': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(1, 300, n), unit='D'),
+    })
+
+
+def full_rebuild(raw):
+    return Pipeline('toy', STEPS).run(raw).reset_index(drop=True)
+
+
+def run(raw, folder, steps=STEPS):
+    pipeline = Pipeline('toy', steps)
+    result = incremental.incremental_clean(raw, pipeline, str(folder))
+    pd.testing.assert_frame_equal(result, Pipeline('toy', steps).run(raw).reset_index(drop=True))
+    return pipeline.metrics
+
+
+def rows_in(metrics):
+    """Rows the first (row- and group-local) step ran on, or 0 when it was skipped."""
+    local = metrics[metrics['Step'] == 'fill_group_values']
+    return int(local['Rows In'].iloc[0]) if len(local) else 0
+
+
+def test_first_run_cleans_everything(tmp_path):
+    raw = make_raw()
+    assert rows_in(run(raw, tmp_path)) == len(raw)
+
+
+def test_unchanged_export_skips_local_steps(tmp_path):
+    raw = make_raw()
+    run(raw, tmp_path)
+    assert rows_in(run(raw, tmp_path)) == 0
+
+
+def test_added_rows(tmp_path):
+    raw = make_raw()
+    run(raw, tmp_path)
+
+    added = make_raw(5, seed=1).assign(Id=pd.array([1001, 1002, 1003, 1004, 1005], dtype='Int64'), Group='e')
+    metrics = run(pd.concat([raw, added], ignore_index=True), tmp_path)
+    assert rows_in(metrics) == 5
+
+
+def test_changed_rows_recompute_their_groups(tmp_path):
+    raw = make_raw()
+    run(raw, tmp_path)
+
+    changed = raw.copy()
+    changed.loc[3, 'Value'] = 4.0
+    changed.loc[7, 'Group'] = 'b' if changed.loc[7, 'Group'] != 'b' else 'c'
+    changed.loc[9, 'Created Time'] = pd.Timestamp('2023-06-01')
+
+    metrics = run(changed, tmp_path)
+    assert 0 < rows_in(metrics) < len(raw)
+
+
+def test_deleted_rows(tmp_path):
+    raw = make_raw()
+    run(raw, tmp_path)
+
+    earliest = raw['Created Time'].idxmin()
+    deleted = raw.drop(index=[earliest, 20, 21]).reset_index(drop=True)
+    run(deleted, tmp_path)
+
+
+def test_deletions_only_skip_local_steps(tmp_path):
+    raw = make_raw()
+    raw['Group'] = raw['Group'].fillna('a')
+    run(raw, tmp_path)
+
+    # the last group holds one row, so nothing is left to re-clean after deleting it
+    raw.loc[len(raw) - 1, 'Group'] = 'z'
+    run(raw, tmp_path)
+    metrics = run(raw.iloc[:-1], tmp_path)
+    assert rows_in(metrics) == 0
+
+
+def test_changed_steps_rebuild(tmp_path):
+    raw = make_raw()
+    run(raw, tmp_path)
+
+    pipeline = Pipeline('toy', [STEPS[0], ('remove_flagged', remove_values, {'column': 'Flag', 'values': ['x']}), *STEPS[2:]])
+    result = incremental.incremental_clean(raw, pipeline, str(tmp_path))
+    assert rows_in(pipeline.metrics) == len(raw)
+    assert (result['Flag'] == 'drop').any()
+
+
+def dedup_steps(folder):
+    """Row-local steps only, so duplicates are re-cleaned through the row-hash index, not through their groups."""
+    index_path = str(folder / 'toy_row_hashes.parquet')
+    return [('remove_duplicates', remove_duplicates, {'name': 'toy', 'index_path': index_path}), *STEPS[1:]]
+
+
+@pytest.fixture
+def no_groups(monkeypatch):
+    monkeypatch.setitem(incremental.INCREMENTAL_KEYS['toy'], 'groups', [])
+
+
+def copy_rows(raw, positions, first_id):
+    copies = raw.iloc[positions].copy()
+    copies['Id'] = pd.array(np.arange(first_id, first_id + len(positions)), dtype='Int64')
+    return copies
+
+
+def test_added_rows_duplicating_earlier_rows(tmp_path, no_groups):
+    raw = make_raw()
+    run(raw, tmp_path, dedup_steps(tmp_path))
+
+    # only the copies are re-cleaned; the index drops them against the rows kept by the first run
+    added = pd.concat([raw, copy_rows(raw, [5, 6], 1001)], ignore_index=True)
+    run(added, tmp_path, dedup_steps(tmp_path))
+
+
+def test_deleted_or_changed_kept_row_restores_duplicate(tmp_path, no_groups):
+    raw = pd.concat([make_raw(), copy_rows(make_raw(), [5, 6], 1001)], ignore_index=True)
+    run(raw, tmp_path, dedup_steps(tmp_path))
+
+    changed = raw.drop(index=5).reset_index(drop=True)
+    changed.loc[5, 'Value'] = 99.0
+    run(changed, tmp_path, dedup_steps(tmp_path))
+    run(changed, tmp_path, dedup_steps(tmp_path))
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils import pipeline_cache
+from utils.cleaners import convert_columns
+from utils.cleaning_steps import remove_values
+from utils.pipeline import Pipeline
+
+
+def add_total(df):
+    df['Total'] = df['Value'] * 2
+    return df
+
+
+STEPS = [
+    ('remove_flagged', remove_values, {'column': 'Flag', 'values': ['drop']}),
+    ('add_total', add_total),
+    ('convert_categories', convert_columns, {'category_cols': ['Flag']}),
+]
+
+
+@pytest.fixture
+def raw():
+    return pd.DataFrame({'Value': [1, 2, 3, 4], 'Flag': ['keep', 'drop', 'keep', 'keep']})
+
+
+def test_empty_selection_raises(raw):
+    with pytest.raises(ValueError, match='no steps selected'):
+        Pipeline('toy', STEPS).run(raw, only=[])
+
+
+def test_unknown_capture_raises(raw):
+    with pytest.raises(ValueError, match='cannot capture'):
+        Pipeline('toy', STEPS).run(raw, stop='remove_flagged', capture=['add_total'])
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_capture_matches_separate_runs(raw, tmp_path, cached):
+    cache = pipeline_cache(str(tmp_path)) if cached else None
+    if cached:
+        Pipeline('toy', STEPS, cache=cache).run(raw)
+
+    pipeline = Pipeline('toy', STEPS, cache=cache)
+    result = pipeline.run(raw, capture=['remove_flagged', 'add_total'])
+
+    pd.testing.assert_frame_equal(result, Pipeline('toy', STEPS).run(raw))
+    for step in ['remove_flagged', 'add_total']:
+        pd.testing.assert_frame_equal(pipeline.captured[step], Pipeline('toy', STEPS).run(raw, stop=step))
+    # the captured frame is not changed by the category conversion after it
+    assert pipeline.captured['add_total']['Flag'].dtype != 'category'
+
+
+def test_memory_tracking_is_opt_in(raw):
+    pipeline = Pipeline('toy', STEPS)
+    pipeline.run(raw)
+    assert pipeline.metrics['Memory Delta (MB)'].isna().all()
+
+    pipeline = Pipeline('toy', STEPS, track_memory=True)
+    pipeline.run(raw)
+    assert pipeline.metrics['Memory Delta (MB)'].notna().all()
+
+
+def test_cache_keeps_latest_results_per_step(raw, tmp_path):
+    cache = pipeline_cache(str(tmp_path), keep=2)
+    for value in range(4):
+        Pipeline('toy', STEPS, cache=cache).run(raw.assign(Value=raw['Value'] + value))
+
+    for name, *_ in STEPS:
+        assert len(os.listdir(tmp_path / f'toy.{name}')) == 2
+
+    # the latest input is still served from the cache
+    pipeline = Pipeline('toy', STEPS, cache=cache)
+    pipeline.run(raw.assign(Value=raw['Value'] + 3))
+    assert pipeline.metrics['Cached'].tolist() == [True]
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from utils import check_quality
+from utils.cleaning_steps import apply_quality_rules
+
+
+@pytest.fixture
+def deals():
+    return pd.DataFrame({
+        'Id': ['1', '2', None, '4', '5', '6'],
+        'Source': ['Facebook Ads', 'Test', 'Google Ads', 'Test', 'SMM', 'SMM'],
+        'Lost Reason': [None, None, 'Duplicate', None, None, None],
+        'Stage': ['Payment Done', 'Lost', 'Lost', 'Lost', 'Payment Done', 'Lost'],
+        'Created Time': pd.to_datetime(['2024-01-05', '2024-01-01', '2024-01-01', '2024-01-01', '2024-01-01', '2024-01-09']),
+        'Closing Date': pd.to_datetime(['2024-01-02', None, None, None, None, '2024-01-10']),
+    })
+
+
+def test_report_counts_and_samples(deals):
+    _, report = check_quality(deals, 'deals')
+    report = report.set_index('Rule')
+
+    assert report['Violations'].to_dict() == {
+        'missing_id': 1, 'test_source': 2, 'duplicate_lost_reason': 1,
+        'closing_before_created': 1, 'paid_without_closing_date': 1,
+    }
+    assert report.loc['test_source', 'Sample Ids'] == ['2', '4']
+    assert report.loc['closing_before_created', 'Sample Ids'] == ['1']
+    assert report.loc['paid_without_closing_date', 'Sample Ids'] == ['5']
+    assert report.loc['test_source', 'Share (%)'] == round(2 / 6 * 100, 2)
+    assert report.loc['closing_before_created', 'Fix'] == 'custom'
+
+
+def test_samples_are_capped_and_skipped_rules_left_out(deals):
+    _, report = check_quality(deals.drop(columns='Lost Reason'), 'deals', samples=1)
+
+    assert 'duplicate_lost_reason' not in set(report['Rule'])
+    assert report.set_index('Rule').loc['test_source', 'Sample Ids'] == ['2']
+
+
+def test_fix_drops_and_swaps(deals):
+    fixed, _ = check_quality(deals, 'deals', fix=True)
+
+    # test rows, the Duplicate row and the row without Id are dropped in one filter
+    assert fixed['Id'].tolist() == ['1', '5', '6']
+    assert fixed.loc[0, 'Created Time'] == pd.Timestamp('2024-01-02')
+    assert fixed.loc[0, 'Closing Date'] == pd.Timestamp('2024-01-05')
+    # rules without a fix only report
+    assert pd.isna(fixed.loc[4, 'Closing Date'])
+    # the input is left unchanged
+    assert deals.loc[0, 'Created Time'] == pd.Timestamp('2024-01-05')
+
+
+def test_cleaning_step_applies_only_named_rules(deals):
+    cleaned = apply_quality_rules(deals, 'deals', ['test_source'])
+    assert cleaned.index.tolist() == [0, 2, 4, 5]
+
+    with pytest.raises(ValueError, match='Unknown rule'):
+        apply_quality_rules(deals, 'deals', ['no_such_rule'])
@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+from dashboard import data_prep
+from utils import attach_shared_table, read_shared_metadata, write_shared_table
+
+
+def write_workbook(path, stages=('Payment Done', 'Lost', 'Lost')):
+    rows = len(stages)
+    deals = pd.DataFrame({
+        'Id': [str(i) for i in range(rows)],
+        'Stage': list(stages),
+        'Payment Type': ['One Payment'] * rows,
+        'Product': ['Web Developer'] * rows,
+        'Education Type': ['Morning'] * rows,
+        'Created Time': pd.date_range('2024-01-01', periods=rows, freq='20D'),
+        'Closing Date': pd.date_range('2024-02-01', periods=rows, freq='20D'),
+    })
+    with pd.ExcelWriter(path) as writer:
+        deals.to_excel(writer, sheet_name='deals', index=False)
+        for sheet in ['calls', 'contacts', 'spend']:
+            pd.DataFrame({'Id': ['1']}).to_excel(writer, sheet_name=sheet, index=False)
+
+
+def load(path, tmp_path, monkeypatch):
+    """Load the shared deals and report whether they were prepared (rather than attached) this time."""
+    prepared = []
+    original = data_prep.prepare_data
+
+    def counting(df):
+        prepared.append(True)
+        return original(df)
+
+    monkeypatch.setattr(data_prep, 'prepare_data', counting)
+    df = data_prep.load_shared_deals(str(path), str(tmp_path / 'deals.arrow'), str(tmp_path / 'cache'))
+    return df, bool(prepared)
+
+
+def test_attached_table_matches_prepared_frame(tmp_path):
+    path = tmp_path / 'data_all.xlsx'
+    write_workbook(path)
+    prepared = data_prep.prepare_data(data_prep.load_data(str(path), cache_dir=str(tmp_path / 'cache'))[0])
+
+    store = write_shared_table(prepared, str(tmp_path / 'deals.arrow'), metadata={'version': 1})
+    attached = attach_shared_table(store)
+
+    assert read_shared_metadata(store) == {'version': '1'}
+    assert list(attached.columns) == list(prepared.columns)
+    for col in prepared.columns:
+        assert attached[col].tolist() == prepared[col].tolist(), col
+
+
+def test_changed_workbook_rebuilds_store(tmp_path, monkeypatch):
+    path = tmp_path / 'data_all.xlsx'
+    write_workbook(path)
+
+    first, prepared = load(path, tmp_path, monkeypatch)
+    assert prepared and first['is_success'].tolist() == [1, 0, 0]
+    _, prepared = load(path, tmp_path, monkeypatch)
+    assert not prepared
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _, prepared = load(path, tmp_path, monkeypatch)
+    assert prepared
+
+    write_workbook(path, stages=('Payment Done', 'Payment Done', 'Lost', 'Lost'))
+    changed, prepared = load(path, tmp_path, monkeypatch)
+    assert prepared and changed['is_success'].tolist() == [1, 1, 0, 0]
@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+
+from utils import snapshot
+
+SHEETS = ['deals', 'calls']
+
+
+def write_workbook(path, rows=3):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'Id': range(rows), 'Stage': ['Lost'] * rows}).to_excel(writer, sheet_name='deals', index=False)
+        pd.DataFrame({'Id': range(rows), 'Call Type': ['Outbound'] * rows}).to_excel(writer, sheet_name='calls', index=False)
+
+
+def read(path, cache_dir, monkeypatch):
+    """Read through the snapshot cache and report whether the workbook was parsed."""
+    parsed = []
+    original = snapshot.read_sheets
+
+    def counting(*args, **kwargs):
+        parsed.append(True)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(snapshot, 'read_sheets', counting)
+    frames = snapshot.read_excel_cached(str(path), SHEETS, cache_dir=str(cache_dir), max_workers=1)
+    return frames, bool(parsed)
+
+
+def test_unchanged_workbook_loads_from_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / 'data_all.xlsx'
+    write_workbook(path)
+
+    first, parsed = read(path, tmp_path / 'cache', monkeypatch)
+    assert parsed
+    second, parsed = read(path, tmp_path / 'cache', monkeypatch)
+    assert not parsed
+    for sheet in SHEETS:
+        pd.testing.assert_frame_equal(first[sheet], second[sheet])
+
+
+def test_new_mtime_rebuilds_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / 'data_all.xlsx'
+    write_workbook(path)
+    read(path, tmp_path / 'cache', monkeypatch)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _, parsed = read(path, tmp_path / 'cache', monkeypatch)
+    assert parsed
+
+
+def test_new_content_rebuilds_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / 'data_all.xlsx'
+    write_workbook(path)
+    read(path, tmp_path / 'cache', monkeypatch)
+
+    write_workbook(path, rows=5)
+    frames, parsed = read(path, tmp_path / 'cache', monkeypatch)
+    assert parsed
+    assert len(frames['deals']) == 5
@@ -0,0 +1,42 @@
+import os
+
+from utils import StageCache, code_version, run_stage
+from utils import stage_cache
+
+
+def stage(value):
+    return value * 2
+
+
+def test_code_version_follows_the_utils_sources(tmp_path, monkeypatch):
+    module = tmp_path / 'cleaners.py'
+    module.write_text('def clean(df):\n    return df\n')
+    monkeypatch.setattr(stage_cache, 'SOURCE_FOLDERS', [str(tmp_path)])
+
+    before = code_version(stage)
+    assert code_version(stage) == before
+
+    module.write_text('def clean(df):\n    return df.dropna()\n')
+    os.utime(module, ns=(1, 1))
+    assert code_version(stage) != before
+
+
+def test_run_stage_recomputes_after_a_utils_change(tmp_path, monkeypatch):
+    module = tmp_path / 'schema.py'
+    module.write_text('IDS = []\n')
+    monkeypatch.setattr(stage_cache, 'SOURCE_FOLDERS', [str(tmp_path)])
+    cache = StageCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return value * 2
+
+    assert run_stage('double', counted, params={'value': 2}, cache=cache) == 4
+    assert run_stage('double', counted, params={'value': 2}, cache=cache) == 4
+    assert len(calls) == 1
+
+    module.write_text("IDS = ['Id']\n")
+    os.utime(module, ns=(1, 1))
+    assert run_stage('double', counted, params={'value': 2}, cache=cache) == 4
+    assert len(calls) == 2
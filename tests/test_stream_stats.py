@@ -0,0 +1,93 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import KLLSketch, StreamingStats, accumulate_chunks, accumulator_table, merge_accumulators, numeric_stats
+
+MOMENTS = ['Count', 'Mean', 'Min', 'Max', 'Range', 'Std Dev', 'CoeffVar (%)', 'Skewness', 'Kurtosis']
+QUANTILES = {'5%': 0.05, '25%': 0.25, '50%': 0.5, '75%': 0.75, '95%': 0.95}
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    n = 120_000
+    df = pd.DataFrame({
+        'lognormal': rng.lognormal(3, 1.5, n),
+        'normal': rng.normal(10, 2, n),
+        'ints': rng.integers(0, 1000, n),
+        'sparse': np.where(rng.random(n) < 0.4, np.nan, rng.exponential(5, n)),
+    })
+    return df
+
+
+def split(df, sizes):
+    bounds = np.cumsum([0, *sizes])
+    return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def rank_error(values, estimate, q):
+    values = np.sort(values[~np.isnan(values)])
+    low = np.searchsorted(values, estimate, 'left') / len(values)
+    high = np.searchsorted(values, estimate, 'right') / len(values)
+    return 0.0 if low <= q <= high else min(abs(low - q), abs(high - q))
+
+
+def partitions(df, parts=3, chunk=7_000):
+    """Accumulators of interleaved chunk partitions, round-tripped through pickle as if built in processes."""
+    chunks = [df.iloc[i:i + chunk] for i in range(0, len(df), chunk)]
+    return [pickle.loads(pickle.dumps(accumulate_chunks(chunks[i::parts], list(df.columns)))) for i in range(parts)]
+
+
+def test_merged_moments_match_numeric_stats(data):
+    merged = accumulator_table(merge_accumulators(partitions(data)))
+    exact = numeric_stats(data)
+    np.testing.assert_allclose(merged[MOMENTS].to_numpy(float), exact[MOMENTS].to_numpy(float), rtol=1e-9)
+
+
+def test_uneven_and_empty_chunks(data):
+    chunks = split(data, [0, 1, 2, 997, 50_000, 0, len(data) - 51_000])
+    result = accumulator_table(accumulate_chunks(chunks, list(data.columns)))
+    exact = numeric_stats(data)
+    np.testing.assert_allclose(result[MOMENTS].to_numpy(float), exact[MOMENTS].to_numpy(float), rtol=1e-9)
+
+
+def test_merge_is_associative(data):
+    a, b, c = (accumulate_chunks([part], list(data.columns)) for part in split(data, [30_000, 50_000, 40_000]))
+    left = merge_accumulators([merge_accumulators([a, b]), c])
+    right = merge_accumulators([a, merge_accumulators([b, c])])
+    # merge_accumulators leaves its inputs unchanged
+    assert a['normal'].count == 30_000
+
+    left, right = accumulator_table(left), accumulator_table(right)
+    np.testing.assert_allclose(left[MOMENTS].to_numpy(float), right[MOMENTS].to_numpy(float), rtol=1e-9)
+    for col in data.columns:
+        for name, q in QUANTILES.items():
+            for table in (left, right):
+                assert rank_error(data[col].to_numpy(float), table.loc[col, name], q) <= 2 / 200
+
+
+@pytest.mark.parametrize('k', [50, 200])
+def test_quantile_rank_error_bound(data, k):
+    sketches = [KLLSketch(k, seed=i) for i in range(4)]
+    values = data['lognormal'].to_numpy()
+    for i, chunk in enumerate(np.array_split(values, 40)):
+        sketches[i % 4].update(chunk)
+    sketch = sketches[0]
+    for other in sketches[1:]:
+        sketch.merge(other)
+
+    assert sketch.count == len(values)
+    assert sum(map(len, sketch.levels)) < 4 * k
+    for q in QUANTILES.values():
+        assert rank_error(values, sketch.quantile(q), q) <= 2 / k
+
+
+def test_exact_quantiles_before_compaction():
+    values = pd.Series(np.random.default_rng(1).normal(size=150))
+    stats = StreamingStats(k=200).update(values[:70]).merge(StreamingStats(k=200).update(values[70:])).result()
+    exact = numeric_stats(values.to_frame('x')).loc['x']
+    for name in ['Median', *QUANTILES]:
+        assert stats[name] == pytest.approx(exact[name], rel=1e-12)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from utils import describe_num, describe_num_chunks, excel_to_parquet, iter_parquet_chunks
+
+
+def test_chunked_profile_of_converted_export(tmp_path):
+    rng = np.random.default_rng(0)
+    raw = pd.DataFrame({
+        'Id': np.arange(1, 101),
+        'Stage': rng.choice(['Lost', 'Payment Done'], 100),
+        'Course duration': rng.choice([6.0, 11.0, np.nan], 100),
+        'Months of study': rng.integers(0, 12, 100).astype(float),
+    })
+    xlsx_path, parquet_path = tmp_path / 'deals.xlsx', tmp_path / 'deals.parquet'
+    raw.to_excel(xlsx_path, index=False)
+
+    assert excel_to_parquet(str(xlsx_path), str(parquet_path), 'deals', chunk_size=30) == len(raw)
+    assert len(list(iter_parquet_chunks(str(parquet_path)))) == 4
+
+    result = describe_num_chunks(iter_parquet_chunks(str(parquet_path)), df_name='deals', show=False, style=False)
+    expected = describe_num(pd.read_parquet(parquet_path), df_name='deals', show=False, style=False)
+
+    assert list(result.index) == ['Course duration', 'Months of study']
+    exact = ['Count', 'Mean', 'Min', 'Max', 'Range', 'Std Dev', 'Skewness']
+    np.testing.assert_allclose(result[exact].to_numpy(float), expected[exact].to_numpy(float), rtol=1e-9)
@@ -3,38 +3,117 @@ Utility package for the IT School Analytics project.
 
 Includes:
 - Logging setup and DataFrame display helpers
-- Data summary and cleaning tools
+- Data summary (exact or sampled with HyperLogLog distinct counts) and cleaning tools
 - Input/output utilities for loading files, saving tables, plots, and datasets
+- Schema registry for the CRM datasets
+- Incremental ingestion of new or changed CRM rows
+- Streaming conversion of raw Excel exports to Parquet row groups
+- Lazy dataset catalog with column projection
+- Content-addressed cache for pipeline stage results
+- City geo enrichment from the cities JSON
+- Entity resolution of contacts and deals with blocking
+- Declarative data-quality rules with violation reports and auto-fixes
+- Declarative cleaning pipelines with per-step metrics, run per dataset in parallel
+- One-pass numeric statistics engine behind the descriptive statistics tables, grouped in one pass
+- Mergeable streaming accumulators (moments, KLL quantile sketch) for out-of-core statistics
+- Space-Saving heavy-hitter summaries for high-cardinality categorical columns
+- Columnar snapshot cache for Excel workbooks and a memory-mapped store shared between processes
 - General helper functions (logging sections, duplicate cleaning)
 """
 
 from .logging_setup import setup_logging, show_df, log_section
-from .data_summary import DataSummary
-from .cleaners import find_duplicates, clean_duplicates, convert_columns, frequent_non_null, clean_amount, normalize_german_level, convert_to_seconds, convert_to_minutes, convert_to_hours
-from .data_io import load_files, save_table_as_png, save_plot, save_clean_data, save_styler_as_png
+from .data_summary import DataSummary, approx_nunique
+from .cleaners import row_hashes, load_hash_index, update_hash_index, prune_hash_index, hash_index_peers, find_duplicates, clean_duplicates, convert_columns, frequent_non_null, fill_group_mode, clean_amount, clean_amount_series, normalize_german_level, normalize_german_levels, convert_to_seconds, convert_to_minutes, convert_to_hours, to_timedelta_mixed, convert_durations
+from .data_io import load_files, save_table_as_png, save_plot, save_clean_data, save_styler_as_png, read_sheets, load_crm_bundle
+from .schema import CRM_SCHEMAS, ID_COLUMNS, get_schema, read_dtypes, apply_schema
+from .shared_store import write_shared_table, read_shared_metadata, attach_shared_table
+from .incremental import detect_changes, expand_to_groups, merge_into_store, incremental_clean
+from .snapshot import workbook_fingerprint, read_excel_cached
+from .streaming import excel_to_parquet, iter_parquet_chunks
+from .catalog import Catalog, DatasetHandle
+from .stage_cache import StageCache, hash_frame, code_version, source_version, stage_key, run_stage
+from .geo import GEO_COLUMNS, city_key, load_city_table, enrich_cities
+from .entity_resolution import ENTITY_RULES, resolve_entities
+from .quality_rules import QUALITY_RULES, swap_columns, check_quality
+from .pipeline import Pipeline, pipeline_cache
+from .cleaning_steps import CLEANING_STEPS, build_cleaning_pipeline, clean_crm_bundle
 from .my_palette import get_my_palette, cmap_cornflower, cmap_lime, cmap_tomato, cmap_yellow, cmap_lavender, cmap_neutral
-from .descriptive_stats import describe_num, describe_cat, compare_distributions, plot_change, summarize_category
-from .product_analysis import prod_analysis
+from .stats_engine import NUMERIC_STATS, numeric_stats, grouped_numeric_stats
+from .stream_stats import KLLSketch, StreamingStats, accumulate_chunks, merge_accumulators, accumulator_table
+from .heavy_hitters import SpaceSaving, top_values
+from .descriptive_stats import style_num_stats, style_cat_stats, describe_num, describe_num_chunks, describe_cat, describe_num_by, describe_cat_by, compare_distributions, plot_change, summarize_category
+from .product_analysis import unit_economics, style_unit_economics, prod_analysis
 
 __all__ = [
     'setup_logging',
     'show_df',
     'log_section',
     'DataSummary',
+    'approx_nunique',
+    'row_hashes',
+    'load_hash_index',
+    'update_hash_index',
+    'prune_hash_index',
+    'hash_index_peers',
     'find_duplicates',
     'clean_duplicates',
-    'convert_columns'
+    'convert_columns',
     'frequent_non_null',
+    'fill_group_mode',
     'clean_amount',
+    'clean_amount_series',
     'normalize_german_level',
+    'normalize_german_levels',
     'convert_to_seconds',
     'convert_to_minutes',
     'convert_to_hours',
+    'to_timedelta_mixed',
+    'convert_durations',
     'load_files',
     'save_table_as_png',
     'save_plot',
     'save_clean_data',
     'save_styler_as_png',
+    'read_sheets',
+    'load_crm_bundle',
+    'CRM_SCHEMAS',
+    'ID_COLUMNS',
+    'get_schema',
+    'read_dtypes',
+    'apply_schema',
+    'write_shared_table',
+    'read_shared_metadata',
+    'attach_shared_table',
+    'detect_changes',
+    'expand_to_groups',
+    'merge_into_store',
+    'incremental_clean',
+    'workbook_fingerprint',
+    'read_excel_cached',
+    'excel_to_parquet',
+    'iter_parquet_chunks',
+    'Catalog',
+    'DatasetHandle',
+    'StageCache',
+    'hash_frame',
+    'code_version',
+    'source_version',
+    'stage_key',
+    'run_stage',
+    'GEO_COLUMNS',
+    'city_key',
+    'load_city_table',
+    'enrich_cities',
+    'ENTITY_RULES',
+    'resolve_entities',
+    'QUALITY_RULES',
+    'swap_columns',
+    'check_quality',
+    'Pipeline',
+    'pipeline_cache',
+    'CLEANING_STEPS',
+    'build_cleaning_pipeline',
+    'clean_crm_bundle',
     'get_my_palette',
     'cmap_cornflower',
     'cmap_lime',
@@ -42,10 +121,27 @@ __all__ = [
     'cmap_yellow',
     'cmap_lavender',
     'cmap_neutral',
+    'NUMERIC_STATS',
+    'numeric_stats',
+    'grouped_numeric_stats',
+    'KLLSketch',
+    'StreamingStats',
+    'accumulate_chunks',
+    'merge_accumulators',
+    'accumulator_table',
+    'SpaceSaving',
+    'top_values',
+    'style_num_stats',
+    'style_cat_stats',
     'describe_num',
+    'describe_num_chunks',
     'describe_cat',
+    'describe_num_by',
+    'describe_cat_by',
     'compare_distributions',
     'plot_change',
     'summarize_category',
+    'unit_economics',
+    'style_unit_economics',
     'prod_analysis'
 ]
@@ -0,0 +1,143 @@
+import os
+import logging
+import operator
+import pandas as pd
+
+from .data_io import CLEAN_FORMATS, CRM_DATASETS
+from .schema import apply_schema, read_dtypes
+
+FILTER_OPS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda s, v: s.isin(v),
+    'not in': lambda s, v: ~s.isin(v),
+}
+
+
+class DatasetHandle:
+    """
+    Lazy handle to one dataset file. Columns are read only when a computation asks for them
+    and are memoized, so later sections reuse what earlier ones already loaded.
+    """
+    def __init__(self, name, path, fmt):
+        self.name = name
+        self.path = path
+        self.fmt = fmt
+        self._columns = {}
+        self._all_loaded = False
+
+    def __repr__(self):
+        return f'DatasetHandle({self.name!r}, {self.fmt}, {len(self._columns)} columns loaded)'
+
+    @property
+    def columns(self):
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+
+            return [c for c in pq.read_schema(self.path).names if not c.startswith('__index_level_')]
+        if self.fmt == 'feather':
+            import pyarrow as pa
+
+            with pa.memory_map(self.path, 'r') as source:
+                return pa.ipc.open_file(source).schema.names
+
+        self._load(None)
+        return list(self._columns)
+
+    def _load(self, columns):
+        if self._all_loaded:
+            return
+
+        missing = None if columns is None else [c for c in columns if c not in self._columns]
+        if missing == []:
+            return
+
+        dtype = read_dtypes(self.name)
+        if self.fmt == 'parquet':
+            df = pd.read_parquet(self.path, columns=missing)
+        elif self.fmt == 'feather':
+            df = pd.read_feather(self.path, columns=missing)
+        elif self.fmt == 'csv.gz':
+            df = pd.read_csv(self.path, usecols=missing, dtype=dtype, compression='gzip')
+        else:
+            df = pd.read_excel(self.path, dtype=dtype, engine='openpyxl')
+            missing = None
+
+        df = apply_schema(df, self.name)
+        for col in df.columns:
+            self._columns.setdefault(col, df[col])
+        self._all_loaded = missing is None
+
+        logging.info(f'{self.name}: Loaded {len(df.columns)} columns from {self.path}')
+
+    def select(self, columns=None, where=None):
+        """
+        Return a DataFrame with the requested columns and rows matching all where conditions.
+        where is a list of (column, op, value) tuples; op is one of ==, !=, <, <=, >, >=, in, not in.
+        """
+        where = where or []
+        filter_cols = [col for col, _, _ in where]
+        needed = None if columns is None else list(dict.fromkeys(list(columns) + filter_cols))
+        self._load(needed)
+
+        columns = list(self._columns) if columns is None else list(columns)
+        df = pd.DataFrame({col: self._columns[col] for col in columns})
+
+        if where:
+            mask = pd.Series(True, index=df.index)
+            for col, op, value in where:
+                if op not in FILTER_OPS:
+                    raise ValueError(f'Unknown filter operator {op}. Choose from {list(FILTER_OPS)}.')
+                mask &= FILTER_OPS[op](self._columns[col], value).fillna(False).astype(bool)
+            df = df[mask]
+
+        return df
+
+    def load(self):
+        """
+        Return the full dataset.
+        """
+        return self.select()
+
+
+class Catalog:
+    """
+    Catalog of the CRM datasets in a folder. The format is chosen per dataset:
+    the first existing file among parquet, feather, csv.gz and xlsx, unless fmt is given.
+    """
+    def __init__(self, folder, suffix='_clean', fmt=None, datasets=None):
+        self.folder = folder
+        self.suffix = suffix
+        self.fmt = fmt
+        self.datasets = datasets or CRM_DATASETS
+        self._handles = {}
+
+    def _resolve(self, name):
+        formats = [self.fmt] if self.fmt else ['parquet', 'feather', 'csv.gz', 'xlsx']
+        for fmt in formats:
+            path = os.path.join(self.folder, f'{name}{self.suffix}{CLEAN_FORMATS[fmt]}')
+            if os.path.exists(path):
+                return path, fmt
+        raise FileNotFoundError(f'No file for dataset {name} in {self.folder} (formats: {formats}).')
+
+    def __getitem__(self, name):
+        if name not in self.datasets:
+            raise KeyError(f'Unknown dataset {name}. Choose from {self.datasets}.')
+        if name not in self._handles:
+            path, fmt = self._resolve(name)
+            self._handles[name] = DatasetHandle(name, path, fmt)
+        return self._handles[name]
+
+    def register(self, name, df):
+        """
+        Register an already loaded DataFrame as a dataset, so selections are served from memory.
+        """
+        handle = DatasetHandle(name, None, 'memory')
+        handle._columns = {col: df[col] for col in df.columns}
+        handle._all_loaded = True
+        self._handles[name] = handle
+        return handle
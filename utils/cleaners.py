@@ -1,18 +1,99 @@
+import os
 import re
+import json
+import hashlib
+import inspect
 import logging
 import datetime
 import pandas as pd
 import numpy as np
 
 
-def find_duplicates(df, name, subset=None, ignore_first_col=True):
+def row_hashes(df, subset=None, ignore_first_col=True):
+    """
+    Hash each row over the duplicate-check columns once, so counting, previewing
+    and dropping duplicates reuse the same 64-bit hashes. The missing-value mask is
+    hashed in as a sentinel, so NaN never matches '' or the text 'nan' (as in DataFrame.duplicated).
+    """
+    if subset is None:
+        subset = df.columns[1:] if ignore_first_col else df.columns
+    values = df[list(subset)]
+    parts = pd.DataFrame({
+        'values': pd.util.hash_pandas_object(values, index=False).to_numpy(),
+        'missing': pd.util.hash_pandas_object(values.isna(), index=False).to_numpy(),
+    })
+    return pd.Series(pd.util.hash_pandas_object(parts, index=False).to_numpy(), index=df.index)
+
+
+def load_hash_index(path):
+    """
+    Load the row-hash index of earlier runs (hash, key and kept flag per row), or None if it does not exist.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    index = pd.read_parquet(path)
+    if 'kept' not in index.columns:
+        index['kept'] = True
+    return index
+
+
+def _save_hash_index(index, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    index.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def update_hash_index(path, hashes, keys, kept=None):
+    """
+    Store the row hashes under their keys with a flag for rows kept by the duplicate check,
+    replacing older entries for the same keys.
+    """
+    current = pd.DataFrame({
+        'hash': hashes.values, 'key': keys.astype(str).values,
+        'kept': True if kept is None else np.asarray(kept, dtype=bool),
+    })
+    previous = load_hash_index(path)
+    if previous is not None:
+        current = pd.concat([previous[~previous['key'].isin(current['key'])], current], ignore_index=True)
+
+    _save_hash_index(current, path)
+    return current
+
+
+def prune_hash_index(path, keys):
+    """
+    Keep only the index entries of keys (e.g. the keys still present in the raw export).
+    """
+    index = load_hash_index(path)
+    if index is None:
+        return None
+    index = index[index['key'].isin(keys)]
+    _save_hash_index(index, path)
+    return index
+
+
+def hash_index_peers(path, keys):
+    """
+    Keys of indexed rows sharing a hash with a row of keys, e.g. duplicates dropped in favour of one of them.
+    """
+    index = load_hash_index(path)
+    if index is None:
+        return pd.Index([], dtype=object)
+    hashes = index.loc[index['key'].isin(keys), 'hash']
+    return pd.Index(index.loc[index['hash'].isin(hashes), 'key'].unique()).difference(keys)
+
+
+def find_duplicates(df, name, subset=None, ignore_first_col=True, hashes=None):
     """
     Find and log duplicate rows in a DataFrame.
     """
     if subset is None:
         subset = df.columns[1:] if ignore_first_col else df.columns
+    if hashes is None:
+        hashes = row_hashes(df, subset)
 
-    duplicates = df[df.duplicated(subset=subset, keep=False)]
+    duplicates = df[hashes.duplicated(keep=False).values]
     count = len(duplicates)
 
     logging.info(f'{name}: Found {count} duplicate rows (checked {len(subset)} columns).')
@@ -20,24 +101,43 @@ def find_duplicates(df, name, subset=None, ignore_first_col=True):
     return duplicates
     
 
-def clean_duplicates(df, name, subset=None, ignore_first_col=True, preview=False):
+def clean_duplicates(df, name, subset=None, ignore_first_col=True, preview=False, hashes=None,
+                     index_path=None, key_col=None):
     """
     Remove duplicate rows from a DataFrame and and log summary info.
+    With index_path, rows that duplicate a row kept by an earlier run under a key not in df
+    are removed as well, and the index is updated with every row of df and whether it was kept.
     """
     if subset is None:
         subset = df.columns[1:] if ignore_first_col else df.columns
+    if hashes is None:
+        hashes = row_hashes(df, subset)
 
     before = df.shape[0]
-    duplicates = df[df.duplicated(subset=subset, keep=False)]
-    after = df.drop_duplicates(subset=subset, keep='first').shape[0]
+    keep = ~hashes.duplicated(keep='first').values
+
+    if index_path:
+        keys = df[key_col or df.columns[0]].astype(str)
+        history = load_hash_index(index_path)
+        if history is not None:
+            earlier = history[history['kept'] & ~history['key'].isin(keys)]
+            in_history = hashes.isin(earlier['hash']).values
+            logging.info(f'{name}: {(keep & in_history).sum()} rows duplicate ones kept by earlier runs.')
+            keep &= ~in_history
+
+    after = keep.sum()
     removed = before - after
 
     logging.info(f'{name}: {removed} duplicates removed ({after} rows left)')
 
-    if preview and not duplicates.empty:
+    if preview and removed:
+        duplicates = df[hashes.duplicated(keep=False).values]
         logging.debug(f'Preview of duplicate rows in {name}:\n{duplicates.head(5)}')
 
-    return df.drop_duplicates(subset=subset, keep='first')
+    if index_path:
+        update_hash_index(index_path, hashes, keys, keep)
+
+    return df[keep]
 
 
 def convert_columns(df, datetime_cols=None, category_cols=None):
@@ -78,6 +178,57 @@ def frequent_non_null(x):
     return result
 
 
+def _value_ranks(values):
+    """
+    Rank distinct values in the order Series.mode() sorts them: numbers before strings when mixed.
+    """
+    uniques = pd.Series(values.unique())
+    try:
+        ordered = uniques.sort_values()
+    except TypeError:
+        is_str = uniques.map(type) == str
+        ordered = pd.concat([uniques[~is_str].sort_values(), uniques[is_str].sort_values()])
+    return pd.Series(np.arange(len(ordered)), index=ordered.values)
+
+
+def fill_group_mode(df, by, columns):
+    """
+    Vectorized groupby(by).transform(frequent_non_null).combine_first(df[col]) for several columns:
+    each row takes the most frequent non-null value of its group, rows of groups without one keep their value.
+    Modes come from one count over (group, value) pairs; ties go to the smallest value, as in mode().iloc[0].
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keys = df[by]
+    has_key = keys.notna().all(axis=1)
+
+    for col in columns:
+        if col not in df.columns:
+            logging.warning(f'Column {col} not found — skipped.')
+            continue
+
+        counts = (
+            df.loc[has_key & df[col].notna(), by + [col]]
+            .groupby(by + [col], sort=False, observed=True)
+            .size()
+            .reset_index(name='_count')
+        )
+        counts['_rank'] = counts[col].map(_value_ranks(counts[col]))
+        modes = (
+            counts
+            .sort_values(['_count', '_rank'], ascending=[False, True])
+            .drop_duplicates(by)[by + [col]]
+        )
+
+        group_mode = keys.merge(modes, on=by, how='left')[col]
+        group_mode.index = df.index
+
+        before_missing = df[col].isna().sum()
+        df[col] = group_mode.combine_first(df[col])
+        logging.info(f'Filled {before_missing - df[col].isna().sum()} missing values in {col}')
+
+    return df
+
+
 def clean_amount(value):
     """
     Convert amount strings to to float.
@@ -99,6 +250,40 @@ def clean_amount(value):
     return pd.to_numeric(value, errors='coerce')
 
 
+def clean_amount_series(series):
+    """
+    Vectorized clean_amount for a whole column: the same separator rules,
+    applied with string operations and a single to_numeric pass.
+    """
+    s = pd.Series(series)
+    if pd.api.types.is_bool_dtype(s.dtype) or pd.api.types.is_numeric_dtype(s.dtype):
+        return s.astype(float)
+
+    if isinstance(s.dtype, pd.StringDtype):
+        is_str = s.notna()
+    else:
+        is_str = s.str.len().notna()
+    result = pd.Series(np.nan, index=s.index, dtype=float, name=s.name)
+
+    other = s.notna() & ~is_str
+    if other.any():
+        numbers = pd.to_numeric(s[other], errors='coerce').astype(float)
+        leftover = numbers.isna()
+        numbers[leftover] = s[other][leftover].apply(clean_amount)
+        result[other] = numbers
+
+    if is_str.any():
+        text = s[is_str].astype(str).str.strip().str.replace(r'[^\d,.-]', '', regex=True)
+        has_comma = text.str.contains(',', regex=False)
+        has_dot = text.str.contains('.', regex=False)
+
+        text = text.where(~(has_comma & has_dot), text.str.replace('.', '', regex=False))
+        text = text.str.replace(',', '.', regex=False)
+        result[is_str] = pd.to_numeric(text, errors='coerce').astype(float)
+
+    return result
+
+
 def normalize_german_level(value):
     """
     Determines the German language level (A0–C2)
@@ -253,6 +438,73 @@ def normalize_german_level(value):
     return 'Unknown'
 
 
+def _german_level_rules_version():
+    return hashlib.sha256(inspect.getsource(normalize_german_level).encode()).hexdigest()[:16]
+
+
+def _load_level_cache(cache_path, version):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    if cache.get('version') != version:
+        logging.info('German level rules changed — cached classifications discarded.')
+        return {}
+    return cache['levels']
+
+
+def _save_level_cache(levels, cache_path, version):
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'levels': levels}, f, ensure_ascii=False, indent=4)
+    os.replace(tmp, cache_path)
+
+
+def normalize_german_levels(series, cache_path='data/cache/german_levels.json'):
+    """
+    Batch version of normalize_german_level: each distinct normalised text is classified once,
+    results are kept in a JSON cache reused across runs and mapped back to the column.
+    Returns the levels and a table of values that matched no level (Unknown or None) with their row counts.
+    """
+    version = _german_level_rules_version()
+    cache = _load_level_cache(cache_path, version)
+
+    if isinstance(series.dtype, pd.StringDtype):
+        is_text = series.notna()
+    else:
+        is_text = series.str.len().notna() if series.dtype == object else pd.Series(False, index=series.index)
+    other = ~is_text & series.notna()
+    keys = series[is_text].astype(str).str.strip().str.lower()
+
+    new_keys = [k for k in keys.unique() if k not in cache]
+    for key in new_keys:
+        cache[key] = normalize_german_level(key)
+    if cache_path and new_keys:
+        _save_level_cache(cache, cache_path, version)
+
+    levels = pd.Series('Unknown', index=series.index, dtype=object)
+    levels[is_text] = keys.map(cache)
+    levels[other] = series[other].map(normalize_german_level)
+
+    logging.info(
+        f'German levels: {keys.nunique()} distinct texts in {len(series)} rows, '
+        f'{len(new_keys)} classified, {keys.nunique() - len(new_keys)} taken from cache.'
+    )
+
+    unmatched_rows = is_text & levels.isin(['Unknown', None])
+    unmatched = (
+        series[unmatched_rows]
+        .value_counts()
+        .rename_axis('Level of Deutsch')
+        .reset_index(name='Rows')
+    )
+    if len(unmatched):
+        logging.info(f'{unmatched_rows.sum()} rows ({len(unmatched)} distinct texts) matched no German level.')
+
+    return levels, unmatched
+
+
 def convert_to_seconds(value):
     if pd.isna(value):
         return np.nan
@@ -280,3 +532,34 @@ def convert_to_hours(value):
     elif isinstance(value, datetime.timedelta):
       hour_new = round(value.total_seconds() / 3600, 2)
       return hour_new
+
+
+def to_timedelta_mixed(series):
+    """
+    Normalise a column of datetime.time, timedelta and duration strings to one timedelta64 array.
+    Times of day become the duration since midnight, truncated to whole seconds.
+    """
+    if pd.api.types.is_timedelta64_dtype(series.dtype):
+        return series
+
+    is_time = series.map(type) == datetime.time
+    td = pd.to_timedelta(series.where(~is_time), errors='coerce')
+    if is_time.any():
+        td[is_time] = pd.to_timedelta(series[is_time].astype(str)).dt.floor('s')
+    return td
+
+
+def convert_durations(series):
+    """
+    Convert a mixed time/timedelta/string column to seconds, minutes and hours in one pass.
+    Returns a DataFrame with Seconds, Minutes and Hours columns; hours are rounded to 2 decimals
+    as in convert_to_hours.
+    """
+    seconds = to_timedelta_mixed(series).dt.total_seconds()
+    hours = seconds / 3600
+
+    rounded = hours.round(2)
+    ties = np.isclose((hours * 100) % 1, 0.5)
+    rounded[ties] = hours[ties].map(lambda h: round(h, 2))
+
+    return pd.DataFrame({'Seconds': seconds, 'Minutes': seconds / 60, 'Hours': rounded}, index=series.index)
@@ -0,0 +1,426 @@
+import os
+import time
+import queue
+import logging
+import logging.handlers
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from .cleaners import (
+    row_hashes, find_duplicates, clean_duplicates, convert_columns, fill_group_mode, clean_amount_series,
+    normalize_german_levels, to_timedelta_mixed, convert_durations,
+)
+from .geo import load_city_table, enrich_cities
+from .incremental import INCREMENTAL_KEYS, incremental_clean
+from .pipeline import Pipeline
+from .quality_rules import QUALITY_RULES, check_quality
+
+
+def drop_columns(df, columns):
+    df = df.drop(columns=columns)
+    logging.info(f'Dropped irrelevant columns: {", ".join(columns)}.')
+    return df
+
+
+def remove_duplicates(df, name, ignore_first_col=True, index_path=None):
+    hashes = row_hashes(df, ignore_first_col=ignore_first_col)
+    find_duplicates(df, f'{name}_raw', ignore_first_col=ignore_first_col, hashes=hashes)
+    return clean_duplicates(
+        df, f'{name}_clean', ignore_first_col=ignore_first_col, hashes=hashes, index_path=index_path
+    )
+
+
+def remove_values(df, column, values):
+    """
+    Remove rows whose column value is one of values (e.g. test rows, excluded products).
+    """
+    rows = df[column].isin(values)
+    logging.info(f'Removed {rows.sum()} rows with {column} in {values}. Remaining rows: {(~rows).sum()}')
+    return df[~rows]
+
+
+def apply_quality_rules(df, dataset, rules):
+    """
+    Apply the fixes of the named QUALITY_RULES of dataset, so the cleaning and the quality report
+    share one definition of each violation.
+    """
+    names = [rule['name'] for rule in QUALITY_RULES[dataset]]
+    unknown = [name for name in rules if name not in names]
+    if unknown:
+        raise ValueError(f'Unknown rule {unknown}. Choose from {names}.')
+
+    df, _ = check_quality(df, [rule for rule in QUALITY_RULES[dataset] if rule['name'] in rules], fix=True)
+    return df
+
+
+def fill_unknown(df, columns):
+    columns = [col for col in columns if col in df.columns]
+    df[columns] = df[columns].fillna('Unknown')
+    logging.info(f'Filled missing values in {columns} with Unknown.')
+    return df
+
+
+def replace_with_unknown(df, column, values):
+    df[column] = df[column].replace(values, 'Unknown')
+    logging.info(f'Replaced {values} values in {column} column with Unknown.')
+    return df
+
+
+def fill_missing_with_flag(df, column, flag, value=0, dtype=None):
+    """
+    Fill missing values in column with value and add a boolean flag column marking the filled rows.
+    """
+    df[flag] = df[column].isna()
+    df[column] = df[column].fillna(value)
+    if dtype:
+        df[column] = df[column].astype(dtype)
+    logging.info(f'Filled {df[flag].sum()} missing {column} values with {value} and added flag {flag}.')
+    return df
+
+
+def check_date_order(df, earlier, later, swap=False):
+    """
+    Log rows where earlier is after later; with swap=True exchange the two dates in those rows.
+    """
+    condition = df[earlier] > df[later]
+    logging.info(f'Rows where {earlier} > {later}: {condition.sum()}')
+
+    if swap and condition.any():
+        temp = df.loc[condition, earlier].copy()
+        df.loc[condition, earlier] = df.loc[condition, later]
+        df.loc[condition, later] = temp
+        logging.info(f'Swapped {condition.sum()} rows where {earlier} was later than {later}.')
+
+    return df
+
+
+def clean_amounts(df, columns):
+    for col in columns:
+        before_clean = df[col].copy()
+        df[col] = clean_amount_series(df[col])
+
+        changed = (before_clean != df[col]).sum()
+        logging.info(f'Cleaned and converted {col} — {changed} values changed.')
+    return df
+
+
+def convert_int(df, columns):
+    for col in columns:
+        df[col] = df[col].astype('Int64')
+        logging.info(f'Converted {df[col].notna().sum()} non-null values of {col} to Int64.')
+    return df
+
+
+def remove_empty_duplicates(df):
+    """
+    Remove duplicate Contact Name rows without deal data: empty rows of contacts that have
+    a non-empty row, then duplicate rows whose key fields are all empty.
+    """
+    important_cols = ['Months of study', 'Initial Amount Paid', 'Offer Total Amount', 'Course duration']
+    is_empty = df[important_cols].isna().all(axis=1)
+    group_has_data = is_empty.groupby(df['Contact Name']).transform('all').eq(False)
+
+    to_remove = is_empty & group_has_data
+    logging.info(f'Removed {to_remove.sum()} empty duplicate rows where group has non-empty data.')
+    df = df[~to_remove].copy()
+
+    important_cols += ['Education Type', 'Product', 'Payment Type', 'Campaign']
+    empty_cols = df[important_cols].isna().all(axis=1)
+    duplicates_cols = df['Contact Name'].duplicated(keep=False)
+
+    before = len(df)
+    df = df[~(duplicates_cols & empty_cols)].copy()
+    logging.info(f'Removed {before - len(df)} duplicate rows with empty key fields.')
+    return df
+
+
+def fill_closing_date(df):
+    """
+    Fill missing Closing Date of fully paid deals with Created Time plus the most common
+    deal duration of the product.
+    """
+    df['Product'] = df['Product'].fillna('Unknown')
+    days_diff = (df['Closing Date'] - df['Created Time']).dt.days
+    logging.info(f'Found {(days_diff < 0).sum()} negative Days_Diff values.')
+
+    mode_diff = (
+        days_diff
+        .groupby(df['Product'])
+        .agg(lambda x: x.mode()[0] if not x.mode().empty else np.nan)
+    )
+
+    fill = (
+        df['Closing Date'].isna()
+        & (df['Months of study'] == df['Course duration'])
+        & (df['Stage'] == 'Payment Done')
+    )
+    df.loc[fill, 'Closing Date'] = (
+        df.loc[fill, 'Created Time']
+        + pd.to_timedelta(df.loc[fill, 'Product'].map(mode_diff), unit='D')
+    )
+    logging.info(f'Filled {fill.sum()} missing Closing Date values.')
+    return df
+
+
+def remove_earliest_created(df):
+    """
+    Remove the rows with the earliest Created Time (an outlier date in October 2022).
+    """
+    earliest_date = df['Created Time'].min()
+    rows = df['Created Time'] == earliest_date
+    logging.info(f'Removed {rows.sum()} rows with Created Time = {earliest_date}')
+    return df[~rows]
+
+
+def add_city_geo(df, cities_path='data/clean/cities_updated.json'):
+    """
+    Normalise City names and add Federal state, Country, Latitude and Longitude from the cities JSON.
+    """
+    df['City'] = (
+        df['City']
+        .astype(str)
+        .str.replace('[\u2010\u2011\u2012\u2013\u2014\u2212]', '-', regex=True)
+    )
+
+    city_correction = {
+        'Karl-Liebknecht str. 24, Hildburghausen, Thüringen': 'Thüringen',
+        'Vor Ebersbach 1, 77761 Schiltach': 'Schiltach',
+        'Poland , Gdansk , Al. Grunwaldzka 7, ap. 1a': 'Gdańsk'
+    }
+    df['City'] = df['City'].replace(city_correction)
+    logging.info(f'Normalized City names and applied {len(city_correction)} manual corrections.')
+
+    df, _ = enrich_cities(df, load_city_table(cities_path))
+    logging.info('Added new columns (Federal state, Country, Latitude, Longitude)')
+    return df
+
+
+def swap_amounts(df):
+    check = (
+        (df['Offer Total Amount'] < df['Initial Amount Paid'])
+        | (df['Offer Total Amount'].isna() & df['Initial Amount Paid'].notna())
+    )
+    temp = df.loc[check, 'Offer Total Amount']
+    df.loc[check, 'Offer Total Amount'] = df.loc[check, 'Initial Amount Paid']
+    df.loc[check, 'Initial Amount Paid'] = temp
+
+    logging.info(f'Swapped {check.sum()} rows where Offer Total Amount < Initial Amount Paid.')
+    return df
+
+
+def fill_payment_type(df):
+    """
+    Infer missing Payment Type from the paid and offered amounts.
+    """
+    fill = df['Payment Type'].isna()
+    paid, total = df['Initial Amount Paid'], df['Offer Total Amount']
+
+    no_pay = ((total == 0) & (paid == 0)) | (paid == 0)
+    one_payment = (paid > 0) & (abs(total - paid) <= 400)
+    reservation = (paid > 0) & (paid <= 200)
+    recurring = ~(no_pay | one_payment | reservation)
+
+    df.loc[fill & no_pay, 'Payment Type'] = 'No Payments'
+    df.loc[fill & one_payment, 'Payment Type'] = 'One Payment'
+    df.loc[fill & reservation, 'Payment Type'] = 'Reservation'
+    df.loc[fill & recurring, 'Payment Type'] = 'Recurring Payments'
+    df.loc[fill & df['Payment Type'].isna(), 'Payment Type'] = 'Unknown'
+
+    counts = df.loc[fill, 'Payment Type'].value_counts(dropna=False)
+    logging.info(f'Payment Type counts after filling:\n{counts}')
+    logging.info(f'Filled {fill.sum()} missing Payment Type values.')
+    return df
+
+
+def normalize_levels(df, cache_path='data/cache/german_levels.json'):
+    df['German Level'], _ = normalize_german_levels(df['Level of Deutsch'], cache_path=cache_path)
+    logging.info(f'German Level distribution:\n{df["German Level"].value_counts(dropna=False)}')
+    return df.drop(columns=['Level of Deutsch'])
+
+
+def transform_quality(df):
+    df.loc[df['Quality'].str.fullmatch(r'F', case=False, na=False), 'Quality'] = 'Special'
+
+    df['Quality'] = df['Quality'].str.replace('–', '-', regex=False)
+    df['Quality'] = df['Quality'].str.extract(r'-\s*(.*)')[0].str.strip()
+    df['Quality'] = df['Quality'].fillna('Unknown')
+
+    logging.info(f'Unique values after transformation: {df["Quality"].unique()}')
+    return df
+
+
+def standardize_sla(df):
+    durations = convert_durations(to_timedelta_mixed(df['SLA']))
+    total = len(df)
+
+    for unit in ['Seconds', 'Minutes', 'Hours']:
+        col = f'SLA {unit}'
+        df[col] = durations[unit]
+        missing = df[col].isna().sum()
+        logging.info(f'{col}: Converted {total - missing} rows, failed {missing} ({missing / total:.2%})')
+
+    return df.drop(columns=['SLA'])
+
+
+CLEANING_STEPS = {
+    'calls': [
+        ('drop_irrelevant_columns', drop_columns, {'columns': ['Dialled Number', 'Tag']}),
+        ('remove_duplicates', remove_duplicates, {'name': 'calls'}),
+        ('convert_datetimes', convert_columns, {'datetime_cols': ['Call Start Time']}),
+        ('remove_unlinked_empty_calls', apply_quality_rules, {'dataset': 'calls', 'rules': ['unlinked_empty_call']}),
+        ('fill_call_duration', fill_missing_with_flag,
+         {'column': 'Call Duration (in seconds)', 'flag': 'Is_duration_missing', 'dtype': 'Int64'}),
+        ('fill_outgoing_status', fill_unknown, {'columns': ['Outgoing Call Status']}),
+        ('fill_scheduled', fill_missing_with_flag,
+         {'column': 'Scheduled in CRM', 'flag': 'Is_schedule_missing', 'dtype': 'float'}),
+        ('convert_categories', convert_columns,
+         {'category_cols': ['Call Type', 'Call Status', 'Outgoing Call Status']}),
+    ],
+    'contacts': [
+        ('remove_duplicates', remove_duplicates, {'name': 'contacts'}),
+        ('remove_bool_owners', apply_quality_rules, {'dataset': 'contacts', 'rules': ['bool_owner']}),
+        ('convert_datetimes', convert_columns, {'datetime_cols': ['Created Time', 'Modified Time']}),
+        ('check_created_before_modified', check_date_order, {'earlier': 'Created Time', 'later': 'Modified Time'}),
+    ],
+    'spend': [
+        ('remove_duplicates', remove_duplicates, {'name': 'spend', 'ignore_first_col': False}),
+        ('remove_test_rows', apply_quality_rules, {'dataset': 'spend', 'rules': ['test_source']}),
+        ('remove_zero_rows', apply_quality_rules, {'dataset': 'spend', 'rules': ['all_zero_metrics']}),
+        ('fill_unknown', fill_unknown, {'columns': ['Campaign', 'AdGroup', 'Ad']}),
+        ('clean_amounts', clean_amounts, {'columns': ['Spend']}),
+        ('convert_categories', convert_columns, {'category_cols': ['Source']}),
+    ],
+    'deals': [
+        ('fill_contact_modes', fill_group_mode,
+         {'by': 'Contact Name', 'columns': ['City', 'Level of Deutsch', 'Deal Owner Name']}),
+        ('fill_course_duration', fill_group_mode, {'by': ['Contact Name', 'Product'], 'columns': ['Course duration']}),
+        ('remove_duplicates', remove_duplicates, {'name': 'deals'}),
+        ('remove_duplicate_deals', apply_quality_rules, {'dataset': 'deals', 'rules': ['duplicate_lost_reason']}),
+        ('remove_test_rows', apply_quality_rules, {'dataset': 'deals', 'rules': ['test_source']}),
+        ('drop_missing_ids', apply_quality_rules, {'dataset': 'deals', 'rules': ['missing_id']}),
+        ('remove_products', remove_values, {'column': 'Product', 'values': ['Data Analytics', 'Find yourself in IT']}),
+        ('remove_empty_duplicates', remove_empty_duplicates),
+        ('convert_datetimes', convert_columns, {'datetime_cols': ['Created Time', 'Closing Date']}),
+        ('swap_created_closing', apply_quality_rules, {'dataset': 'deals', 'rules': ['closing_before_created']}),
+        ('fill_closing_date', fill_closing_date),
+        ('remove_earliest_created', remove_earliest_created),
+        ('add_city_geo', add_city_geo),
+        ('clean_amounts', clean_amounts, {'columns': ['Initial Amount Paid', 'Offer Total Amount']}),
+        ('swap_amounts', swap_amounts),
+        ('fill_payment_type', fill_payment_type),
+        ('normalize_levels', normalize_levels),
+        ('transform_quality', transform_quality),
+        ('standardize_sla', standardize_sla),
+        ('fill_unknown', fill_unknown, {'columns': [
+            'Lost Reason', 'Education Type', 'Deal Owner Name', 'Content', 'Term',
+            'Campaign', 'Contact Name', 'Federal state', 'Country',
+        ]}),
+        ('fill_unknown_city', replace_with_unknown,
+         {'column': 'City', 'values': ['-', '', ' ', 'nan', 'NaN', 'None']}),
+        ('fill_unknown_term', replace_with_unknown, {'column': 'Term', 'values': ['_']}),
+        ('convert_int', convert_int,
+         {'columns': ['Course duration', 'Months of study', 'Initial Amount Paid', 'Offer Total Amount']}),
+        ('convert_categories', convert_columns, {'category_cols': [
+            'Stage', 'Quality', 'Source', 'Product', 'Lost Reason', 'Education Type', 'German Level', 'Payment Type',
+        ]}),
+    ],
+}
+
+
+def build_cleaning_pipeline(dataset, params=None, cache=None, track_memory=False):
+    """
+    Build the cleaning pipeline of a CRM dataset from CLEANING_STEPS.
+    params maps step names to parameter overrides, e.g. {'add_city_geo': {'cities_path': path}}.
+    """
+    if dataset not in CLEANING_STEPS:
+        raise ValueError(f'Unknown dataset {dataset}. Choose from {list(CLEANING_STEPS)}.')
+
+    params = params or {}
+    steps = [
+        (name, fn, {**(step[0] if step else {}), **params.get(name, {})})
+        for name, fn, *step in CLEANING_STEPS[dataset]
+    ]
+    return Pipeline(dataset, steps, cache=cache, track_memory=track_memory)
+
+
+def _run_cleaning(dataset, df, params=None, cache=None, state_folder=None, capture=None):
+    """
+    Run the cleaning pipeline of one dataset; with state_folder only new or changed rows are re-cleaned.
+    Returns the clean frame, step metrics and the results of the captured steps.
+    """
+    if state_folder is None:
+        pipeline = build_cleaning_pipeline(dataset, params, cache)
+        return pipeline.run(df, capture=capture), pipeline.metrics, pipeline.captured
+
+    # re-cleaned rows are checked against the rows kept by earlier runs, not only against each other
+    params = dict(params or {})
+    if dataset in INCREMENTAL_KEYS:
+        index_path = os.path.join(state_folder, f'{dataset}_row_hashes.parquet')
+        params['remove_duplicates'] = {'index_path': index_path, **params.get('remove_duplicates', {})}
+    pipeline = build_cleaning_pipeline(dataset, params, cache)
+    cleaned = incremental_clean(df, pipeline, state_folder, capture=capture)
+    return cleaned, pipeline.metrics, pipeline.captured
+
+
+def _clean_dataset(dataset, df, params=None, cache=None, level=None, state_folder=None, capture=None):
+    """
+    Clean one dataset in a worker process. Log records are captured instead of written,
+    so the parent can replay them grouped by dataset.
+    Returns the clean frame, step metrics, captured step results and records.
+    """
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(records)]
+    if level is not None:
+        root.setLevel(level)
+
+    cleaned, metrics, captured = _run_cleaning(dataset, df, params, cache, state_folder, capture)
+
+    logs = []
+    while not records.empty():
+        logs.append(records.get())
+    return cleaned, metrics, captured, logs
+
+
+def clean_crm_bundle(frames, params=None, cache=None, max_workers=None, state_folder=None, capture=None):
+    """
+    Clean several CRM datasets with their pipelines. The datasets are independent, so they are
+    cleaned concurrently in a process pool (largest first); log output is replayed per dataset.
+    params maps a dataset name to its step parameter overrides. With state_folder, datasets with
+    an incremental key re-clean only the rows changed since the previous run (see incremental_clean).
+    capture maps a dataset name to steps whose results are returned for diagnostics, so the raw
+    exports never have to be cleaned a second time.
+    Returns a dict of clean DataFrames, one table of step metrics for all datasets and
+    a dict of captured step results per dataset.
+    """
+    params = params or {}
+    capture = capture or {}
+    start = time.perf_counter()
+    cleaned, metrics, captured = {}, {}, {}
+
+    workers = min(len(frames), max_workers or os.cpu_count() or 1)
+    if workers == 1:
+        for name, df in frames.items():
+            cleaned[name], metrics[name], captured[name] = _run_cleaning(
+                name, df, params.get(name), cache, state_folder, capture.get(name)
+            )
+    else:
+        level = logging.getLogger().getEffectiveLevel()
+        order = sorted(frames, key=lambda name: len(frames[name]), reverse=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                name: pool.submit(
+                    _clean_dataset, name, frames[name], params.get(name), cache, level, state_folder, capture.get(name)
+                )
+                for name in order
+            }
+            for name in frames:
+                cleaned[name], metrics[name], captured[name], logs = futures[name].result()
+                for record in logs:
+                    logging.getLogger().handle(record)
+
+    metrics = pd.concat(metrics, names=['Dataset']).reset_index(level='Dataset').reset_index(drop=True)
+    logging.info(f'CRM bundle: {len(frames)} datasets cleaned in {time.perf_counter() - start:.2f} sec ({workers} workers).')
+
+    return cleaned, metrics, captured
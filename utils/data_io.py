@@ -1,33 +1,250 @@
 import os
+import json
+import time
+import hashlib
 import logging
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .schema import apply_schema, read_dtypes
 import pandas as pd
 import matplotlib.pyplot as plt
 import dataframe_image as dfi
 import textwrap
 
 
-def load_files(base_url, files, target_folder='data/raw'):
+def _file_sha256(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _make_session(pool_size, retries, backoff):
+    """
+    Create a pooled requests session that retries failed requests with exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET']
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _download_file(session, url, path, known, expected_sha=None, chunk_size=1 << 16, timeout=60):
+    """
+    Download one file unless the local copy is current. Returns (status, manifest entry).
+    The body is streamed to a .part file, resumed with a Range request when a partial
+    download exists, and moved into place only after it is complete.
+    """
+    local_sha = _file_sha256(path) if os.path.exists(path) else None
+
+    if local_sha and expected_sha and local_sha == expected_sha:
+        return 'skipped', {**known, 'sha256': local_sha}
+
+    headers = {}
+    if local_sha and known.get('etag') and known.get('sha256') == local_sha:
+        headers['If-None-Match'] = known['etag']
+
+    part_path = f'{path}.part'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if offset and known.get('part_etag'):
+        headers['Range'] = f'bytes={offset}-'
+        headers['If-Range'] = known['part_etag']
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code == 304:
+            return 'not modified', {**known, 'sha256': local_sha}
+        r.raise_for_status()
+
+        etag = r.headers.get('ETag')
+        mode = 'ab' if r.status_code == 206 else 'wb'
+        try:
+            with open(part_path, mode) as file:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+        except requests.RequestException:
+            known['part_etag'] = etag
+            raise
+
+    sha = _file_sha256(part_path)
+    if expected_sha and sha != expected_sha:
+        os.remove(part_path)
+        raise ValueError(f'Checksum mismatch for {url}: expected {expected_sha}, got {sha}')
+
+    os.replace(part_path, path)
+    return 'downloaded', {'etag': etag, 'sha256': sha}
+
+
+def load_files(base_url, files, target_folder='data/raw', checksums=None,
+               max_workers=4, retries=3, backoff=0.5):
     """
     Download Excel files from a given URL and save locally.
+    Files are fetched concurrently through a pooled session with retries. A file is skipped
+    when its local sha256 matches checksums[f] or the server reports its ETag unchanged.
     """
     os.makedirs(target_folder, exist_ok=True)
-    saved_files = []
-    
-    for f in files:
-        url = base_url + f
-        path = os.path.join(target_folder, f)
-        
-        r = requests.get(url)
-        r.raise_for_status()
-        
-        with open(path, 'wb') as file:
-            file.write(r.content)
+    checksums = checksums or {}
+
+    manifest_path = os.path.join(target_folder, '.download_manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    paths = {f: os.path.join(target_folder, f) for f in files}
+    workers = max(1, min(max_workers, len(files)))
+
+    with _make_session(workers, retries, backoff) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            f: pool.submit(
+                _download_file, session, base_url + f, paths[f],
+                manifest.setdefault(f, {}), checksums.get(f)
+            )
+            for f in files
+        }
+        errors = {}
+        for f, future in futures.items():
+            try:
+                status, manifest[f] = future.result()
+            except Exception as e:
+                errors[f] = e
+                logging.error(f'Failed to download {f}: {e}')
+                continue
 
-        logging.info(f'File {f} downloaded to {path}')
-        saved_files.append(path)
+            if status == 'downloaded':
+                logging.info(f'File {f} downloaded to {paths[f]}')
+            else:
+                logging.info(f'File {f} is up to date ({status}) — download skipped.')
 
-    return saved_files
+    tmp = f'{manifest_path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp, manifest_path)
+
+    if errors:
+        raise next(iter(errors.values()))
+
+    return [paths[f] for f in files]
+
+
+CRM_DATASETS = ['calls', 'contacts', 'deals', 'spend']
+
+CLEAN_FORMATS = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv.gz': '.csv.gz',
+}
+
+
+
+def _read_dataset(path, fmt, dtype=None):
+    """
+    Read one dataset file written by save_clean_data and return it with the time it took.
+    """
+    if fmt == 'xlsx':
+        return _read_sheet(path, 0, dtype)
+
+    start = time.perf_counter()
+    if fmt == 'parquet':
+        df = pd.read_parquet(path)
+    elif fmt == 'feather':
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_csv(path, dtype=dtype, compression='gzip')
+    return df, time.perf_counter() - start
+
+
+def _read_sheet(source, sheet, dtype=None):
+    """
+    Parse one sheet from a path or an open ExcelFile and return it with the time it took.
+    """
+    start = time.perf_counter()
+    df = pd.read_excel(source, sheet_name=sheet, dtype=dtype, engine='openpyxl')
+    return df, time.perf_counter() - start
+
+
+def _read_sheet_group(path, sheets, dtypes):
+    """
+    Open the workbook once and parse a group of its sheets; returns sheet -> (DataFrame, seconds).
+    """
+    with pd.ExcelFile(path, engine='openpyxl') as excel:
+        return {sheet: _read_sheet(excel, sheet, dtypes.get(sheet)) for sheet in sheets}
+
+
+def _log_timings(label, timings):
+    for name, elapsed in timings.items():
+        logging.info(f'{label}: {name} loaded in {elapsed:.2f} sec.')
+
+
+def read_sheets(path, sheets=None, dtypes=None, max_workers=1):
+    """
+    Read several sheets of one Excel workbook and return a dict of DataFrames.
+    dtypes maps a sheet name to the dtype argument used for that sheet.
+    The workbook is opened once and only the requested sheets are parsed. With max_workers > 1
+    the sheets are split into one group per worker process, and each worker opens the workbook
+    once for its whole group.
+    """
+    dtypes = dtypes or {}
+
+    if max_workers == 1 or (sheets is not None and len(sheets) == 1):
+        with pd.ExcelFile(path, engine='openpyxl') as excel:
+            sheets = sheets or excel.sheet_names
+            parsed = {sheet: _read_sheet(excel, sheet, dtypes.get(sheet)) for sheet in sheets}
+    else:
+        if sheets is None:
+            with pd.ExcelFile(path, engine='openpyxl') as excel:
+                sheets = excel.sheet_names
+        workers = max(1, min(len(sheets), max_workers or os.cpu_count() or 1))
+        parsed = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            groups = [sheets[i::workers] for i in range(workers)]
+            for result in pool.map(_read_sheet_group, [path] * workers, groups, [dtypes] * workers):
+                parsed.update(result)
+
+    frames = {sheet: parsed[sheet][0] for sheet in sheets}
+    _log_timings(os.path.basename(path), {sheet: parsed[sheet][1] for sheet in sheets})
+    return frames
+
+
+def load_crm_bundle(folder, datasets=None, suffix='_clean', fmt='xlsx', max_workers=None,
+                    categorize=True):
+    """
+    Read the CRM datasets (calls, contacts, deals, spend) from {name}{suffix} files in folder,
+    in any format written by save_clean_data. The files are independent, so they are
+    parsed concurrently, and each one gets its schema applied. Returns a dict of DataFrames.
+    """
+    if fmt not in CLEAN_FORMATS:
+        raise ValueError(f'Unknown format {fmt}. Choose from {list(CLEAN_FORMATS)}.')
+
+    datasets = datasets or CRM_DATASETS
+    paths = {name: os.path.join(folder, f'{name}{suffix}{CLEAN_FORMATS[fmt]}') for name in datasets}
+
+    start = time.perf_counter()
+    frames, timings = {}, {}
+    workers = min(len(datasets), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(_read_dataset, path, fmt, read_dtypes(name))
+            for name, path in paths.items()
+        }
+        for name, future in futures.items():
+            frames[name], timings[name] = future.result()
+            frames[name] = apply_schema(frames[name], name, categorize=categorize)
+
+    _log_timings('CRM bundle', timings)
+    logging.info(f'CRM bundle: {len(frames)} datasets loaded in {time.perf_counter() - start:.2f} sec.')
+    return frames
 
 
 def save_table_as_png(df, name, subfolder=None, folder='figures',
@@ -104,14 +321,53 @@ def save_plot(name, subfolder=None, folder='figures', dpi=300, tight=True, fig=N
     logging.info(f'Plot saved as {path}')
 
 
-def save_clean_data(df, name, folder='data/clean'):
+def save_clean_data(df, name, folder='data/clean', formats='xlsx', dataset=None):
     """
-    Save a cleaned dataset as an Excel file (.xlsx) inside the data/clean folder.
+    Save a cleaned dataset inside the data/clean folder as xlsx, parquet, feather and/or csv.gz.
+    If dataset is given, its schema is applied before writing. The frame is converted to Arrow
+    once for all columnar formats, and every file is written to a temp name and renamed into place.
+    Returns the list of saved paths.
     """
+    formats = [formats] if isinstance(formats, str) else list(formats)
+    unknown = [fmt for fmt in formats if fmt not in CLEAN_FORMATS]
+    if unknown:
+        raise ValueError(f'Unknown format {unknown}. Choose from {list(CLEAN_FORMATS)}.')
+
+    if dataset is not None:
+        df = apply_schema(df, dataset)
+
     os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, f'{name}.xlsx')
-    df.to_excel(path, index=False)
-    logging.info(f'Cleaned dataset saved as {path}')
+    table = None
+    paths = []
+
+    for fmt in formats:
+        path = os.path.join(folder, f'{name}{CLEAN_FORMATS[fmt]}')
+        tmp = os.path.join(folder, f'.{name}.{os.getpid()}.tmp{CLEAN_FORMATS[fmt]}')
+
+        if fmt == 'xlsx':
+            with pd.ExcelWriter(tmp, engine='openpyxl') as writer:
+                df.to_excel(writer, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+
+            if table is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            if fmt == 'parquet':
+                pq.write_table(table, tmp)
+            elif fmt == 'feather':
+                feather.write_feather(table, tmp)
+            else:
+                with pa.CompressedOutputStream(tmp, 'gzip') as out:
+                    pacsv.write_csv(table, out)
+
+        os.replace(tmp, path)
+        paths.append(path)
+        logging.info(f'Cleaned dataset saved as {path}')
+
+    return paths
 
 
 def save_styler_as_png(styler, name, subfolder=None, folder='figures', decimals=None):
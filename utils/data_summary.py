@@ -1,4 +1,123 @@
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+HLL_PRECISION = 12
+
+
+def column_type(series, sample=None):
+    """
+    Describe the kind of a column; for object columns the Python types of the values
+    (of sample, when given) are listed.
+    """
+    dtype = series.dtype
+
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if isinstance(dtype, pd.CategoricalDtype):
+        return f'category ({series.cat.categories.dtype})'
+    if pd.api.types.is_string_dtype(dtype):
+        return 'string'
+    if dtype == object:
+        values = series if sample is None else sample
+        type_names = [t.__name__ for t in values.map(type).dropna().unique()]
+        if len(type_names) == 1:
+            return f'object ({type_names[0]})'
+        return f'object (mixed: {", ".join(type_names)})'
+    return str(dtype)
+
+
+def _mix64(x):
+    """
+    splitmix64 finaliser: spreads the bits of uint64 keys so every bit is usable as hash.
+    """
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_values(series):
+    """
+    64-bit hashes of the non-null values of a column: bit patterns of numbers and datetimes
+    mixed in one vectorized pass, category hashes looked up by code, pandas hashing otherwise.
+    """
+    values = series.dropna()
+    dtype = values.dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        return hash_values(pd.Series(values.cat.categories))[values.cat.codes.to_numpy()]
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype) \
+            or pd.api.types.is_integer_dtype(dtype):
+        return _mix64(values.to_numpy().astype('int64').view(np.uint64))
+    if pd.api.types.is_float_dtype(dtype):
+        return _mix64((values.to_numpy(dtype=float) + 0.0).view(np.uint64))
+
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def approx_nunique(series, precision=HLL_PRECISION):
+    """
+    HyperLogLog estimate of the number of distinct non-null values.
+    The relative standard error is 1.04 / sqrt(2 ** precision), 1.6% for the default precision.
+    """
+    hashes = hash_values(series)
+    if len(hashes) == 0:
+        return 0
+
+    m = 1 << precision
+    rest_bits = 64 - precision
+
+    buckets = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+    rest = hashes & np.uint64((1 << rest_bits) - 1)
+    powers = np.left_shift(np.uint64(1), np.arange(rest_bits, dtype=np.uint64))
+    rank = rest_bits + 1 - np.searchsorted(powers, rest, side='right')
+
+    registers = np.zeros(m, dtype=np.int64)
+    np.maximum.at(registers, buckets, rank)
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(float)))
+    zeros = int((registers == 0).sum())
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+
+    return int(round(estimate))
+
+
+def _sketch_worthy(series, sample):
+    """
+    HyperLogLog pays off for numbers and datetimes of high cardinality: their hashes are one
+    vectorized pass, while an exact hash table would grow with the column. Low-cardinality and
+    text columns are counted exactly, their hash tables stay small or are built by Arrow.
+    """
+    dtype = series.dtype
+    numeric = (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)) \
+        and not isinstance(dtype, pd.CategoricalDtype)
+    return numeric and sample.nunique() > len(sample) // 2
+
+
+def _profile_column(series, positions, precision):
+    """
+    Fast profile of one column: type and sample values from the sampled rows,
+    distinct count from HyperLogLog where it pays off, each with its error bound.
+    """
+    sample = series.iloc[positions] if positions is not None else series
+    if positions is not None and _sketch_worthy(series, sample):
+        nunique = approx_nunique(series, precision)
+        nunique_error = int(np.ceil(2 * 1.04 / np.sqrt(1 << precision) * nunique))
+    else:
+        nunique, nunique_error = series.nunique(), 0
+
+    return {
+        'column_type': column_type(series, sample),
+        'nunique': nunique,
+        'nunique_error': nunique_error,
+        'sample_values': sample.unique()[:5],
+    }
+
 
 class DataSummary:
     """
@@ -8,40 +127,27 @@ class DataSummary:
         self.name = name
         self.df = df
 
-    def summary_info(self):
+    def summary_info(self, mode='exact', sample_size=50000, max_workers=None, seed=0, precision=HLL_PRECISION):
+        """
+        Per-column overview: non-null and null counts, dtype, column type, distinct count and sample values.
+        mode='fast' infers object types and sample values from sample_size uniformly sampled rows and
+        estimates distinct counts of high-cardinality numeric columns with HyperLogLog
+        (nunique_error is the ±95% bound, 0 for exact counts);
+        a type missing from the sample covers less than type_error_pct of the rows (95%).
+        Columns are profiled in a thread pool. Frames up to sample_size rows are profiled exactly.
+        """
+        if mode not in ('exact', 'fast'):
+            raise ValueError(f'Unknown mode {mode}. Choose from [\'exact\', \'fast\'].')
+
         print('Dataset name: ', self.name)
         print(f'Rows: {self.df.shape[0]}, Colums: {self.df.shape[1]}')
 
+        if mode == 'fast':
+            return self._summary_fast(sample_size, max_workers, seed, precision)
+
         col_types = pd.Series({col:self.df[col].dtype for col in self.df.columns})
         col_uniques = pd.Series({col:self.df[col].unique()[:5] for col in self.df.columns})
-
-        column_types = {}
-        for col in self.df.columns:
-            dtype = self.df[col].dtype
-
-            if pd.api.types.is_numeric_dtype(dtype):
-                column_types[col] = 'numeric'
-
-            elif pd.api.types.is_datetime64_any_dtype(dtype):
-                column_types[col] = 'datetime'
-
-            elif pd.api.types.is_categorical_dtype(dtype):
-                cat_dtype = self.df[col].cat.categories.dtype
-                column_types[col] = f'category ({cat_dtype})'
-
-            elif pd.api.types.is_string_dtype(dtype):
-                column_types[col] = 'string'
-
-            elif dtype == object:
-                object_types = self.df[col].map(type).dropna().unique()
-                type_names = [t.__name__ for t in object_types]
-                if len(type_names) == 1:
-                    column_types[col] = f'object ({type_names[0]})'
-                else:
-                    column_types[col] = f'object (mixed: {", ".join(type_names)})'
-
-            else:
-                column_types[col] = str(dtype)
+        column_types = {col: column_type(self.df[col]) for col in self.df.columns}
 
         summary_info = pd.DataFrame ({
             'non_nulls': self.df.count(),
@@ -66,3 +172,34 @@ class DataSummary:
         ]
 
         return summary_info
+
+    def _summary_fast(self, sample_size, max_workers, seed, precision):
+        rows = len(self.df)
+        positions = None
+        if rows > sample_size:
+            positions = np.sort(np.random.default_rng(seed).choice(rows, sample_size, replace=False))
+
+        columns = list(self.df.columns)
+        workers = min(len(columns), max_workers or os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            profiles = list(pool.map(
+                lambda col: _profile_column(self.df[col], positions, precision), columns
+            ))
+        profiles = pd.DataFrame(profiles, index=self.df.columns)
+
+        nulls = self.df.isna().sum()
+        sampled = rows if positions is None else sample_size
+
+        summary_info = pd.DataFrame({
+            'non_nulls': rows - nulls,
+            'nulls': nulls,
+            'null_pct': (nulls / rows * 100).round(2) if rows else 0.0,
+            'dtype': self.df.dtypes,
+            'column_type': profiles['column_type'],
+            'nunique': profiles['nunique'],
+            'nunique_error': profiles['nunique_error'],
+            'type_error_pct': 0.0 if positions is None else round(300 / sampled, 2),
+            'sample_values': profiles['sample_values'],
+        })
+
+        return summary_info
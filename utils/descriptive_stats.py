@@ -1,69 +1,135 @@
 import logging
+import itertools
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from IPython.display import display, HTML
-from utils import get_my_palette, cmap_cornflower, cmap_lime, cmap_tomato, cmap_yellow, cmap_lavender, cmap_neutral, save_plot
+from utils import ID_COLUMNS, numeric_stats, grouped_numeric_stats, accumulate_chunks, accumulator_table, approx_nunique, top_values, get_my_palette, cmap_cornflower, cmap_lime, cmap_tomato, cmap_yellow, cmap_lavender, cmap_neutral, save_plot
 
 
-def describe_num(df, df_name='DataFrame', quantiles=True, show=True):
+def style_num_stats(stats_summary):
     """
-    Universal function for descriptive statistics of numeric columns in a DataFrame.
+    Colour-graded Styler for a numeric statistics table.
     """
-    num_cols = df.select_dtypes(include=['int', 'float']).columns
-    if len(num_cols) == 0:
-        logging.warning(f'{df_name}: No numeric columns found.')
-        print('No numeric columns found in this DataFrame.')
-        return None
+    def present(cols):
+        return [col for col in cols if col in stats_summary.columns]
 
-    stats_summary = pd.DataFrame({
-        'Count': df[num_cols].count(),
-        'Mean': df[num_cols].mean(),
-        'Median': df[num_cols].median(),
-        'Mode': [
-            df[c].mode().iloc[0] if not df[c].mode().empty else np.nan
-            for c in num_cols
-        ],
-        'Min': df[num_cols].min(),
-        '5%': df[num_cols].quantile(0.05),
-        '25%': df[num_cols].quantile(0.25),
-        '50%': df[num_cols].quantile(0.5),
-        '75%': df[num_cols].quantile(0.75),
-        '95%': df[num_cols].quantile(0.95),
-        'Max': df[num_cols].max(),
-        'Range': df[num_cols].max() - df[num_cols].min(),
-        'IQR': df[num_cols].quantile(0.75) - df[num_cols].quantile(0.25),
-        'Std Dev': df[num_cols].std(),
-        'CoeffVar (%)': (df[num_cols].std() / df[num_cols].mean()) * 100,
-        'Skewness': df[num_cols].skew(),
-    })
-
-    styled = (
+    return (
     stats_summary.style
         .background_gradient(cmap=cmap_tomato, subset=['Count'], axis=1)
-        .background_gradient(cmap=cmap_cornflower, subset=['Mean', 'Median', 'Mode'], axis=1)
+        .background_gradient(cmap=cmap_cornflower, subset=present(['Mean', 'Median', 'Mode']), axis=1)
         .background_gradient(cmap=cmap_yellow, subset=['Range', 'IQR', 'Std Dev'], axis=1)
         .background_gradient(cmap=cmap_yellow, subset=[ 'CoeffVar (%)', 'Skewness'], axis=0)
-        .background_gradient(cmap=cmap_lime, subset=['Min', 'Max', '5%', '25%', '50%', '75%', '95%'], axis=1)
+        .background_gradient(cmap=cmap_lime, subset=present(['Min', 'Max', '5%', '25%', '50%', '75%', '95%']), axis=1)
         .set_properties(**{'text-align': 'center'})
         .format(precision=2)
     )
+
+
+def style_cat_stats(summary):
+    """
+    Colour-graded Styler for a categorical statistics table.
+    """
+    return (
+        summary.style
+        .background_gradient(cmap=cmap_lavender, subset=['Count', 'Unique'], axis=0)
+        .background_gradient(cmap=cmap_tomato, subset=['Frequency'], axis=0)
+        .background_gradient(cmap=cmap_yellow, subset=['Percent'], axis=0)
+        .set_properties(**{'text-align': 'center'})
+        .format({'Percent': '{:.2f}%'})
+    )
+
+
+def _num_columns(df):
+    """
+    Numeric columns of df; the schema ID columns are identifiers, not measurements.
+    """
+    return df.select_dtypes(include=['int', 'float']).columns.difference(ID_COLUMNS, sort=False)
+
+
+def _cat_columns(df):
+    """
+    Categorical columns of df in frame order: text, categoricals and the schema ID columns.
+    """
+    selected = set(df.select_dtypes(include=['object', 'category', 'string']).columns) | set(ID_COLUMNS)
+    return pd.Index([col for col in df.columns if col in selected])
+
+
+def _cat_values(df, col):
+    """
+    Values of a categorical column; integer IDs are compared as text, as they are read from the files.
+    """
+    series = df[col]
+    if col in ID_COLUMNS and pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype('string')
+    return series
+
+
+def describe_num(df, df_name='DataFrame', quantiles=True, show=True, style=True):
+    """
+    Universal function for descriptive statistics of numeric columns in a DataFrame.
+    The table comes from one sorted pass per column; with style=False it is returned unstyled.
+    """
+    num_cols = _num_columns(df)
+    if len(num_cols) == 0:
+        logging.warning(f'{df_name}: No numeric columns found.')
+        print('No numeric columns found in this DataFrame.')
+        return None
+
+    return _show_num_stats(numeric_stats(df, num_cols), df_name, quantiles, show, style)
+
+
+def describe_num_chunks(chunks, df_name='DataFrame', columns=None, quantiles=True, show=True, style=True):
+    """
+    describe_num for data that does not fit in memory: chunks (e.g. iter_parquet_chunks) are fed
+    into mergeable accumulators. Quantiles come from a KLL sketch (rank error ~1%); Mode is left out.
+    Without columns, the numeric columns of the first chunk are used, ID columns excluded.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if columns is None and first is not None:
+        columns = _num_columns(first)
+    accumulators = accumulate_chunks(itertools.chain([first], chunks) if first is not None else [], columns)
+    if not accumulators:
+        logging.warning(f'{df_name}: No numeric columns found.')
+        print('No numeric columns found in this DataFrame.')
+        return None
+
+    return _show_num_stats(accumulator_table(accumulators), df_name, quantiles, show, style)
+
+
+def _show_num_stats(stats_summary, df_name, quantiles, show, style):
+    stats_summary = stats_summary.drop(columns='Kurtosis')
+    if not quantiles:
+        stats_summary = stats_summary.drop(columns=['5%', '25%', '50%', '75%', '95%'])
+
+    styled = style_num_stats(stats_summary) if style else stats_summary
     if show:
         display(styled)
         display(HTML('<br>'))
 
-    logging.info(f'{df_name}: Processed {len(num_cols)} numeric columns successfully.')
-    logging.info(f'Numeric columns: {", ".join(num_cols)}')
+    logging.info(f'{df_name}: Processed {len(stats_summary)} numeric columns successfully.')
+    logging.info(f'Numeric columns: {", ".join(stats_summary.index)}')
 
     return styled
 
 
-def describe_cat(df, df_name='DataFrame', show=True):
+def _smallest(values):
+    try:
+        return min(values)
+    except TypeError:
+        return values[0]
+
+
+def describe_cat(df, df_name='DataFrame', show=True, top_k=None, style=True):
     """
-    Descriptive statistics for categorical (object/string) columns.
+    Descriptive statistics for categorical (object/string) columns, from one value_counts pass per column.
+    With top_k, counts come from a Space-Saving summary of top_k counters and Unique from HyperLogLog,
+    so memory stays flat however long the tail of rare values is; Frequency is then an upper bound.
+    With style=False the table is returned unstyled.
     """
-    cat_cols = df.select_dtypes(include='object').columns
+    cat_cols = _cat_columns(df)
     if len(cat_cols) == 0:
         logging.warning(f'{df_name}: No categorical columns found.')
         print('No categorical columns found in this DataFrame.')
@@ -71,11 +137,18 @@ def describe_cat(df, df_name='DataFrame', show=True):
 
     data = []
     for col in cat_cols:
-        series = df[col].dropna()
-        count = len(series)
-        unique = series.nunique()
-        mode = series.mode().iloc[0] if not series.mode().empty else np.nan
-        freq = series.value_counts().iloc[0] if not series.value_counts().empty else np.nan
+        values = _cat_values(df, col)
+        if top_k:
+            count = int(values.notna().sum())
+            unique = approx_nunique(values)
+            top = top_values(values, k=1, capacity=top_k)
+            mode, freq = (top['Value'].iloc[0], top['Frequency'].iloc[0]) if len(top) else (np.nan, np.nan)
+        else:
+            counts = values.value_counts()
+            counts = counts[counts > 0]
+            count, unique = int(counts.sum()), len(counts)
+            freq = counts.iloc[0] if unique else np.nan
+            mode = _smallest(list(counts.index[counts.values == freq])) if unique else np.nan
         percent = round((freq / count) * 100, 2) if count > 0 else np.nan
         data.append([count, unique, mode, freq, percent])
 
@@ -85,14 +158,7 @@ def describe_cat(df, df_name='DataFrame', show=True):
         index=cat_cols
     )
 
-    styled = (
-        summary.style
-        .background_gradient(cmap=cmap_lavender, subset=['Count', 'Unique'], axis=0)
-        .background_gradient(cmap=cmap_tomato, subset=['Frequency'], axis=0)
-        .background_gradient(cmap=cmap_yellow, subset=['Percent'], axis=0)
-        .set_properties(**{'text-align': 'center'})
-        .format({'Percent': '{:.2f}%'})
-    )
+    styled = style_cat_stats(summary) if style else summary
     if show:
         display(styled)
         display(HTML('<br>'))
@@ -103,6 +169,78 @@ def describe_cat(df, df_name='DataFrame', show=True):
     return styled
 
 
+def describe_num_by(df, by, columns=None, df_name='DataFrame', quantiles=True, show=True):
+    """
+    describe_num for every group of df.groupby(by), computed in one grouped pass per column.
+    Returns a long table with the group keys, Column, Statistic and Value.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = _num_columns(df.drop(columns=by)) if columns is None else columns
+    if len(columns) == 0:
+        logging.warning(f'{df_name}: No numeric columns found.')
+        print('No numeric columns found in this DataFrame.')
+        return None
+
+    wide = grouped_numeric_stats(df, by, columns).drop(columns='Kurtosis')
+    if not quantiles:
+        wide = wide.drop(columns=['5%', '25%', '50%', '75%', '95%'])
+    summary = wide.rename_axis(columns='Statistic').stack().reset_index(name='Value')
+
+    if show:
+        display(summary)
+        display(HTML('<br>'))
+
+    logging.info(f'{df_name}: Processed {len(columns)} numeric columns by {", ".join(by)} '
+                 f'({wide.index.droplevel("Column").nunique()} groups).')
+    return summary
+
+
+def describe_cat_by(df, by, columns=None, df_name='DataFrame', show=True):
+    """
+    describe_cat for every group of df.groupby(by), from one grouped value_counts pass per column.
+    Returns a long table with the group keys, Column, Statistic and Value.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = _cat_columns(df.drop(columns=by)) if columns is None else columns
+    if len(columns) == 0:
+        logging.warning(f'{df_name}: No categorical columns found.')
+        print('No categorical columns found in this DataFrame.')
+        return None
+
+    keys = df.groupby(by, sort=True, observed=True).size().index
+    group_keys = [df[key] for key in by]
+    tables = {}
+    for col in columns:
+        values = _cat_values(df, col)
+        counts = values.groupby(group_keys, sort=True, observed=True).value_counts().reset_index(name='Frequency')
+        counts = counts[counts['Frequency'] > 0]
+        groups = counts.groupby(by, sort=True, observed=True)
+        count = groups['Frequency'].sum()
+        freq = groups['Frequency'].max()
+        top = counts[counts['Frequency'] == groups['Frequency'].transform('max')]
+        mode = top.groupby(by, sort=True, observed=True)[col].agg(lambda values: _smallest(list(values)))
+
+        table = pd.DataFrame({
+            'Count': count,
+            'Unique': groups.size(),
+            'Mode': mode,
+            'Frequency': freq,
+            'Percent': (freq / count * 100).round(2),
+        }).reindex(keys)
+        table[['Count', 'Unique']] = table[['Count', 'Unique']].fillna(0)
+        tables[col] = table
+
+    wide = pd.concat(tables, names=['Column']).reorder_levels(by + ['Column']).sort_index(level=by, sort_remaining=False)
+    summary = wide.rename_axis(columns='Statistic').stack().reset_index(name='Value')
+
+    if show:
+        display(summary)
+        display(HTML('<br>'))
+
+    logging.info(f'{df_name}: Processed {len(columns)} categorical columns by {", ".join(by)} ({len(keys)} groups).')
+    return summary
+
+
 def compare_distributions(df, col_original, col_transformed, df_name='DataFrame'):
     """
     Compare descriptive statistics before and after transformation.
@@ -111,23 +249,15 @@ def compare_distributions(df, col_original, col_transformed, df_name='DataFrame'
         logging.warning(f'{df_name}: Columns not found ({col_original}, {col_transformed})')
         return None
 
-    orig = df[col_original].dropna()
-    trans = df[col_transformed].dropna()
-
-    compare = pd.DataFrame({
-        'Mean': [orig.mean(), trans.mean()],
-        'Median': [orig.median(), trans.median()],
-        'Std Dev': [orig.std(), trans.std()],
-        'IQR': [
-            orig.quantile(0.75) - orig.quantile(0.25),
-            trans.quantile(0.75) - trans.quantile(0.25)
-        ],
-        'Range': [orig.max() - orig.min(), trans.max() - trans.min()],
-        'CoeffVar (%)': [(orig.std() / orig.mean()) * 100,
-                         (trans.std() / trans.mean()) * 100],
-        'Skewness': [orig.skew(), trans.skew()],
-        'Kurtosis': [orig.kurt(), trans.kurt()],
-    }, index=['Original', 'Log'])
+    return _compare_table(numeric_stats(df, [col_original, col_transformed]), col_original, col_transformed, df_name)
+
+
+def _compare_table(stats, col_original, col_transformed, df_name):
+    compare = stats.loc[
+        [col_original, col_transformed],
+        ['Mean', 'Median', 'Std Dev', 'IQR', 'Range', 'CoeffVar (%)', 'Skewness', 'Kurtosis']
+    ]
+    compare.index = ['Original', 'Log']
 
     logging.info(f'{df_name}: Compared distributions ({col_original} → {col_transformed}).')
     return compare.round(2)
@@ -0,0 +1,139 @@
+import logging
+import numpy as np
+import pandas as pd
+
+ENTITY_RULES = {
+    'deals': [
+        {'block': ['Contact Name'], 'compare': []},
+        {'block': ['Deal Owner Name', 'Created Time'], 'bucket': {'Created Time': 'h'},
+         'compare': ['Product', 'City', 'Campaign', 'Source', 'Offer Total Amount'],
+         'min_agreement': 1.0, 'min_compared': 3},
+    ],
+}
+
+
+def normalize_key(series, bucket=None):
+    """
+    Normalise a blocking or comparison column: datetimes are floored to the bucket frequency,
+    text is lower-cased with whitespace collapsed and a trailing '.0' of numeric IDs removed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.dt.to_period(bucket).dt.start_time if bucket else series
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+
+    text = series.astype('string').str.strip().str.lower()
+    text = text.str.replace(r'\s+', ' ', regex=True).str.replace(r'\.0$', '', regex=True)
+    return text.mask(text.isin(['', 'nan', 'none', 'unknown']))
+
+
+def _block_ids(df, rule):
+    keys = pd.DataFrame({
+        col: normalize_key(df[col], rule.get('bucket', {}).get(col))
+        for col in rule['block']
+    })
+    complete = keys.notna().all(axis=1).values
+    ids = np.full(len(df), -1)
+    ids[complete] = keys[complete].groupby(list(keys.columns), sort=False, observed=True).ngroup().values
+    return ids
+
+
+def _candidate_pairs(block_ids, max_block_size):
+    """
+    All pairs of row positions sharing a block, from one self-merge on the block ID.
+    Blocks larger than max_block_size are skipped.
+    """
+    positions = np.flatnonzero(block_ids >= 0)
+    rows = pd.DataFrame({'block': block_ids[positions], 'pos': positions})
+    sizes = rows.groupby('block')['pos'].transform('size')
+
+    oversized = sizes > max_block_size
+    if oversized.any():
+        logging.warning(
+            f'Skipped {rows.loc[oversized, "block"].nunique()} blocks larger than '
+            f'{max_block_size} rows ({oversized.sum()} rows).'
+        )
+    rows = rows[~oversized & (sizes > 1)]
+
+    pairs = rows.merge(rows, on='block', suffixes=('_left', '_right'))
+    pairs = pairs[pairs['pos_left'] < pairs['pos_right']]
+    return pairs['pos_left'].values, pairs['pos_right'].values
+
+
+def _leader_pairs(block_ids):
+    """
+    Link every row of a block to the block's first row: enough when the block key alone decides a match.
+    """
+    positions = np.flatnonzero(block_ids >= 0)
+    leaders = pd.Series(positions).groupby(block_ids[positions]).transform('first').values
+    linked = leaders != positions
+    return leaders[linked], positions[linked]
+
+
+def _matching_pairs(df, left, right, rule):
+    compared = np.zeros(len(left), dtype=int)
+    agreed = np.zeros(len(left), dtype=int)
+
+    for col in rule['compare']:
+        values = normalize_key(df[col]).to_numpy(dtype=object, na_value=None)
+        a, b = values[left], values[right]
+        both = (pd.notna(a) & pd.notna(b))
+        compared += both
+        agreed += both & (a == b)
+
+    ratio = np.divide(agreed, compared, out=np.zeros(len(left)), where=compared > 0)
+    match = (compared >= rule.get('min_compared', 1)) & (ratio >= rule.get('min_agreement', 1.0))
+    return left[match], right[match]
+
+
+def _connected_components(n, left, right):
+    """
+    Cluster labels from matched pairs: min-label propagation with pointer jumping.
+    """
+    labels = np.arange(n)
+    while True:
+        smallest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, smallest)
+        np.minimum.at(updated, right, smallest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def resolve_entities(df, rules, max_block_size=200):
+    """
+    Cluster rows that refer to the same entity. Each rule is one blocking pass: rows are grouped
+    by the normalised block columns (datetimes bucketed by rule['bucket']) and only pairs inside
+    a block are compared on rule['compare'] columns. A pair matches when at least min_compared
+    columns are filled in both rows and the share of agreeing ones reaches min_agreement;
+    with no compare columns the block key alone is a match. rules may be a dataset name from ENTITY_RULES.
+    Returns a Series of cluster IDs aligned with df.
+    """
+    if isinstance(rules, str):
+        if rules not in ENTITY_RULES:
+            raise ValueError(f'Unknown dataset {rules}. Choose from {list(ENTITY_RULES)}.')
+        rules = ENTITY_RULES[rules]
+
+    lefts, rights = [], []
+    for rule in rules:
+        block_ids = _block_ids(df, rule)
+        if rule['compare']:
+            left, right = _candidate_pairs(block_ids, max_block_size)
+            candidates = len(left)
+            left, right = _matching_pairs(df, left, right, rule)
+        else:
+            left, right = _leader_pairs(block_ids)
+            candidates = len(left)
+
+        logging.info(f'Blocking on {rule["block"]}: {candidates} candidate pairs, {len(left)} matched.')
+        lefts.append(left)
+        rights.append(right)
+
+    labels = _connected_components(len(df), np.concatenate(lefts), np.concatenate(rights))
+    clusters = pd.Series(pd.factorize(labels)[0], index=df.index, name='Entity Id')
+
+    merged = len(df) - clusters.nunique()
+    logging.info(f'Resolved {len(df)} rows into {clusters.nunique()} entities ({merged} rows merged).')
+    return clusters
@@ -0,0 +1,91 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+GEO_COLUMNS = {
+    'federal_state': 'Federal state',
+    'country': 'Country',
+    'latitude': 'Latitude',
+    'longitude': 'Longitude',
+}
+
+_CITY_TABLES = {}
+
+_UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue'})
+
+
+def city_key(series):
+    """
+    Join key for city names, used on both sides of the lookup: dash variants, case, whitespace
+    and a trailing ' city' (stripped from the JSON names as well) are ignored, umlauts are
+    transliterated (München, Muenchen) and other accents dropped (Gdańsk, Gdansk).
+    """
+    codes, uniques = pd.factorize(pd.Series(series), use_na_sentinel=True)
+    keys = (
+        pd.Series(uniques, dtype='string')
+        .str.replace('[\u2010\u2011\u2012\u2013\u2014\u2212]', '-', regex=True)
+        .str.casefold()
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+        .str.replace(r' city$', '', regex=True)
+        .map(lambda text: text.translate(_UMLAUTS), na_action='ignore')
+        .str.normalize('NFKD')
+        .str.replace('[\u0300-\u036f]', '', regex=True)
+    )
+    keys = keys.mask(keys.isin(['', 'nan', 'none']))
+    # code -1 (missing) picks the trailing None
+    return pd.Series(np.append(keys.to_numpy(dtype=object), None)[codes], dtype='string')
+
+
+def load_city_table(path='data/clean/cities_updated.json'):
+    """
+    Load the cities JSON into a lookup table indexed by city_key of the city name with the geo columns.
+    The table is built once per file version and reused by later calls.
+    """
+    version = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if version not in _CITY_TABLES:
+        with open(path, 'r', encoding='utf-8') as f:
+            cities = json.load(f)
+
+        table = (
+            pd.DataFrame.from_dict(cities, orient='index')
+            .reindex(columns=list(GEO_COLUMNS))
+            .rename(columns=GEO_COLUMNS)
+        )
+        table.index = pd.Index(city_key(table.index.to_series()).to_numpy(), name='City key')
+        variants = table.index.duplicated()
+        table = table[table.index.notna() & ~variants]
+
+        _CITY_TABLES.clear()
+        _CITY_TABLES[version] = table
+        logging.info(f'Loaded {len(table)} cities from {path} ({variants.sum()} spelling variants merged)')
+
+    return _CITY_TABLES[version]
+
+
+def enrich_cities(df, table, city_col='City'):
+    """
+    Add the geo columns for each row's city in one vectorized lookup on city_key.
+    Returns the enriched DataFrame and a table of unmatched cities with their row counts.
+    """
+    keys = city_key(df[city_col])
+    geo = table.reindex(keys.to_numpy())
+    geo.index = df.index
+    df = df.assign(**{col: geo[col] for col in geo.columns})
+
+    known = keys.notna().to_numpy()
+    unmatched = (
+        df.loc[known & geo.isna().all(axis=1).to_numpy(), city_col]
+        .value_counts()
+        .rename_axis(city_col)
+        .reset_index(name='Rows')
+    )
+    if len(unmatched):
+        logging.info(
+            f'{unmatched["Rows"].sum()} rows ({len(unmatched)} distinct cities) have no geo data, '
+            f'e.g. {unmatched[city_col].head(5).tolist()}'
+        )
+
+    return df, unmatched
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter summary with a fixed number of counters. Each chunk is counted
+    exactly with value_counts and merged into the counters; values that lose their counter leave
+    their count behind as the floor every new value starts from. Counts are upper bounds and
+    never overestimate by more than the value's error, so memory stays at capacity counters
+    however long the tail of rare values grows. Summaries of partitions merge the same way.
+    """
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=float)
+        self.errors = pd.Series(dtype=float)
+        self.floor = 0
+        self.total = 0
+
+    def __repr__(self):
+        return f'SpaceSaving(capacity={self.capacity}, {self.total} values, floor={self.floor})'
+
+    def _merge(self, counts, errors, floor):
+        keys = self.counts.index.union(counts.index, sort=False)
+        merged = (
+            self.counts.reindex(keys, fill_value=self.floor) + counts.reindex(keys, fill_value=floor)
+        ).sort_values(ascending=False, kind='stable')
+        merged_errors = self.errors.reindex(keys, fill_value=self.floor) + errors.reindex(keys, fill_value=floor)
+
+        if len(merged) > self.capacity:
+            self.floor = merged.iloc[self.capacity]
+            merged = merged.iloc[:self.capacity]
+        else:
+            self.floor = self.floor + floor
+
+        self.counts = merged
+        self.errors = merged_errors[merged.index]
+
+    def update(self, values):
+        """
+        Count one chunk of values; missing values are skipped.
+        """
+        values = pd.Series(values).dropna()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+
+        counts = values.value_counts()
+        floor = 0
+        if len(counts) > self.capacity:
+            floor = counts.iloc[self.capacity]
+            counts = counts.iloc[:self.capacity]
+
+        self._merge(counts.astype(float), pd.Series(0.0, index=counts.index), floor)
+        self.total += len(values)
+        return self
+
+    def merge(self, other):
+        self._merge(other.counts, other.errors, other.floor)
+        self.total += other.total
+        return self
+
+    def top(self, k=10):
+        """
+        The k most frequent values with their estimated frequency, percent of all counted values
+        and the maximum overestimate of the frequency.
+        """
+        counts = self.counts.iloc[:k]
+        return pd.DataFrame({
+            'Value': counts.index,
+            'Frequency': counts.values.astype(int),
+            'Percent': (counts.values / self.total * 100).round(2) if self.total else np.nan,
+            'Max Error': self.errors[counts.index].values.astype(int),
+        })
+
+
+def top_values(series, k=10, capacity=None, chunk_size=100_000):
+    """
+    Top-k heavy hitters of a column from a Space-Saving summary fed chunk by chunk.
+    capacity (default 10 * k counters) trades memory for accuracy; Max Error is 0 when the
+    column has no more distinct values than counters.
+    """
+    summary = SpaceSaving(capacity or max(10 * k, 100))
+    for start in range(0, len(series), chunk_size):
+        summary.update(series.iloc[start:start + chunk_size])
+    return summary.top(k)
@@ -0,0 +1,236 @@
+import os
+import glob
+import logging
+import numpy as np
+import pandas as pd
+
+from .cleaners import hash_index_peers, prune_hash_index
+from .stage_cache import code_version, stage_key
+
+# global_from is the first cleaning step that needs the whole dataset (a statistic over all rows,
+# or category dtypes that must cover every row); it and the steps after it run on the merged store.
+INCREMENTAL_KEYS = {
+    'calls': {'key': 'Id', 'modified': None, 'groups': [], 'global_from': 'convert_categories'},
+    'contacts': {'key': 'Id', 'modified': 'Modified Time', 'groups': [], 'global_from': None},
+    'deals': {'key': 'Id', 'modified': None, 'groups': ['Contact Name'], 'global_from': 'fill_closing_date'},
+}
+
+
+def _state_path(name, folder):
+    return os.path.join(folder, f'{name}_ingest_state.parquet')
+
+
+def load_ingest_state(name, folder='data/state'):
+    """
+    Load the fingerprint table saved by the previous run, or None on the first run.
+    """
+    path = _state_path(name, folder)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_ingest_state(state, name, folder='data/state'):
+    """
+    Save the fingerprint table of the current raw export.
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = _state_path(name, folder)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    state.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    logging.info(f'{name}: Ingest state saved as {path} ({state["key"].nunique()} keys)')
+
+
+def row_fingerprints(df, key='Id', modified_col=None):
+    """
+    Fingerprint each row: the Modified Time value if the dataset has one, otherwise a hash of all non-key columns.
+    """
+    if modified_col and modified_col in df.columns:
+        values = df[[modified_col]]
+    else:
+        values = df.drop(columns=[key])
+    return pd.util.hash_pandas_object(values, index=False).astype('uint64')
+
+
+def detect_changes(raw, state, key='Id', modified_col=None, group_cols=()):
+    """
+    Return a mask of rows in the raw export that are new or changed since the saved state,
+    and the state table for the current export (one row per keyed row: key, fingerprint and
+    the group columns). Rows sharing a key are compared together; rows without a key are always new.
+    """
+    fingerprints = row_fingerprints(raw, key=key, modified_col=modified_col)
+    keys = raw[key].astype(str)
+    has_key = raw[key].notna()
+
+    current = pd.DataFrame({'key': keys[has_key].values, 'fingerprint': fingerprints[has_key].values})
+    for col in group_cols:
+        current[col] = raw.loc[has_key, col].values
+
+    if state is None:
+        return pd.Series(True, index=raw.index), current
+
+    now = current.groupby('key', sort=False)['fingerprint'].sum()
+    previous = state.groupby('key', sort=False)['fingerprint'].sum()
+    common = now.index.intersection(previous.index)
+    same = common[now[common].to_numpy() == previous[common].to_numpy()]
+
+    return ~keys.isin(same) | ~has_key, current
+
+
+def expand_to_groups(raw, changed, group_cols, state=None, stale_keys=()):
+    """
+    Extend the changed mask to every row of the groups the changed rows touch, so group-level
+    fills (e.g. Contact Name mode fills) are recomputed only for those groups. With the previous
+    state, the groups that changed or deleted keys (stale_keys) belonged to are touched as well.
+    """
+    mask = changed.copy()
+    for col in group_cols:
+        touched = raw.loc[changed, col]
+        if state is not None and col in state.columns:
+            touched = pd.concat([touched, state.loc[state['key'].isin(stale_keys), col]])
+        mask |= raw[col].isin(touched.unique())
+    return mask
+
+
+def merge_into_store(store, cleaned, raw_keys, processed_keys, key='Id', positions=None):
+    """
+    Replace the rows of processed keys in the clean store with the newly cleaned rows
+    and drop rows whose key no longer exists in the raw export.
+    With positions (raw position per key), the rows are put in raw export order; cleaned rows
+    carry their raw position as index.
+    """
+    store_keys = store[key].astype(str)
+    keep = ~store_keys.isin(processed_keys) & store_keys.isin(raw_keys)
+    parts = [store[keep]] if cleaned is None else [store[keep], cleaned]
+    merged = pd.concat(parts, ignore_index=positions is None)
+
+    if positions is not None:
+        order = np.concatenate([
+            store_keys[keep].map(positions).to_numpy(dtype=float),
+            [] if cleaned is None else cleaned.index.to_numpy(dtype=float),
+        ])
+        merged = merged.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+
+    logging.info(
+        f'Merged {0 if cleaned is None else len(cleaned)} cleaned rows into the store: '
+        f'{(~keep).sum()} replaced or removed, {len(merged)} rows total.'
+    )
+    return merged
+
+
+def _store_path(name, signature, folder):
+    return os.path.join(folder, f'{name}_local_{signature}.pkl')
+
+
+def _save_store(store, name, signature, folder):
+    os.makedirs(folder, exist_ok=True)
+    path = _store_path(name, signature, folder)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    store.to_pickle(tmp)
+    os.replace(tmp, path)
+    for old in glob.glob(_store_path(name, '*', folder)):
+        if old != path:
+            os.remove(old)
+
+
+def _local_signature(pipeline, steps, config):
+    """
+    Version of the stored intermediate: code and parameters of the steps that produced it.
+    """
+    params = {name: params for name, _, params in pipeline.steps if name in steps}
+    version = ''.join(code_version(fn) for name, fn, _ in pipeline.steps if name in steps)
+    return stage_key(f'{pipeline.name}.local', params={'steps': params, 'config': config}, version=version)[:16]
+
+
+def incremental_clean(raw, pipeline, state_folder='data/state', capture=None):
+    """
+    Clean a raw export with pipeline, re-cleaning only the rows that are new or changed since the last run.
+    The steps before the dataset's global_from step are row- or group-local: they run on the changed
+    rows widened to their groups, and the result replaces those keys in a stored intermediate, from which
+    keys missing in the export are dropped. global_from and the steps after it run on the merged intermediate,
+    so the result equals a full rebuild. Without a saved state or a stored intermediate for the same
+    steps, the whole export is cleaned. Returns the clean DataFrame; pipeline.metrics covers both parts.
+    Steps with an index_path (the row-hash index of remove_duplicates) are kept in step with the store:
+    rows sharing a hash with changed or deleted keys are re-cleaned and entries of deleted keys are pruned.
+    capture lists steps to keep in pipeline.captured; results of local steps cover only the re-cleaned rows.
+    """
+    name = pipeline.name
+    capture = capture or []
+    config = INCREMENTAL_KEYS.get(name)
+    if config is None:
+        logging.info(f'{name}: No incremental key — running a full rebuild.')
+        return pipeline.run(raw, capture=capture)
+
+    key = config['key']
+    names = pipeline.step_names
+    split = names.index(config['global_from']) if config['global_from'] else len(names)
+    local_steps, global_steps = names[:split], names[split:]
+    local_capture = [step for step in capture if step in local_steps]
+    global_capture = [step for step in capture if step in global_steps]
+    signature = _local_signature(pipeline, local_steps, config)
+    store_path = _store_path(name, signature, state_folder)
+
+    raw = raw.reset_index(drop=True)
+    state = load_ingest_state(name, state_folder)
+    if state is not None and not set(config['groups']) <= set(state.columns):
+        state = None
+    index_paths = [params['index_path'] for _, _, params in pipeline.steps if params.get('index_path')]
+    store = None
+    if state is not None and os.path.exists(store_path) and all(os.path.exists(path) for path in index_paths):
+        store = pd.read_pickle(store_path)
+
+    changed, current = detect_changes(
+        raw, state if store is not None else None, key=key, modified_col=config['modified'],
+        group_cols=config['groups'],
+    )
+    metrics, captured = [], {}
+
+    if store is None:
+        logging.info(f'{name}: No stored intermediate for these steps — cleaning all {len(raw)} rows.')
+        for path in index_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        local = pipeline.run(raw, only=local_steps, capture=local_capture).reset_index(drop=True)
+        metrics.append(pipeline.metrics)
+        captured.update(pipeline.captured)
+    else:
+        changed_keys = pd.Index(raw.loc[changed, key].dropna().astype(str).unique())
+        deleted_keys = pd.Index(state['key'].unique()).difference(current['key'].unique())
+        stale_keys = changed_keys.union(deleted_keys)
+        raw_keys = raw[key].astype(str)
+        for path in index_paths:
+            # duplicates dropped in favour of a changed or deleted row may have to be kept now
+            peers = hash_index_peers(path, stale_keys)
+            changed = changed | (raw_keys.isin(peers) & raw[key].notna())
+            stale_keys = stale_keys.union(peers)
+            prune_hash_index(path, raw_keys[raw[key].notna()].unique())
+        subset = expand_to_groups(raw, changed, config['groups'], state, stale_keys)
+        logging.info(
+            f'{name}: {changed.sum()} new or changed rows and {len(deleted_keys)} deleted keys out of '
+            f'{len(raw)} rows — re-cleaning {subset.sum()} rows from touched groups.'
+        )
+
+        cleaned = None
+        if subset.any():
+            cleaned = pipeline.run(raw[subset], only=local_steps, capture=local_capture)
+            metrics.append(pipeline.metrics)
+            captured.update(pipeline.captured)
+
+        processed_keys = raw.loc[subset, key].dropna().astype(str).unique()
+        positions = pd.Series(np.arange(len(raw)), index=raw[key].astype(str))
+        positions = positions[~positions.index.duplicated()]
+        local = merge_into_store(store, cleaned, current['key'], processed_keys, key=key, positions=positions)
+
+    result = local
+    if global_steps:
+        result = pipeline.run(local, only=global_steps, capture=global_capture).reset_index(drop=True)
+        metrics.append(pipeline.metrics)
+        captured.update(pipeline.captured)
+
+    _save_store(local, name, signature, state_folder)
+    save_ingest_state(current, name, state_folder)
+
+    pipeline.metrics = pd.concat(metrics, ignore_index=True) if metrics else pd.DataFrame()
+    pipeline.captured = captured
+    return result
@@ -0,0 +1,157 @@
+import time
+import logging
+import pandas as pd
+
+from .stage_cache import StageCache, code_version, hash_frame, stage_key
+
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+class Pipeline:
+    """
+    Ordered, named cleaning steps applied to one DataFrame.
+    Each step is a (name, fn) or (name, fn, params) tuple; fn(df, **params) returns the new DataFrame.
+    Every run records wall time and rows in/out per step in self.metrics; with track_memory the
+    memory delta as well (a deep memory_usage scan of every intermediate, slow on text-heavy frames).
+    """
+    def __init__(self, name, steps, cache=None, track_memory=False):
+        self.name = name
+        self.steps = [(step[0], step[1], step[2] if len(step) > 2 else {}) for step in steps]
+        self.cache = cache
+        self.track_memory = track_memory
+        self.metrics = pd.DataFrame()
+        self.captured = {}
+
+        names = [step[0] for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f'Pipeline {name}: step names must be unique, got {names}.')
+
+    def __repr__(self):
+        return f'Pipeline({self.name!r}, {len(self.steps)} steps)'
+
+    @property
+    def step_names(self):
+        return [name for name, _, _ in self.steps]
+
+    def _index(self, step):
+        if step not in self.step_names:
+            raise ValueError(f'Unknown step {step}. Choose from {self.step_names}.')
+        return self.step_names.index(step)
+
+    def _select(self, start, stop, only):
+        end = self._index(stop) + 1 if stop else len(self.steps)
+        selected = [
+            i for i in range(end)
+            if only is None or self.steps[i][0] in only
+        ]
+        for step in only or []:
+            self._index(step)
+        if not selected:
+            raise ValueError(f'Pipeline {self.name}: no steps selected (stop={stop}, only={only}).')
+
+        first_forced = self._index(start) if start else None
+        return selected, first_forced
+
+    def _cache_name(self, i):
+        return f'{self.name}.{self.steps[i][0]}'
+
+    def _keys(self, df, selected):
+        """
+        Cache keys chained through the selected steps: each key covers the input frame,
+        the code and parameters of the step and every step before it, so no intermediate has to be hashed.
+        """
+        keys = {}
+        previous = hash_frame(df)
+        for i in selected:
+            name, fn, params = self.steps[i]
+            previous = stage_key(f'{self.name}.{name}', [previous], params, code_version(fn))
+            keys[i] = previous
+        return keys
+
+    def run(self, df, start=None, stop=None, only=None, capture=None):
+        """
+        Run the pipeline on df and return the result.
+        start re-runs from that step, reusing cached results of the steps before it;
+        stop ends the run after that step; only runs just the listed steps, in pipeline order.
+        capture lists steps whose results are kept in self.captured (step name to frame),
+        so diagnostics on several intermediates need a single run.
+        Without start, the run resumes after the latest step whose result is cached.
+        """
+        selected, first_forced = self._select(start, stop, only)
+        captured = [self._index(step) for step in capture or []]
+        for i in captured:
+            if i not in selected:
+                raise ValueError(f'Pipeline {self.name}: cannot capture {self.steps[i][0]}, it is not run.')
+        keys = self._keys(df, selected) if self.cache else {}
+
+        resume = None
+        self.captured = {}
+        if self.cache:
+            # a captured step can only be skipped if its result can be loaded from the cache
+            bounds = [i for i in captured if not self.cache.contains(self._cache_name(i), keys[i])]
+            bounds += [first_forced] if first_forced is not None else []
+            candidates = [i for i in selected if not bounds or i < min(bounds)]
+            resume = next((i for i in reversed(candidates) if self.cache.contains(self._cache_name(i), keys[i])), None)
+            for i in captured:
+                if resume is not None and i <= resume:
+                    self.captured[self.steps[i][0]] = self.cache.load(self._cache_name(i), keys[i])
+
+        if start and resume is None and selected[0] < first_forced:
+            logging.info(f'{self.name}: No cached result before step {start} — running the earlier steps.')
+
+        rows = []
+        if resume is not None:
+            t0 = time.perf_counter()
+            df = self.cache.load(self._cache_name(resume), keys[resume])
+            rows.append({
+                'Step': self.steps[resume][0], 'Seconds': round(time.perf_counter() - t0, 3),
+                'Rows In': None, 'Rows Out': len(df), 'Memory Delta (MB)': None, 'Cached': True,
+            })
+            logging.info(f'{self.name}.{self.steps[resume][0]}: Loaded cached result ({len(df)} rows).')
+        else:
+            df = df.copy()
+
+        memory = _memory_mb(df) if self.track_memory else None
+        for i in selected:
+            if resume is not None and i <= resume:
+                continue
+
+            name, fn, params = self.steps[i]
+            rows_in, memory_in = len(df), memory
+            t0 = time.perf_counter()
+
+            df = fn(df, **params)
+
+            seconds = time.perf_counter() - t0
+            delta = None
+            if self.track_memory:
+                memory = _memory_mb(df)
+                delta = round(memory - memory_in, 2)
+            rows.append({
+                'Step': name, 'Seconds': round(seconds, 3), 'Rows In': rows_in, 'Rows Out': len(df),
+                'Memory Delta (MB)': delta, 'Cached': False,
+            })
+            memory_note = f' ({delta:+.2f} MB)' if self.track_memory else ''
+            logging.info(f'{self.name}.{name}: {rows_in} → {len(df)} rows in {seconds:.2f} sec{memory_note}')
+
+            if self.cache:
+                self.cache.save(self._cache_name(i), keys[i], df)
+            if i in captured:
+                # later steps may modify the frame in place
+                self.captured[name] = df.copy()
+
+        self.metrics = pd.DataFrame(rows)
+        total = self.metrics['Seconds'].sum() if rows else 0
+        logging.info(f'{self.name}: Pipeline finished in {total:.2f} sec ({len(df)} rows).')
+
+        return df
+
+
+def pipeline_cache(folder='data/cache/pipelines', keep=2):
+    """
+    Stage cache for pipeline intermediates. Frames are pickled so every dtype round-trips exactly.
+    Results are stored per pipeline step and only the keep most recent ones of each step are retained.
+    """
+    return StageCache(folder, frame_format='pickle', keep=keep)
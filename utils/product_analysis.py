@@ -2,11 +2,15 @@ import pandas as pd
 import numpy as np
 from utils import get_my_palette
 
-def prod_analysis(df_deals, df_contacts, df_spend, product=None):
+def unit_economics(df_deals, df_contacts, df_spend, product=None):
+    """
+    Unit-economics metrics of a product (or the total) and five scenarios with one metric improved by 5%.
+    The input frames are left unchanged.
+    """
     UA = df_contacts['Id'].nunique()
 
-    df_deals['Contact Name'] = df_deals['Contact Name'].astype(str).str.strip()
-    df_contacts['Id'] = df_contacts['Id'].astype(str).str.strip()
+    df_deals = df_deals.assign(**{'Contact Name': df_deals['Contact Name'].astype(str).str.strip()})
+    df_contacts = df_contacts.assign(Id=df_contacts['Id'].astype(str).str.strip())
 
     merged = pd.merge(df_deals, df_contacts, left_on='Contact Name', right_on='Id', how='inner')
 
@@ -81,6 +85,13 @@ def prod_analysis(df_deals, df_contacts, df_spend, product=None):
     scenarios['AC'] = round(scenarios['UA'] * scenarios['CPA'], 2)
     scenarios['CM'] = round(scenarios['UA'] * (scenarios['LTV'] - scenarios['CPA']), 2)
 
+    return scenarios
+
+
+def style_unit_economics(scenarios, product=None):
+    """
+    Styler for a unit_economics table: the improved metric of each scenario and the best CM are highlighted.
+    """
     highlight_color = get_my_palette(group='Yellowsoft')[2]
     max_color = get_my_palette(group='Lavender')[1]
 
@@ -128,3 +139,7 @@ def prod_analysis(df_deals, df_contacts, df_spend, product=None):
     )
 
     return styled
+
+
+def prod_analysis(df_deals, df_contacts, df_spend, product=None):
+    return style_unit_economics(unit_economics(df_deals, df_contacts, df_spend, product), product)
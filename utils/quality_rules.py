@@ -0,0 +1,124 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from .schema import CRM_SCHEMAS
+
+
+def swap_columns(first, second):
+    """
+    Fix that exchanges the values of two columns in the violating rows.
+    """
+    def fix(df, mask):
+        df.loc[mask, [first, second]] = df.loc[mask, [second, first]].values
+        return df
+    return fix
+
+
+QUALITY_RULES = {
+    'calls': [
+        {'name': 'unlinked_empty_call', 'columns': ['CONTACTID', 'Call Duration (in seconds)'],
+         'check': lambda df: df['CONTACTID'].isna() & df['Call Duration (in seconds)'].eq(0),
+         'fix': 'drop'},
+        {'name': 'missing_call_duration', 'columns': ['Call Duration (in seconds)'],
+         'check': lambda df: df['Call Duration (in seconds)'].isna()},
+    ],
+    'contacts': [
+        {'name': 'bool_owner', 'columns': ['Contact Owner Name'],
+         'check': lambda df: df['Contact Owner Name'].isin([True, False]),
+         'fix': 'drop'},
+        {'name': 'modified_before_created', 'columns': ['Created Time', 'Modified Time'],
+         'check': lambda df: df['Created Time'] > df['Modified Time']},
+    ],
+    'spend': [
+        {'name': 'test_source', 'columns': ['Source'],
+         'check': lambda df: df['Source'].eq('Test'),
+         'fix': 'drop'},
+        {'name': 'all_zero_metrics', 'columns': ['Impressions', 'Spend', 'Clicks'],
+         'check': lambda df: df[['Impressions', 'Spend', 'Clicks']].eq(0).all(axis=1),
+         'fix': 'drop'},
+        {'name': 'clicks_above_impressions', 'columns': ['Impressions', 'Clicks'],
+         'check': lambda df: df['Clicks'] > df['Impressions']},
+    ],
+    'deals': [
+        {'name': 'missing_id', 'columns': ['Id'],
+         'check': lambda df: df['Id'].isna(),
+         'fix': 'drop'},
+        {'name': 'test_source', 'columns': ['Source'],
+         'check': lambda df: df['Source'].eq('Test'),
+         'fix': 'drop'},
+        {'name': 'duplicate_lost_reason', 'columns': ['Lost Reason'],
+         'check': lambda df: df['Lost Reason'].eq('Duplicate'),
+         'fix': 'drop'},
+        {'name': 'closing_before_created', 'columns': ['Created Time', 'Closing Date'],
+         'check': lambda df: df['Created Time'] > df['Closing Date'],
+         'fix': swap_columns('Created Time', 'Closing Date')},
+        {'name': 'paid_without_closing_date', 'columns': ['Stage', 'Closing Date'],
+         'check': lambda df: df['Stage'].eq('Payment Done') & df['Closing Date'].isna()},
+    ],
+}
+
+
+def _sample_ids(ids, mask, samples):
+    return ids[np.flatnonzero(mask)[:samples]].tolist()
+
+
+def check_quality(df, rules, fix=False, id_col=None, samples=5):
+    """
+    Evaluate data-quality rules on df. Each rule is a dict with a name, the columns it needs,
+    a vectorized check returning a mask of violating rows and an optional fix: 'drop' or
+    fn(df, mask) returning the fixed frame. Rules whose columns are missing are skipped.
+    All masks are computed once on the input; with fix=True the fixes are applied from them,
+    drops last and in a single filter. rules may be a dataset name from QUALITY_RULES.
+    Returns the (fixed) DataFrame and a report with violation counts and sample row IDs.
+    """
+    if isinstance(rules, str):
+        if rules not in QUALITY_RULES:
+            raise ValueError(f'Unknown dataset {rules}. Choose from {list(QUALITY_RULES)}.')
+        if id_col is None:
+            id_col = next((col for col in CRM_SCHEMAS[rules]['ids'] if col in df.columns), None)
+        rules = QUALITY_RULES[rules]
+
+    ids = (df[id_col] if id_col else df.index.to_series()).to_numpy(dtype=object)
+
+    masks, rows = {}, []
+    for rule in rules:
+        missing = [col for col in rule['columns'] if col not in df.columns]
+        if missing:
+            logging.info(f'Skipped rule {rule["name"]}: missing columns {missing}.')
+            continue
+
+        mask = np.asarray(pd.Series(rule['check'](df)).fillna(False), dtype=bool)
+        masks[rule['name']] = mask
+        fix_name = rule.get('fix') or '-'
+        rows.append({
+            'Rule': rule['name'],
+            'Columns': ', '.join(rule['columns']),
+            'Violations': int(mask.sum()),
+            'Share (%)': round(mask.mean() * 100, 2) if len(mask) else 0.0,
+            'Sample Ids': _sample_ids(ids, mask, samples),
+            'Fix': fix_name if isinstance(fix_name, str) else 'custom',
+        })
+
+    report = pd.DataFrame(rows, columns=['Rule', 'Columns', 'Violations', 'Share (%)', 'Sample Ids', 'Fix'])
+    violated = report.loc[report['Violations'] > 0, 'Rule'].tolist()
+    logging.info(f'Checked {len(report)} rules on {len(df)} rows: {len(violated)} violated {violated}.')
+
+    if fix:
+        df = df.copy()
+        drop = np.zeros(len(df), dtype=bool)
+        for rule in rules:
+            mask = masks.get(rule['name'])
+            if mask is None or not mask.any() or not rule.get('fix'):
+                continue
+            if rule['fix'] == 'drop':
+                drop |= mask
+            else:
+                df = rule['fix'](df, mask)
+                logging.info(f'Fixed {mask.sum()} rows violating {rule["name"]}.')
+
+        if drop.any():
+            df = df[~drop]
+            logging.info(f'Dropped {drop.sum()} rows violating drop rules. Remaining rows: {len(df)}')
+
+    return df, report
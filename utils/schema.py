@@ -0,0 +1,158 @@
+import logging
+import pandas as pd
+
+OWNER_NAMES = [
+    'John Doe', 'Jane Smith', 'Alice Johnson', 'Bob Brown', 'Charlie Davis', 'Diana Evans',
+    'Ethan Harris', 'Fiona Jackson', 'George King', 'Hannah Lee', 'Ian Miller', 'Julia Nelson',
+    'Kevin Parker', 'Laura Quinn', 'Mason Roberts', 'Nina Scott', 'Oliver Taylor',
+    'Paula Underwood', 'Quincy Vincent', 'Rachel White', 'Sam Young', 'Tina Zhang',
+    'Ulysses Adams', 'Victor Barnes', 'Wendy Clark', 'Xander Dean', 'Yara Edwards',
+    'Zachary Foster', 'Amy Green', 'Ben Hall', 'Cara Iverson', 'Derek James', 'Eva Kent',
+    'Unknown'
+]
+
+SOURCES = [
+    'Google Ads', 'Facebook Ads', 'CRM', 'Bloggers', 'Youtube Ads', 'SMM', 'Tiktok Ads',
+    'Organic', 'Telegram posts', 'Webinar', 'Offline', 'Partnership', 'Test', 'Radio'
+]
+
+CRM_SCHEMAS = {
+    'calls': {
+        'ids': ['Id', 'CONTACTID'],
+        'strings': [],
+        'numeric': ['Call Duration (in seconds)', 'Scheduled in CRM'],
+        'datetime': ['Call Start Time'],
+        'category': {
+            'Call Owner Name': OWNER_NAMES,
+            'Call Type': ['Inbound', 'Outbound', 'Missed'],
+            'Call Status': [
+                'Received', 'Attended Dialled', 'Unattended Dialled', 'Missed', 'Cancelled',
+                'Scheduled Unattended', 'Overdue', 'Scheduled Unattended Delay',
+                'Scheduled Attended', 'Scheduled Attended Delay', 'Scheduled'
+            ],
+            'Outgoing Call Status': ['Completed', 'Cancelled', 'Overdue', 'Scheduled', 'Unknown'],
+        },
+    },
+    'contacts': {
+        'ids': ['Id'],
+        'strings': [],
+        'numeric': [],
+        'datetime': ['Created Time', 'Modified Time'],
+        'category': {
+            'Contact Owner Name': OWNER_NAMES,
+        },
+    },
+    'spend': {
+        'ids': [],
+        'strings': [],
+        'numeric': ['Impressions', 'Clicks'],
+        'datetime': ['Date'],
+        'category': {
+            'Source': SOURCES,
+        },
+    },
+    'deals': {
+        'ids': ['Id'],
+        'strings': ['Contact Name'],
+        'numeric': ['Course duration', 'Months of study'],
+        'datetime': ['Created Time', 'Closing Date'],
+        'category': {
+            'Deal Owner Name': OWNER_NAMES,
+            'Quality': [
+                'A - High', 'B - Medium', 'C - Low', 'D - Non Target', 'E - Non Qualified', 'F',
+                'High', 'Medium', 'Low', 'Non Target', 'Non Qualified', 'Special', 'Unknown'
+            ],
+            'Stage': [
+                'Call Delayed', 'Free Education', 'Lost', 'Need a consultation', 'Need To Call',
+                'Need to Call - Sales', 'New Lead', 'Payment Done', 'Qualificated',
+                'Registered on Offline Day', 'Registered on Webinar', 'Test Sent',
+                'Waiting For Payment'
+            ],
+            'Lost Reason': [
+                'Changed Decision', 'Conditions are not suitable',
+                'Considering a different direction in IT', "Didn't leave an application",
+                'Does not know how to use a computer', 'Does not speak English', "Doesn't Answer",
+                'Duplicate', 'Expensive', 'Gutstein refusal', 'Inadequate', 'Invalid number',
+                'needs time to think', 'Next stream', 'Non target', 'Not for myself', 'Refugee',
+                'Stopped Answering', 'The contract did not fit', 'Thought for free',
+                'Went to Rivals', 'Unknown'
+            ],
+            'Source': SOURCES,
+            'Payment Type': ['One Payment', 'Recurring Payments', 'Reservation', 'No Payments', 'Unknown'],
+            'Product': [
+                'Data Analytics', 'Digital Marketing', 'Find yourself in IT', 'UX/UI Design',
+                'Web Developer', 'Unknown'
+            ],
+            'Education Type': ['Morning', 'Evening', 'Unknown'],
+            'German Level': ['A0', 'A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'Unknown'],
+        },
+    },
+}
+
+ID_COLUMNS = list(dict.fromkeys(col for schema in CRM_SCHEMAS.values() for col in schema['ids']))
+
+
+def get_schema(dataset):
+    """
+    Returns the schema of a CRM dataset (calls, contacts, spend, deals).
+    """
+    if dataset not in CRM_SCHEMAS:
+        raise ValueError(f'Unknown dataset {dataset}. Choose from {list(CRM_SCHEMAS.keys())}.')
+    return CRM_SCHEMAS[dataset]
+
+
+def read_dtypes(dataset):
+    """
+    Returns the dtype mapping for pd.read_excel / pd.read_csv: IDs and identifier strings
+    are read as text so long numeric IDs never pass through float.
+    """
+    schema = get_schema(dataset)
+    return {col: str for col in schema['ids'] + schema['strings']}
+
+
+def _to_nullable_id(series):
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype('Int64')
+
+    text = series.astype('string').str.strip()
+    text = text.str.replace(r'\.0$', '', regex=True)
+    valid = text.str.fullmatch(r'\d+').fillna(False).astype(bool)
+
+    invalid = (~valid & text.notna()).sum()
+    if invalid:
+        logging.warning(f'{series.name}: {invalid} non-numeric IDs set to missing.')
+
+    return text.where(valid).astype('Int64')
+
+
+def apply_schema(df, dataset, categorize=True):
+    """
+    Apply the dataset schema in one step: nullable integer IDs, datetimes and categoricals.
+    Values outside a documented category domain are kept and reported.
+    Set categorize=False for frames that are still being edited.
+    """
+    schema = get_schema(dataset)
+    converted = {}
+
+    for col in schema['ids']:
+        if col in df.columns:
+            converted[col] = _to_nullable_id(df[col])
+
+    for col in schema['datetime']:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col].dtype):
+            converted[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True)
+
+    if categorize:
+        for col, domain in schema['category'].items():
+            if col not in df.columns:
+                continue
+            values = df[col].astype('category')
+            unexpected = set(values.cat.categories) - set(domain)
+            if unexpected:
+                logging.warning(f'{dataset}: {col} has values outside the schema domain: {sorted(map(str, unexpected))}')
+            converted[col] = values
+
+    df = df.assign(**converted)
+    logging.info(f'{dataset}: Applied schema to {len(converted)} columns.')
+
+    return df
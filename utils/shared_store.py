@@ -0,0 +1,60 @@
+import os
+import logging
+import pandas as pd
+
+
+def write_shared_table(df, path, metadata=None):
+    """
+    Write a DataFrame to an uncompressed Arrow IPC file that other processes can memory-map.
+    metadata is stored as string key/value pairs in the file schema.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        custom = {str(k).encode(): str(v).encode() for k, v in metadata.items()}
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **custom})
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+    logging.info(f'Shared table saved as {path} ({table.num_rows} rows)')
+    return path
+
+
+def read_shared_metadata(path):
+    """
+    Returns the custom metadata of a shared Arrow file, or an empty dict if it does not exist.
+    """
+    import pyarrow as pa
+
+    if not os.path.exists(path):
+        return {}
+
+    with pa.memory_map(path, 'r') as source:
+        schema = pa.ipc.open_file(source).schema
+
+    return {
+        k.decode(): v.decode()
+        for k, v in (schema.metadata or {}).items()
+        if k != b'pandas'
+    }
+
+
+def attach_shared_table(path):
+    """
+    Memory-map a shared Arrow file and return a DataFrame backed by the mapped pages.
+    Columns use pandas ArrowDtype, so no data is copied and all processes that attach
+    to the same file share it through the OS page cache.
+    """
+    import pyarrow as pa
+
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    logging.info(f'Attached to shared table {path} ({len(df)} rows)')
+    return df
@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+import logging
+import pandas as pd
+
+from .data_io import read_sheets
+
+
+def workbook_fingerprint(path, chunk_size=1 << 20):
+    """
+    Build a cache key for a file from its size, mtime and sha256 content hash.
+    """
+    stat = os.stat(path)
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha.hexdigest()
+    }
+
+
+def _snapshot_dir(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, stem)
+
+
+def load_snapshot(path, sheets, key, cache_dir='data/cache'):
+    """
+    Load sheets from the columnar snapshot of a workbook if its key still matches.
+    Returns None on a cache miss.
+    """
+    snap_dir = _snapshot_dir(path, cache_dir)
+    manifest_path = os.path.join(snap_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('key') != key or not set(sheets) <= set(manifest.get('sheets', [])):
+        logging.info(f'Snapshot for {path} is stale — rebuilding.')
+        return None
+
+    try:
+        frames = {
+            sheet: pd.read_parquet(os.path.join(snap_dir, f'{sheet}.parquet'))
+            for sheet in sheets
+        }
+    except Exception as e:
+        logging.warning(f'Failed to read snapshot for {path}: {e}')
+        return None
+
+    logging.info(f'Loaded {len(frames)} sheets of {path} from snapshot {snap_dir}')
+    return frames
+
+
+def save_snapshot(path, frames, key, cache_dir='data/cache'):
+    """
+    Write each sheet to a Parquet file and record the workbook key in a manifest.
+    Files are written to a temp name and renamed, so concurrent workers never see partial files.
+    """
+    snap_dir = _snapshot_dir(path, cache_dir)
+    os.makedirs(snap_dir, exist_ok=True)
+
+    try:
+        for sheet, df in frames.items():
+            target = os.path.join(snap_dir, f'{sheet}.parquet')
+            tmp = f'{target}.{os.getpid()}.tmp'
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, target)
+
+        manifest_path = os.path.join(snap_dir, 'manifest.json')
+        tmp = f'{manifest_path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'sheets': list(frames)}, f, indent=4)
+        os.replace(tmp, manifest_path)
+    except Exception as e:
+        logging.warning(f'Failed to write snapshot for {path}: {e}')
+        return None
+
+    logging.info(f'Snapshot of {path} saved to {snap_dir}')
+    return snap_dir
+
+
+def read_excel_cached(path, sheets, cache_dir='data/cache', max_workers=None):
+    """
+    Read sheets of an Excel workbook through a Parquet snapshot cache.
+    The workbook is parsed only when its size, mtime or content changed.
+    """
+    key = workbook_fingerprint(path)
+
+    frames = load_snapshot(path, sheets, key, cache_dir=cache_dir)
+    if frames is not None:
+        return frames
+
+    frames = read_sheets(path, sheets, max_workers=max_workers)
+    save_snapshot(path, frames, key, cache_dir=cache_dir)
+
+    return frames
@@ -0,0 +1,195 @@
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import inspect
+import functools
+import logging
+import pandas as pd
+
+from .snapshot import workbook_fingerprint
+
+
+def hash_frame(df):
+    """
+    Content hash of a DataFrame: values, index, column names and dtypes.
+    """
+    sha = hashlib.sha256()
+    sha.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    sha.update(repr(list(df.columns)).encode())
+    sha.update(repr([str(t) for t in df.dtypes]).encode())
+    return sha.hexdigest()
+
+
+def _hash_input(value):
+    if isinstance(value, pd.DataFrame):
+        return hash_frame(value)
+    if isinstance(value, str) and os.path.isfile(value):
+        return workbook_fingerprint(value)['sha256']
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# stage functions call into these modules (apply_schema, the cleaners, ...), so their source is part of every version
+SOURCE_FOLDERS = [os.path.dirname(os.path.abspath(__file__))]
+
+
+@functools.lru_cache(maxsize=8)
+def _hash_sources(stamps):
+    sha = hashlib.sha256()
+    for path, _, _ in stamps:
+        sha.update(path.encode())
+        with open(path, 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def source_version():
+    """
+    Hash of the source of the modules in SOURCE_FOLDERS, re-read only when a file changes.
+    """
+    paths = sorted(
+        os.path.join(folder, file) for folder in SOURCE_FOLDERS for file in os.listdir(folder) if file.endswith('.py')
+    )
+    stamps = tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+    return _hash_sources(stamps)
+
+
+def code_version(fn):
+    """
+    Version of a stage function: a hash of its source code and of the utils modules it depends on.
+    """
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = f'{fn.__module__}.{fn.__qualname__}'
+    return hashlib.sha256((source + source_version()).encode()).hexdigest()[:16]
+
+
+def stage_key(name, inputs=(), params=None, version=''):
+    """
+    Cache key of a stage run: hash of the stage name, its input contents, code version and parameters.
+    """
+    sha = hashlib.sha256(name.encode())
+    for value in inputs:
+        sha.update(_hash_input(value).encode())
+    sha.update(version.encode())
+    sha.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return sha.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed store of stage outputs. DataFrames are kept as Parquet (or pickled
+    with frame_format='pickle', which round-trips any dtype exactly), any other output is pickled.
+    With keep, only the keep most recently saved or loaded results of each stage name are retained.
+    """
+    def __init__(self, folder='data/cache/stages', frame_format='parquet', keep=None):
+        if frame_format not in ('parquet', 'pickle'):
+            raise ValueError(f"Unknown frame format {frame_format}. Choose from ['parquet', 'pickle'].")
+        if keep is not None and keep < 1:
+            raise ValueError(f'keep must be a positive number of results, got {keep}.')
+        self.folder = folder
+        self.frame_format = frame_format
+        self.keep = keep
+
+    def _path(self, name, key):
+        return os.path.join(self.folder, name, key[:32])
+
+    def contains(self, name, key):
+        return os.path.exists(os.path.join(self._path(name, key), 'meta.json'))
+
+    def load(self, name, key):
+        path = self._path(name, key)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if self.keep:
+            # a reused result counts as recent, so pruning drops the results no run asks for
+            os.utime(meta_path)
+
+        if meta['kind'] == 'frame':
+            return pd.read_parquet(os.path.join(path, 'output.parquet'))
+        if meta['kind'] == 'frames':
+            return {
+                part: pd.read_parquet(os.path.join(path, f'{i}.parquet'))
+                for i, part in enumerate(meta['parts'])
+            }
+        with open(os.path.join(path, 'output.pkl'), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, name, key, output):
+        path = self._path(name, key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        os.makedirs(tmp, exist_ok=True)
+
+        try:
+            if isinstance(output, pd.DataFrame) and self.frame_format == 'parquet':
+                output.to_parquet(os.path.join(tmp, 'output.parquet'))
+                meta = {'kind': 'frame'}
+            elif self.frame_format == 'parquet' and isinstance(output, dict) and output and all(isinstance(v, pd.DataFrame) for v in output.values()):
+                for i, df in enumerate(output.values()):
+                    df.to_parquet(os.path.join(tmp, f'{i}.parquet'))
+                meta = {'kind': 'frames', 'parts': list(output)}
+            else:
+                with open(os.path.join(tmp, 'output.pkl'), 'wb') as f:
+                    pickle.dump(output, f)
+                meta = {'kind': 'pickle'}
+
+            with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({**meta, 'stage': name, 'key': key}, f, indent=4)
+
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+        except Exception as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            logging.warning(f'Stage {name}: failed to cache output: {e}')
+            return
+
+        if self.keep:
+            self.prune(name)
+
+    def prune(self, name, keep=None):
+        """
+        Remove all but the keep most recently used results of a stage. Returns the number removed.
+        """
+        keep = keep or self.keep
+        folder = os.path.join(self.folder, name)
+        if not keep or not os.path.isdir(folder):
+            return 0
+
+        entries = []
+        for entry in os.listdir(folder):
+            meta_path = os.path.join(folder, entry, 'meta.json')
+            if not entry.endswith('.tmp') and os.path.exists(meta_path):
+                entries.append((os.path.getmtime(meta_path), entry))
+        stale = sorted(entries, reverse=True)[keep:]
+        for _, entry in stale:
+            shutil.rmtree(os.path.join(folder, entry), ignore_errors=True)
+        if stale:
+            logging.info(f'Stage {name}: removed {len(stale)} old cached results.')
+        return len(stale)
+
+
+def run_stage(name, fn, inputs=(), params=None, version=None, cache=None):
+    """
+    Run fn(**params) unless a result for the same inputs, code version and parameters is cached.
+    inputs are file paths, DataFrames or plain values the stage depends on; only their content is hashed.
+    """
+    cache = cache or StageCache()
+    version = version or code_version(fn)
+    key = stage_key(name, inputs, params, version)
+
+    output = cache.load(name, key)
+    if output is not None:
+        logging.info(f'Stage {name}: inputs unchanged — reused cached result {key[:12]}.')
+        return output
+
+    output = fn(**(params or {}))
+    cache.save(name, key, output)
+    logging.info(f'Stage {name}: computed and cached result {key[:12]}.')
+
+    return output
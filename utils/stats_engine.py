@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+NUMERIC_STATS = [
+    'Count', 'Mean', 'Median', 'Mode', 'Min', '5%', '25%', '50%', '75%', '95%', 'Max',
+    'Range', 'IQR', 'Std Dev', 'CoeffVar (%)', 'Skewness', 'Kurtosis',
+]
+
+
+def _quantile(values, q):
+    """
+    Linear interpolation between the closest ranks of sorted values (pandas' default).
+    """
+    position = (len(values) - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (position - lower) * (values[upper] - values[lower])
+
+
+def _mode(values):
+    """
+    Smallest of the most frequent values, read from the run lengths of sorted values.
+    """
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    return values[starts[np.argmax(counts)]]
+
+
+def moment_stats(n, mean, m2, m3, m4):
+    """
+    Mean, Std Dev, CoeffVar (%), Skewness and Kurtosis from the count, the mean and the sums of
+    the 2nd-4th powers of the deviations from it; scalars or arrays (one entry per group).
+    Skewness and kurtosis use the bias-corrected estimators of pandas.
+    """
+    n, mean, m2, m3, m4 = (np.asarray(value, dtype=float) for value in (n, mean, m2, m3, m4))
+    m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+    m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+        skew = np.where(
+            n < 3, np.nan,
+            np.where(m2 == 0, 0.0, (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)),
+        )
+        denominator = (n - 2) * (n - 3) * m2 ** 2
+        kurt = np.where(
+            n < 4, np.nan,
+            np.where(denominator == 0, 0.0, n * (n + 1) * (n - 1) * m4 / denominator - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))),
+        )
+        coeff_var = np.where(mean != 0, std / mean * 100, np.nan)
+
+    return {
+        'Mean': mean[()],
+        'Std Dev': std[()],
+        'CoeffVar (%)': coeff_var[()],
+        'Skewness': skew[()],
+        'Kurtosis': kurt[()],
+    }
+
+
+def sorted_stats(values, quantiles=QUANTILES):
+    """
+    All statistics of one column from its sorted non-null values: order statistics are read
+    by position (integers stay exact) and the moments come from one pass over the deviations from the mean.
+    """
+    n = len(values)
+    stats = {'Count': n}
+    if n == 0:
+        stats.update({name: np.nan for name in NUMERIC_STATS[1:]})
+        stats.update({f'{q * 100:g}%': np.nan for q in quantiles})
+        return stats
+
+    floats = values.astype(float)
+    mean = floats.sum() / n
+    deviations = floats - mean
+    squared = deviations ** 2
+    moments = moment_stats(n, mean, squared.sum(), (squared * deviations).sum(), (squared ** 2).sum())
+
+    points = {f'{q * 100:g}%': _quantile(values, q) for q in quantiles}
+    q1, q3 = _quantile(values, 0.25), _quantile(values, 0.75)
+
+    stats.update({
+        **moments,
+        'Median': _quantile(values, 0.5),
+        'Mode': _mode(values),
+        'Min': values[0],
+        **points,
+        'Max': values[-1],
+        'Range': values[-1] - values[0],
+        'IQR': q3 - q1,
+    })
+    return stats
+
+
+def numeric_stats(df, columns=None, quantiles=QUANTILES):
+    """
+    Descriptive statistics table of numeric columns, one row per column. Each column is
+    converted and sorted once and every statistic is derived from that sorted array.
+    """
+    columns = df.select_dtypes(include=['int', 'float']).columns if columns is None else columns
+
+    rows = []
+    for col in columns:
+        values = df[col].dropna()
+        values = values.to_numpy(dtype='int64' if pd.api.types.is_integer_dtype(values.dtype) else float)
+        rows.append(sorted_stats(np.sort(values), quantiles))
+
+    order = NUMERIC_STATS[:5] + [f'{q * 100:g}%' for q in quantiles] + NUMERIC_STATS[10:]
+    return pd.DataFrame(rows, index=list(columns), columns=order)
+
+
+def _grouped_column_stats(codes, values, n_groups, quantiles):
+    """
+    Statistics of one column for every group at once: a single lexsort by (group, value)
+    puts each group's sorted values in a contiguous slice, so order statistics are read by
+    position for all groups together and the moment sums come from bincount.
+    """
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    floats = values.astype(float)
+
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    filled = counts > 0
+    last = np.maximum(counts - 1, 0)
+
+    def native(offsets):
+        return values[np.minimum(starts + offsets, len(values) - 1)] if len(values) else np.zeros(n_groups)
+
+    def at(offsets):
+        return np.where(filled, native(offsets), np.nan)
+
+    def quantile(q):
+        position = last * q
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, last)
+        low, high = at(lower).astype(float), at(upper).astype(float)
+        return low + (position - lower) * (high - low)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.bincount(codes, weights=floats, minlength=n_groups) / counts
+    deviations = floats - means[codes]
+    squared = deviations ** 2
+    m2 = np.bincount(codes, weights=squared, minlength=n_groups)
+    m3 = np.bincount(codes, weights=squared * deviations, minlength=n_groups)
+    m4 = np.bincount(codes, weights=squared ** 2, minlength=n_groups)
+
+    run_starts = np.flatnonzero(np.r_[True, (values[1:] != values[:-1]) | (codes[1:] != codes[:-1])]) \
+        if len(values) else np.array([], dtype=int)
+    run_lengths = np.diff(np.r_[run_starts, len(values)])
+    run_codes = codes[run_starts]
+    longest = np.lexsort((-run_lengths, run_codes))
+    groups_with_runs, first = np.unique(run_codes[longest], return_index=True)
+    modes = np.full(n_groups, np.nan)
+    modes[groups_with_runs] = values[run_starts[longest[first]]]
+
+    minimum, maximum = at(np.zeros(n_groups, dtype=int)), at(last)
+    table = pd.DataFrame({'Count': counts, **moment_stats(counts, means, m2, m3, m4)})
+    q1, q3 = quantile(0.25), quantile(0.75)
+    table['Median'] = quantile(0.5)
+    table['Mode'] = modes
+    table['Min'] = minimum
+    for q in quantiles:
+        table[f'{q * 100:g}%'] = quantile(q)
+    table['Max'] = maximum
+    table['Range'] = np.where(filled, native(last) - native(0), np.nan)
+    table['IQR'] = q3 - q1
+    return table
+
+
+def grouped_numeric_stats(df, by, columns=None, quantiles=QUANTILES):
+    """
+    numeric_stats for every group of df.groupby(by) in one grouped pass per column.
+    Returns a wide table indexed by the group keys and Column.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = df.drop(columns=by).select_dtypes(include=['int', 'float']).columns if columns is None else columns
+
+    grouper = df.groupby(by, sort=True, observed=True, dropna=True)
+    codes = grouper.ngroup().fillna(-1).to_numpy(dtype=int)
+    keys = grouper.size().index
+    order = NUMERIC_STATS[:5] + [f'{q * 100:g}%' for q in quantiles] + NUMERIC_STATS[10:]
+
+    tables = {}
+    for col in columns:
+        valid = (codes >= 0) & df[col].notna().to_numpy()
+        values = df[col][valid]
+        values = values.to_numpy(dtype='int64' if pd.api.types.is_integer_dtype(values.dtype) else float)
+        table = _grouped_column_stats(codes[valid], values, len(keys), quantiles)
+        table.index = keys
+        tables[col] = table[order]
+
+    return pd.concat(tables, names=['Column']).reorder_levels(by + ['Column']).sort_index(level=by, sort_remaining=False)
@@ -0,0 +1,128 @@
+import os
+import logging
+import datetime
+import pandas as pd
+
+from .schema import get_schema, apply_schema
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _cell_to_text(value):
+    if _is_blank(value):
+        return None
+    if isinstance(value, datetime.time):
+        return value.strftime('%H:%M:%S')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _cell_to_id(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return value
+
+
+def _chunk_frame(rows, header, dataset):
+    """
+    Build one chunk with a fixed column layout: schema IDs, datetimes and numeric columns
+    get their types, every other column is stored as text so all row groups share one schema.
+    """
+    schema = get_schema(dataset)
+    width = len(header)
+    columns = zip(*(tuple(row[:width]) + (None,) * (width - len(row)) for row in rows))
+
+    data = {}
+    for col, values in zip(header, columns):
+        if col in schema['numeric']:
+            data[col] = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype('float64')
+        elif col in schema['ids']:
+            data[col] = pd.Series([_cell_to_id(v) for v in values], dtype=object)
+        elif col in schema['datetime']:
+            data[col] = pd.Series(values, dtype=object)
+        else:
+            data[col] = pd.Series([_cell_to_text(v) for v in values], dtype='string')
+
+    df = apply_schema(pd.DataFrame(data, columns=header), dataset, categorize=False)
+    for col in schema['datetime']:
+        if col in df.columns:
+            df[col] = df[col].astype('datetime64[us]')
+
+    return df
+
+
+def _iter_excel_chunks(path, chunk_size):
+    """
+    Stream the first sheet of a workbook in openpyxl read-only mode and yield (header, rows) chunks.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [
+            str(name) if name is not None else f'Unnamed: {i}'
+            for i, name in enumerate(next(rows))
+        ]
+
+        chunk = []
+        for row in rows:
+            if all(_is_blank(v) for v in row):
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield header, chunk
+                chunk = []
+
+        if chunk:
+            yield header, chunk
+    finally:
+        wb.close()
+
+
+def excel_to_parquet(path, out_path, dataset, chunk_size=50_000):
+    """
+    Convert a raw Excel export to Parquet without loading it whole: rows are streamed through
+    openpyxl in read-only mode, the dataset schema is applied per chunk and each chunk
+    is written as a row group. Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp = f'{out_path}.{os.getpid()}.tmp'
+
+    writer = None
+    total = 0
+    try:
+        for header, rows in _iter_excel_chunks(path, chunk_size):
+            table = pa.Table.from_pandas(_chunk_frame(rows, header, dataset), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            total += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        logging.warning(f'{dataset}: {path} has no data rows — nothing converted.')
+        return 0
+
+    os.replace(tmp, out_path)
+    logging.info(f'{dataset}: Converted {path} to {out_path} ({total} rows, chunks of {chunk_size}).')
+    return total
+
+
+def iter_parquet_chunks(path, columns=None):
+    """
+    Yield a Parquet file one row group at a time as DataFrames, so cleaning steps can run chunk by chunk.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for i in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(i, columns=columns).to_pandas()